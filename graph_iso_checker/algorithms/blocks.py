@@ -0,0 +1,86 @@
+# graph_iso_checker/algorithms/blocks.py
+
+
+def biconnected_components(g):
+    """
+    Блоки (компоненты двусвязности) и точки сочленения графа: алгоритм
+    Тарьяна с явным стеком обхода, без рекурсии. Мосты — блоки из двух
+    вершин, изолированная вершина — блок из одной.
+    Возвращает (список блоков — списков вершин, отсортированный список точек сочленения).
+    """
+    n = g.num_vertices
+    disc   = [-1] * n
+    low    = [0] * n
+    is_cut = [False] * n
+    blocks, clock = [], 0
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = clock
+        clock += 1
+        if not g.adj[root]:
+            blocks.append([root])
+            continue
+        root_children = 0
+        edges = []
+        stack = [(root, -1, iter(g.adj[root]))]
+        while stack:
+            u, parent, it = stack[-1]
+            descended = False
+            for w in it:
+                if disc[w] == -1:
+                    disc[w] = low[w] = clock
+                    clock += 1
+                    edges.append((u, w))
+                    stack.append((w, u, iter(g.adj[w])))
+                    descended = True
+                    break
+                if w != parent and disc[w] < disc[u]:
+                    # обратное ребро
+                    low[u] = min(low[u], disc[w])
+                    edges.append((u, w))
+            if descended:
+                continue
+            stack.pop()
+            if not stack:
+                break
+            p = stack[-1][0]
+            low[p] = min(low[p], low[u])
+            if low[u] >= disc[p]:
+                # p отделяет поддерево u: рёбра до (p, u) образуют блок
+                if len(stack) > 1:
+                    is_cut[p] = True
+                else:
+                    root_children += 1
+                block = set()
+                while True:
+                    a, b = edges.pop()
+                    block.add(a)
+                    block.add(b)
+                    if (a, b) == (p, u):
+                        break
+                blocks.append(sorted(block))
+        if root_children > 1:
+            is_cut[root] = True
+    return blocks, [v for v in range(n) if is_cut[v]]
+
+
+def block_cut_tree(blocks, cuts):
+    """
+    Дерево блоков и точек сочленения: узлы 0..len(blocks)-1 — блоки,
+    далее — точки сочленения в порядке cuts. Блок смежен с каждой своей
+    точкой сочленения. Возвращает списки смежности дерева.
+    """
+    node_of = {c: len(blocks) + i for i, c in enumerate(cuts)}
+    adj = [[] for _ in range(len(blocks) + len(cuts))]
+    for b, block in enumerate(blocks):
+        for v in block:
+            c = node_of.get(v)
+            if c is not None:
+                adj[b].append(c)
+                adj[c].append(b)
+    return adj
+
+
+
+
@@ -0,0 +1,98 @@
+# graph_iso_checker/algorithms/fingerprint.py
+import numpy as np
+
+
+MASK64 = (1 << 64) - 1
+
+
+def _splitmix(x):
+    # splitmix64 для Python int: детерминированные "случайные" 64-битные веса
+    x = (x + 0x9e3779b97f4a7c15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & MASK64
+    return x ^ (x >> 31)
+
+
+def _mix(h):
+    # финализатор splitmix64 над массивом uint64 (умножение по модулю 2^64)
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xbf58476d1ce4e5b9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94d049bb133111eb)
+    return h ^ (h >> np.uint64(31))
+
+
+def _weights(r):
+    # веса раунда r; одинаковы во всех процессах, поэтому отпечатки сравнимы между запусками
+    return np.uint64(_splitmix(2 * r) | 1), np.uint64(_splitmix(2 * r + 1))
+
+
+class Fingerprint:
+    # Отпечаток графа: digest — 32 байта (n, m и две суммы хешей вершин),
+    # vertex_hashes — хеши вершин (uint64), rounds — число раундов WL
+    def __init__(self, digest, vertex_hashes, rounds):
+        self.digest        = digest
+        self.vertex_hashes = vertex_hashes
+        self.rounds        = rounds
+
+
+def _compute(g):
+    n = g.num_vertices
+    rows = np.array([u for u in range(n) for _ in g.neighbors(u)], dtype=np.int64)
+    cols = np.array([v for u in range(n) for v in g.neighbors(u)], dtype=np.int64)
+    deg = np.bincount(rows, minlength=n).astype(np.uint64)
+
+    h = _mix(deg + np.uint64(_splitmix(MASK64)))
+    # метки вершин входят в начальный хеш, метки рёбер — в хеш каждого соседа
+    if g.vertex_labels is not None:
+        h = _mix(h ^ _mix(np.array(g.vertex_labels, dtype=np.int64).astype(np.uint64)))
+    edge = np.zeros(len(rows), dtype=np.uint64)
+    if g.edge_labels:
+        labels = np.array([g.edge_label(u, v) for u, v in zip(rows.tolist(), cols.tolist())], dtype=np.int64)
+        edge = _mix(labels.astype(np.uint64) + np.uint64(_splitmix(MASK64 - 3)))
+    distinct = len(np.unique(h))
+    rounds = 0
+    # раунд WL: хеш вершины и сумма перемешанных хешей соседей (порядок соседей не важен);
+    # останов, когда число различных хешей перестало расти — сам момент останова инвариантен
+    for r in range(n):
+        w_self, w_nbr = _weights(r)
+        agg = np.zeros(n, dtype=np.uint64)
+        np.add.at(agg, rows, _mix(h[cols] ^ w_nbr ^ edge))
+        h = _mix(h * w_self + agg)
+        rounds += 1
+        new = len(np.unique(h))
+        if new == distinct:
+            break
+        distinct = new
+
+    a, b = np.uint64(_splitmix(MASK64 - 1)), np.uint64(_splitmix(MASK64 - 2))
+    digest = np.array(
+        [n, len(rows) // 2, _mix(h ^ a).sum(dtype=np.uint64), _mix(h ^ b).sum(dtype=np.uint64)],
+        dtype=np.uint64
+    ).tobytes()
+    return Fingerprint(digest, h, rounds)
+
+
+def fingerprint(g):
+    """
+    WL-отпечаток графа (хеши поддеревьев 1-WL со случайными 64-битными весами,
+    с учётом меток вершин и рёбер), не зависящий от нумерации вершин. Считается один раз и хранится на
+    графе (g._fingerprint); разные digest — графы не изоморфны.
+    """
+    fp = getattr(g, '_fingerprint', None)
+    if fp is None:
+        fp = _compute(g)
+        g._fingerprint = fp
+    return fp
+
+
+def bucket_by_fingerprint(graphs):
+    # индексы графов каталога по digest: изоморфные графы всегда в одной корзине
+    buckets = {}
+    for i, g in enumerate(graphs):
+        buckets.setdefault(fingerprint(g).digest, []).append(i)
+    return buckets
+
+
+
+
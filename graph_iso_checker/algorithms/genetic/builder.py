@@ -1,9 +1,12 @@
 from .generational        import GeneticAlgorithm
-from .strategies.selection   import TournamentSelection
-from .strategies.crossover   import PMXCrossover
-from .strategies.mutation    import SwapMutation
-from .strategies.fitness     import EdgeMatchFitness
+from .vectorized          import ArrayGeneticAlgorithm
+from .strategies.selection   import TournamentSelection, ArrayTournamentSelection
+from .strategies.crossover   import PMXCrossover, ArrayPMXCrossover
+from .strategies.mutation    import SwapMutation, ArraySwapMutation
+from .strategies.fitness     import EdgeMatchFitness, ArrayEdgeMatchFitness
 from .strategies.termination import GenerationTermination
+from .strategies.adaptation  import DiversityAdaptiveRates
+from .cache                  import FitnessCache
 
 
 class GeneticAlgorithmBuilder:
@@ -13,12 +16,21 @@ class GeneticAlgorithmBuilder:
     def __init__(self):
         self._population_size = 50
         self._generations     = 200
-        self._selection       = TournamentSelection()
-        self._crossover       = PMXCrossover()
-        self._mutation        = SwapMutation()
-        self._fitness         = EdgeMatchFitness()
+        self._selection       = None
+        self._crossover       = None
+        self._mutation        = None
+        self._fitness         = None
         self._termination     = None
         self._workers         = None
+        self._array           = False
+        self._seed            = None
+        self._local_search    = None
+        self._elite           = 2
+        self._restart_after   = None
+        self._max_restarts    = 3
+        self._adaptation      = None
+        self._cache_size      = None
+        self._dedup           = False
 
 
     def with_population_size(self, size: int):
@@ -62,17 +74,85 @@ class GeneticAlgorithmBuilder:
         return self
 
 
+    def with_local_search(self, strat, elite: int = 2):
+        # меметический режим: strat применяется к elite лучшим особям каждого поколения
+        self._local_search = strat
+        self._elite        = elite
+        return self
+
+
+    def with_restarts(self, after: int, max_restarts: int = 3, elite: int = None):
+        # частичный перезапуск после after поколений без улучшения
+        self._restart_after = after
+        self._max_restarts  = max_restarts
+        if elite is not None:
+            self._elite = elite
+        return self
+
+
+    def with_adaptive_rates(self, strat=None):
+        # вероятности мутации/кроссовера подстраиваются под разнообразие популяции
+        self._adaptation = strat or DiversityAdaptiveRates()
+        return self
+
+
+    def with_fitness_cache(self, size: int = 10000):
+        # LRU-кеш фитнеса по Zobrist-хешу особи (только списочный GA)
+        self._cache_size = size
+        return self
+
+
+    def with_duplicate_replacement(self, enabled: bool = True):
+        # повторяющиеся особи заменяются свежими в пределах клеток
+        self._dedup = enabled
+        return self
+
+
+    def with_array_population(self, enabled: bool = True):
+        # популяция — матрица (P, n), операторы работают пакетно (ArrayGeneticAlgorithm)
+        self._array = enabled
+        return self
+
+
+    def with_seed(self, seed: int):
+        # seed генератора NumPy для ArrayGeneticAlgorithm
+        self._seed = seed
+        return self
+
+
     def build(self):
         termination = self._termination or GenerationTermination(self._generations)
+        if self._array:
+            return ArrayGeneticAlgorithm(
+                population_size = self._population_size,
+                generations     = self._generations,
+                selection       = self._selection or ArrayTournamentSelection(),
+                crossover       = self._crossover or ArrayPMXCrossover(),
+                mutation        = self._mutation  or ArraySwapMutation(),
+                fitness         = self._fitness   or ArrayEdgeMatchFitness(),
+                termination     = termination,
+                seed            = self._seed,
+                elite           = self._elite,
+                restart_after   = self._restart_after,
+                max_restarts    = self._max_restarts,
+                adaptation      = self._adaptation
+            )
         return GeneticAlgorithm(
             population_size = self._population_size,
             generations     = self._generations,
-            selection       = self._selection,
-            crossover       = self._crossover,
-            mutation        = self._mutation,
-            fitness         = self._fitness,
+            selection       = self._selection or TournamentSelection(),
+            crossover       = self._crossover or PMXCrossover(),
+            mutation        = self._mutation  or SwapMutation(),
+            fitness         = self._fitness   or EdgeMatchFitness(),
             termination     = termination,
-            num_workers     = self._workers
+            num_workers     = self._workers,
+            local_search    = self._local_search,
+            elite           = self._elite,
+            restart_after   = self._restart_after,
+            max_restarts    = self._max_restarts,
+            adaptation      = self._adaptation,
+            fitness_cache   = FitnessCache(self._cache_size) if self._cache_size else None,
+            replace_duplicates = self._dedup
         )
 
 
@@ -0,0 +1,64 @@
+# graph_iso_checker/algorithms/genetic/cache.py
+import numpy as np
+from collections import OrderedDict
+
+
+def _mix64(x):
+    # финализатор splitmix64 для массива uint64 (переполнение — по модулю 2^64)
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class ZobristHasher:
+    """
+    Zobrist-хеш перестановки: XOR ключей key(i, perm[i]). Ключи не хранятся
+    таблицей n×n, а вычисляются смешиванием (splitmix64) из i*n + v + seed.
+    Хеш особи считается заново за O(n) в NumPy — это дешевле оценки
+    фитнеса за O(m), которую он позволяет пропустить.
+    """
+    def __init__(self, n, seed=0x5EED):
+        self.n    = n
+        self.seed = seed
+
+
+    def hash(self, perm):
+        idx = np.arange(len(perm), dtype=np.uint64) * np.uint64(self.n)
+        keys = _mix64(idx + np.asarray(perm, dtype=np.uint64) + np.uint64(self.seed))
+        return int(np.bitwise_xor.reduce(keys)) if len(keys) else 0
+
+
+class FitnessCache:
+    # Ограниченный LRU-кеш значений фитнеса по хешу особи со счётчиками попаданий
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self._data   = OrderedDict()
+
+
+    def get(self, key):
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
@@ -7,6 +7,9 @@ from .strategies.crossover   import CrossoverStrategy
 from .strategies.mutation    import MutationStrategy
 from .strategies.fitness     import FitnessStrategy
 from .strategies.termination import TerminationStrategy
+from .strategies.local_search import LocalSearchStrategy
+from .strategies.adaptation   import RateAdaptationStrategy
+from .cache                   import ZobristHasher, FitnessCache
 
 
 def _eval_fitness(individual, g1, g2, fitness):
@@ -14,6 +17,37 @@ def _eval_fitness(individual, g1, g2, fitness):
     return fitness.evaluate(individual, g1, g2, {})
 
 
+def vertex_groups(g1, g2, context):
+    # группы вершин, внутри которых допустимы отображения:
+    # если в context есть 'colors1'/'colors2', используем их
+    if 'colors1' in context and 'colors2' in context:
+        groups1, groups2 = {}, {}
+        for u, col in enumerate(context['colors1']):
+            groups1.setdefault(col, []).append(u)
+        for v, col in enumerate(context['colors2']):
+            groups2.setdefault(col, []).append(v)
+    else:
+        # иначе группируем по степеням
+        groups1, groups2 = {}, {}
+        for u in range(g1.num_vertices):
+            groups1.setdefault(len(g1.neighbors(u)), []).append(u)
+        for v in range(g2.num_vertices):
+            groups2.setdefault(len(g2.neighbors(v)), []).append(v)
+    # метки вершин дробят группы: допустимы только отображения, сохраняющие метки
+    if g1.vertex_labels is not None or g2.vertex_labels is not None:
+        groups1 = _split_by_labels(g1, groups1)
+        groups2 = _split_by_labels(g2, groups2)
+    return groups1, groups2
+
+
+def _split_by_labels(g, groups):
+    split = {}
+    for key, vs in groups.items():
+        for u in vs:
+            split.setdefault((key, g.vertex_label(u)), []).append(u)
+    return split
+
+
 class GeneticAlgorithm:
     """
     Генетический алгоритм с параллельным расчётом фитнеса
@@ -28,7 +62,14 @@ class GeneticAlgorithm:
                  mutation: MutationStrategy,
                  fitness: FitnessStrategy,
                  termination: TerminationStrategy,
-                 num_workers: int = None):
+                 num_workers: int = None,
+                 local_search: LocalSearchStrategy = None,
+                 elite: int = 2,
+                 restart_after: int = None,
+                 max_restarts: int = 3,
+                 adaptation: RateAdaptationStrategy = None,
+                 fitness_cache: FitnessCache = None,
+                 replace_duplicates: bool = False):
         self.population_size = population_size
         self.max_gens        = generations
         self.selection       = selection
@@ -38,31 +79,30 @@ class GeneticAlgorithm:
         self.termination     = termination
         # по умолчанию используем все логические ядра
         self.num_workers     = num_workers or os.cpu_count()
-
-
-    def _initialize_population(self, g1, g2, context):
-        # инициализация популяции на основе групп вершин
-        # если в context есть 'colors1'/'colors2', используем их
+        # меметический режим: локальный поиск для elite лучших особей поколения
+        self.local_search    = local_search
+        self.elite           = elite
+        # частичный перезапуск после restart_after поколений без улучшения:
+        # elite лучших сохраняются, остальные пересеваются по клеткам
+        self.restart_after   = restart_after
+        self.max_restarts    = max_restarts
+        # адаптация вероятностей мутации/кроссовера к разнообразию популяции
+        self.adaptation      = adaptation
+        # кеш фитнеса по хешу перестановки и замена повторяющихся особей
+        self.cache              = fitness_cache
+        self.replace_duplicates = replace_duplicates
+
+
+    def _initialize_population(self, g1, g2, context, count=None):
+        # инициализация популяции (count особей) на основе групп вершин
+        groups1, groups2 = vertex_groups(g1, g2, context)
         n = g1.num_vertices
-        if 'colors1' in context and 'colors2' in context:
-            groups1, groups2 = {}, {}
-            for u, col in enumerate(context['colors1']):
-                groups1.setdefault(col, []).append(u)
-            for v, col in enumerate(context['colors2']):
-                groups2.setdefault(col, []).append(v)
-        else:
-            # иначе группируем по степеням
-            deg1 = [len(g1.neighbors(u)) for u in range(n)]
-            deg2 = [len(g2.neighbors(u)) for u in range(n)]
-            groups1, groups2 = {}, {}
-            for u, d in enumerate(deg1):
-                groups1.setdefault(d, []).append(u)
-            for v, d in enumerate(deg2):
-                groups2.setdefault(d, []).append(v)
+        # клетки (позиции g1 одного цвета) — для клеточных операторов
+        context['cells'] = [vs1 for vs1 in groups1.values() if len(vs1) > 1]
 
 
         population = []
-        for _ in range(self.population_size):
+        for _ in range(self.population_size if count is None else count):
             perm = [None] * n
             for key, vs1 in groups1.items():
                 vs2 = groups2.get(key, [])[:]
@@ -73,7 +113,58 @@ class GeneticAlgorithm:
         return population
 
 
-    def run(self, g1, g2, context):
+    def _should_restart(self, generation, context):
+        if self.restart_after is None or context['restarts'] >= self.max_restarts:
+            return False
+        since = max(context['last_improvement'], context['last_restart'])
+        return generation - since >= self.restart_after
+
+
+    def _evaluate(self, individuals, g1, g2, context):
+        # параллельная оценка фитнеса
+        if self.num_workers > 1 and individuals:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.num_workers) as exe:
+                return list(exe.map(
+                    _eval_fitness,
+                    individuals,
+                    [g1] * len(individuals),
+                    [g2] * len(individuals),
+                    [self.fitness] * len(individuals),
+                ))
+        return [self.fitness.evaluate(ind, g1, g2, context) for ind in individuals]
+
+
+    def _replace_duplicates(self, population, hasher, g1, g2, context):
+        # повторы особей заменяются свежими особями в пределах клеток
+        keys = [hasher.hash(ind) for ind in population]
+        seen, dups = set(), []
+        for i, h in enumerate(keys):
+            if h in seen:
+                dups.append(i)
+            seen.add(h)
+        if dups:
+            fresh = self._initialize_population(g1, g2, context, len(dups))
+            for i, ind in zip(dups, fresh):
+                population[i] = ind
+                keys[i]       = hasher.hash(ind)
+            context['duplicates_replaced'] += len(dups)
+        return population, keys
+
+
+    def run(self, g1, g2, context, migration=None):
+        # context['cells'] нужен операторам только на время запуска:
+        # прежнее значение восстанавливается, в контекст конвейера клетки не попадают
+        saved = context.get('cells')
+        try:
+            return self._run(g1, g2, context, migration)
+        finally:
+            if saved is None:
+                context.pop('cells', None)
+            else:
+                context['cells'] = saved
+
+
+    def _run(self, g1, g2, context, migration=None):
         # 1) Проверка числа вершин
         if g1.num_vertices != g2.num_vertices:
             return False, None
@@ -101,49 +192,98 @@ class GeneticAlgorithm:
 
         best_map, best_fit = None, -1
         generation = 0
+        context['last_improvement'] = 0
+        context['last_restart']     = 0
+        context['restarts']         = 0
+        context.pop('mutation_rate', None)
+        context.pop('crossover_rate', None)
+        context['duplicates_replaced'] = 0
+
+        # хеши особей нужны кешу и поиску повторов; кеш привязан к паре графов
+        hasher = ZobristHasher(n) if self.cache is not None or self.replace_duplicates else None
+        keys   = None
+        if self.cache is not None:
+            self.cache.clear()
 
 
         while True:
 
-            # параллельная оценка фитнеса
-            if self.num_workers > 1:
-                with concurrent.futures.ProcessPoolExecutor(max_workers=self.num_workers) as exe:
-                    fitnesses = list(exe.map(
-                        _eval_fitness,
-                        population,
-                        [g1] * len(population),
-                        [g2] * len(population),
-                        [self.fitness] * len(population),
-                    ))
+            # оценка фитнеса: из кеша считаются только промахи
+            if self.cache is not None:
+                keys      = keys or [hasher.hash(ind) for ind in population]
+                fitnesses = [self.cache.get(h) for h in keys]
+                missing   = [i for i, f in enumerate(fitnesses) if f is None]
+                evaluated = self._evaluate([population[i] for i in missing], g1, g2, context)
+                for i, f in zip(missing, evaluated):
+                    fitnesses[i] = f
+                    self.cache.put(keys[i], f)
+                context['fitness_cache'] = self.cache.stats()
             else:
-                fitnesses = [
-                    self.fitness.evaluate(ind, g1, g2, context)
-                    for ind in population
-                ]
+                fitnesses = self._evaluate(population, g1, g2, context)
+            keys = None
             #print("Оценка фитнеса готова")
 
 
+            # меметический шаг: направленно чиним конфликтующие рёбра у лучших особей
+            if self.local_search is not None:
+                elite = sorted(range(len(population)), key=fitnesses.__getitem__, reverse=True)
+                for i in elite[:self.elite]:
+                    population[i], fitnesses[i] = self.local_search.improve(
+                        population[i], g1, g2, context
+                    )
+
+
             # обновление лучшей особи
             gen_best = max(fitnesses)
             idx      = fitnesses.index(gen_best)
             if gen_best > best_fit:
                 best_fit = gen_best
                 best_map = population[idx].copy()
+                context['last_improvement'] = generation
+                # лучшая особь доступна и при неудаче (многоуровневый режим)
+                context['best_mapping'] = best_map
 
             #print("Лучшая особь есть")
 
             print(f"gen: {generation} best: {best_fit}, target: {target}")
 
+            # коллизия хеша могла подставить чужое значение — перепроверяем напрямую
+            if best_fit == target and self.cache is not None:
+                best_fit = self.fitness.evaluate(best_map, g1, g2, context)
+
             # если найдено полное совпадение
             if best_fit == target:
                 return True, best_map
 
 
+            # обмен особями с другими островами (IslandModel); True — решение уже найдено другим островом
+            if migration is not None and migration.exchange(generation, population, fitnesses):
+                break
+
+
             # проверка остановки
             if self.termination.should_terminate(population, fitnesses, generation, context):
                 #print("Критерий останова")
                 break
 
+            # застой: частичный перезапуск с сохранением элиты
+            if self._should_restart(generation, context):
+                elite = sorted(range(len(population)), key=fitnesses.__getitem__, reverse=True)
+                kept  = [population[i] for i in elite[:self.elite]]
+                population = kept + self._initialize_population(
+                    g1, g2, context, self.population_size - len(kept)
+                )
+                context['last_restart'] = generation
+                context['restarts']    += 1
+                generation += 1
+                continue
+
+
+            # вероятности операторов следуют за разнообразием популяции
+            if self.adaptation is not None:
+                self.adaptation.update(population, population[idx], context)
+
+
             #print("Начинаем новое поколение")
             # формирование нового поколения
             new_pop = []
@@ -154,6 +294,8 @@ class GeneticAlgorithm:
                 m2     = self.mutation.mutate(c2.copy(), context)
                 new_pop.extend([m1, m2])
             population = new_pop[:self.population_size]
+            if self.replace_duplicates:
+                population, keys = self._replace_duplicates(population, hasher, g1, g2, context)
             generation += 1
             #print("Готово новое поколение")
 
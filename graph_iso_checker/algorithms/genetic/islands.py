@@ -0,0 +1,142 @@
+# graph_iso_checker/algorithms/genetic/islands.py
+import copy
+import os
+import queue
+import random
+import multiprocessing
+
+
+class MigrationChannel:
+    """
+    Связь острова с остальными: раз в `interval` поколений лучшие `migrants`
+    особей отправляются соседям (кольцо или случайный остров), входящие
+    мигранты замещают худших особей. Общий флаг stop — ранний выход всех
+    островов, как только один из них нашёл решение.
+    """
+    def __init__(self, index, inboxes, stop, interval=10, migrants=2, topology='ring'):
+        self.index    = index
+        self.inboxes  = inboxes
+        self.stop     = stop
+        self.interval = interval
+        self.migrants = migrants
+        self.topology = topology
+
+
+    def _targets(self):
+        n = len(self.inboxes)
+        if n < 2:
+            return []
+        if self.topology == 'random':
+            return [random.choice([i for i in range(n) if i != self.index])]
+        return [(self.index + 1) % n]
+
+
+    def exchange(self, generation, population, fitnesses):
+        # возвращает True, если другой остров уже нашёл отображение
+        if self.stop.is_set():
+            return True
+        if generation == 0 or generation % self.interval:
+            return False
+
+        order = sorted(range(len(population)), key=lambda i: fitnesses[i], reverse=True)
+        elites = [([int(x) for x in population[i]], int(fitnesses[i])) for i in order[:self.migrants]]
+        for t in self._targets():
+            self.inboxes[t].put(elites)
+
+        incoming = []
+        while True:
+            try:
+                incoming.extend(self.inboxes[self.index].get_nowait())
+            except queue.Empty:
+                break
+        # мигранты замещают худших, только если они лучше
+        for slot, (ind, fit) in zip(reversed(order), sorted(incoming, key=lambda e: -e[1])):
+            if fit > fitnesses[slot]:
+                population[slot] = ind
+                fitnesses[slot]  = fit
+        return False
+
+
+def _run_island(index, builder, g1, g2, context, seed, channel, results):
+    # процесс-остров: собственный seed, фитнес считается в этом же процессе
+    found, mapping = False, None
+    try:
+        random.seed(seed)
+        ga = builder.with_workers(1).with_seed(seed).build()
+        found, mapping = ga.run(g1, g2, context, migration=channel)
+        if found:
+            channel.stop.set()
+    finally:
+        # результат отправляется и при исключении — родитель не ждёт вечно
+        for q in channel.inboxes:
+            q.cancel_join_thread()
+        results.put((index, found, mapping))
+
+
+class IslandModel:
+    """
+    Островная модель GA: независимые популяции в отдельных процессах
+    (каждая со своим seed и, при желании, своими операторами из
+    GeneticAlgorithmBuilder) с периодической миграцией элиты.
+    """
+    def __init__(self, builders, migration_interval=10, migrants=2, topology='ring', seed=None):
+        self.builders           = builders
+        self.migration_interval = migration_interval
+        self.migrants           = migrants
+        self.topology           = topology
+        self.seed               = seed
+
+
+    @classmethod
+    def from_builder(cls, builder, islands=None, **kwargs):
+        # одинаковые настройки на всех островах; по умолчанию — по острову на ядро
+        islands = islands or os.cpu_count()
+        return cls([copy.deepcopy(builder) for _ in range(islands)], **kwargs)
+
+
+    def run(self, g1, g2, context):
+        ctx     = multiprocessing.get_context()
+        n       = len(self.builders)
+        inboxes = [ctx.Queue() for _ in range(n)]
+        stop    = ctx.Event()
+        results = ctx.Queue()
+        base    = self.seed if self.seed is not None else random.getrandbits(32)
+
+        procs = []
+        for i, builder in enumerate(self.builders):
+            channel = MigrationChannel(
+                i, inboxes, stop, self.migration_interval, self.migrants, self.topology
+            )
+            p = ctx.Process(
+                target=_run_island,
+                args=(i, builder, g1, g2, dict(context), base + i, channel, results),
+                daemon=True
+            )
+            p.start()
+            procs.append(p)
+
+        # ждём первый успех или завершения всех островов
+        found, mapping = False, None
+        remaining = n
+        while remaining:
+            try:
+                _, ok, island_map = results.get(timeout=0.1)
+            except queue.Empty:
+                # остров, погибший без результата (например, убитый сигналом), не ждём
+                if not any(p.is_alive() for p in procs) and results.empty():
+                    break
+                continue
+            remaining -= 1
+            if ok:
+                found, mapping = True, island_map
+                break
+        stop.set()
+        # дочитываем оставшиеся результаты, чтобы процессы могли завершиться
+        while any(p.is_alive() for p in procs):
+            try:
+                results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        for p in procs:
+            p.join()
+        return found, mapping
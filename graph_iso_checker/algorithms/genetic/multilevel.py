@@ -0,0 +1,184 @@
+# graph_iso_checker/algorithms/genetic/multilevel.py
+import random
+from collections import Counter
+from ...graph import Graph
+from .strategies.local_search import SimulatedAnnealing
+
+
+def _matching(g, colors):
+    # жадное паросочетание: вершины по (цвет, степень), партнёр — свободный сосед меньшего цвета
+    n = g.num_vertices
+    order = sorted(range(n), key=lambda u: (colors[u], len(g.neighbors(u))))
+    mate = [-1] * n
+    for u in order:
+        if mate[u] != -1:
+            continue
+        best = None
+        for w in g.neighbors(u):
+            if mate[w] == -1 and (best is None or
+                                  (colors[w], len(g.neighbors(w))) < (colors[best], len(g.neighbors(best)))):
+                best = w
+        if best is not None:
+            mate[u], mate[best] = best, u
+    # узлы грубого графа в порядке обхода
+    members, seen = [], [False] * n
+    for u in order:
+        if not seen[u]:
+            group = [u] if mate[u] == -1 else [u, mate[u]]
+            for w in group:
+                seen[w] = True
+            members.append(group)
+    return members
+
+
+def _contract(g, members):
+    # грубый граф: вершина на группу, рёбра — между разными группами
+    owner = [0] * g.num_vertices
+    for c, group in enumerate(members):
+        for u in group:
+            owner[u] = c
+    coarse = Graph(len(members))
+    for u in range(g.num_vertices):
+        for w in g.neighbors(u):
+            if owner[u] != owner[w]:
+                coarse.add_edge(owner[u], owner[w])
+    return coarse
+
+
+def _balance(members, colors, budget):
+    # пары сверх общего для обоих графов числа (по типу пары) разбиваются на одиночки
+    balanced = []
+    for group in members:
+        key = tuple(sorted(colors[u] for u in group))
+        if len(group) == 2 and budget[key] <= 0:
+            balanced.extend([u] for u in group)
+            continue
+        budget[key] -= 1
+        balanced.append(group)
+    return balanced
+
+
+def coarsen(g1, g2, colors1, colors2):
+    """
+    Один согласованный шаг огрубления обоих графов: стягивание паросочетания
+    с учётом цветов. Число пар каждого типа выравнивается между графами,
+    поэтому грубые графы имеют одинаковый размер и распределение цветов.
+    Цвет грубой вершины — мультимножество цветов её членов (нумерация
+    общая для обоих графов).
+    """
+    members1 = _matching(g1, colors1)
+    members2 = _matching(g2, colors2)
+    pairs1 = Counter(tuple(sorted(colors1[u] for u in grp)) for grp in members1 if len(grp) == 2)
+    pairs2 = Counter(tuple(sorted(colors2[v] for v in grp)) for grp in members2 if len(grp) == 2)
+    common = pairs1 & pairs2
+    members1 = _balance(members1, colors1, Counter(common))
+    members2 = _balance(members2, colors2, Counter(common))
+
+    keys1 = [tuple(sorted(colors1[u] for u in group)) for group in members1]
+    keys2 = [tuple(sorted(colors2[v] for v in group)) for group in members2]
+    index = {key: i for i, key in enumerate(sorted(set(keys1)))}
+    return (_contract(g1, members1), _contract(g2, members2), members1, members2,
+            [index[k] for k in keys1], [index[k] for k in keys2])
+
+
+def project(coarse_perm, members1, members2, colors1, colors2):
+    # отображение грубого уровня -> отображение мелкого: внутри пары узлов
+    # вершины сопоставляются по цвету, остатки — в пределах своих клеток
+    perm = [None] * len(colors1)
+    left1, left2 = {}, {}
+    for a, b in enumerate(coarse_perm):
+        by_color = {}
+        for v in members2[b]:
+            by_color.setdefault(colors2[v], []).append(v)
+        for u in members1[a]:
+            vs = by_color.get(colors1[u])
+            if vs:
+                perm[u] = vs.pop()
+            else:
+                left1.setdefault(colors1[u], []).append(u)
+        for col, vs in by_color.items():
+            left2.setdefault(col, []).extend(vs)
+    for col, us in left1.items():
+        for u, v in zip(us, left2[col]):
+            perm[u] = v
+    return perm
+
+
+def _cells(colors):
+    cells = {}
+    for u, col in enumerate(colors):
+        cells.setdefault(col, []).append(u)
+    return [vs for vs in cells.values() if len(vs) > 1]
+
+
+class MultilevelGA:
+    """
+    Многоуровневый режим GA для больших графов: оба графа согласованно
+    огрубляются до coarsest вершин, GA из builder решает грубую задачу,
+    затем отображение проецируется уровень за уровнем с локальным поиском
+    (отжиг при низкой температуре, sweeps * n обменов на уровне).
+    """
+    def __init__(self, builder, coarsest=200, sweeps=100, t0=0.5, t_end=0.02, min_ratio=0.9):
+        self.builder   = builder
+        self.coarsest  = coarsest
+        self.sweeps    = sweeps
+        self.t0        = t0
+        self.t_end     = t_end
+        # огрубление прекращается, если уровень сокращает граф меньше чем до min_ratio
+        self.min_ratio = min_ratio
+
+
+    def run(self, g1, g2, context):
+        n = g1.num_vertices
+        if g2.num_vertices != n:
+            return False, None
+        if 'colors1' in context and 'colors2' in context:
+            colors1, colors2 = context['colors1'], context['colors2']
+        else:
+            colors1 = [len(g1.neighbors(u)) for u in range(n)]
+            colors2 = [len(g2.neighbors(v)) for v in range(n)]
+        if Counter(colors1) != Counter(colors2):
+            return False, None
+
+
+        # иерархия уровней: (g1, g2, colors1, colors2, members1, members2)
+        levels = [(g1, g2, colors1, colors2, None, None)]
+        while levels[-1][0].num_vertices > self.coarsest:
+            h1, h2, c1, c2, _, _ = levels[-1]
+            step = coarsen(h1, h2, c1, c2)
+            if step[0].num_vertices > self.min_ratio * h1.num_vertices:
+                break
+            k1, k2, m1, m2, cc1, cc2 = step
+            levels.append((k1, k2, cc1, cc2, m1, m2))
+        context['multilevel_sizes'] = [lv[0].num_vertices for lv in levels]
+
+
+        # грубая задача — обычный GA с цветами уровня
+        h1, h2, c1, c2, _, _ = levels[-1]
+        coarse_ctx = {'colors1': c1, 'colors2': c2}
+        found, perm = self.builder.build().run(h1, h2, coarse_ctx)
+        if not found:
+            perm = coarse_ctx.get('best_mapping')
+        if perm is None:
+            # GA отказался сразу (грубые графы различаются степенями) — случайно в пределах клеток
+            perm = project(range(len(c1)), [[u] for u in range(len(c1))],
+                           [[v] for v in random.sample(range(len(c2)), len(c2))], c1, c2)
+
+
+        # проекция вниз с локальным поиском на каждом уровне
+        target, fit = None, None
+        for depth in range(len(levels) - 1, -1, -1):
+            h1, h2, c1, c2, m1, m2 = levels[depth]
+            if depth < len(levels) - 1:
+                _, _, _, _, m1c, m2c = levels[depth + 1]
+                perm = project(perm, m1c, m2c, c1, c2)
+            search = SimulatedAnnealing(
+                iterations=self.sweeps * h1.num_vertices, t0=self.t0, t_end=self.t_end
+            )
+            perm, fit = search.improve(perm, h1, h2, {'cells': _cells(c1)})
+            target = sum(len(h1.neighbors(u)) for u in range(h1.num_vertices)) // 2
+
+        context['best_mapping'] = perm
+        if fit == target:
+            return True, perm
+        return False, None
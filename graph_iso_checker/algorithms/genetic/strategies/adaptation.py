@@ -0,0 +1,42 @@
+# graph_iso_checker/algorithms/genetic/strategies/adaptation.py
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+def diversity(population, best):
+    # средняя доля генов, отличающихся от лучшей особи (0 — популяция выродилась)
+    if isinstance(population, np.ndarray):
+        return float((population != np.asarray(best)).mean()) if population.size else 0.0
+    n = len(best)
+    if not population or n == 0:
+        return 0.0
+    diff = sum(1 for ind in population for a, b in zip(ind, best) if a != b)
+    return diff / (len(population) * n)
+
+
+class RateAdaptationStrategy(ABC):
+    @abstractmethod
+    def update(self, population, best, context):
+        """
+        Пересчитывает context['mutation_rate'] / context['crossover_rate'].
+        """
+        pass
+
+
+class DiversityAdaptiveRates(RateAdaptationStrategy):
+    # Чем ниже разнообразие популяции, тем выше вероятность мутации
+    # и ниже вероятность кроссовера (и наоборот); target — разнообразие,
+    # при котором используются «спокойные» значения min_mutation/max_crossover
+    def __init__(self, min_mutation=0.05, max_mutation=0.3,
+                 min_crossover=0.6, max_crossover=0.9, target=0.3):
+        self.min_mutation  = min_mutation
+        self.max_mutation  = max_mutation
+        self.min_crossover = min_crossover
+        self.max_crossover = max_crossover
+        self.target        = target
+
+
+    def update(self, population, best, context):
+        t = min(1.0, diversity(population, best) / self.target)
+        context['mutation_rate']  = self.max_mutation - (self.max_mutation - self.min_mutation) * t
+        context['crossover_rate'] = self.min_crossover + (self.max_crossover - self.min_crossover) * t
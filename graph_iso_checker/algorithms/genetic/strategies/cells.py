@@ -0,0 +1,22 @@
+# graph_iso_checker/algorithms/genetic/strategies/cells.py
+import numpy as np
+
+
+def cell_layout(cells, n):
+    """
+    Плоское представление клеток (context['cells']) для пакетных операторов:
+      order   — все позиции 0..n-1, позиции каждой клетки идут подряд,
+                клетки — первыми, остальные позиции — в конце;
+      starts  — начало каждой клетки в order, sizes — её размер;
+      cell_of — номер клетки для каждой позиции (-1 — вне клеток).
+    """
+    cell_of = np.full(n, -1, dtype=np.int64)
+    flat, starts, sizes = [], [], []
+    for c, cell in enumerate(cells):
+        starts.append(len(flat))
+        sizes.append(len(cell))
+        flat.extend(cell)
+        cell_of[cell] = c
+    rest = np.nonzero(cell_of < 0)[0]
+    order = np.concatenate([np.array(flat, dtype=np.int64), rest])
+    return order, np.array(starts, dtype=np.int64), np.array(sizes, dtype=np.int64), cell_of
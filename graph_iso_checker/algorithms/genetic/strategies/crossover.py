@@ -1,6 +1,8 @@
 # graph_iso_checker/algorithms/genetic/strategies/crossover.py
 import random
+import numpy as np
 from abc import ABC, abstractmethod
+from .cells import cell_layout
 
 
 class CrossoverStrategy(ABC):
@@ -12,8 +14,45 @@ class CrossoverStrategy(ABC):
         pass
 
 
+def pmx(p1, p2, a, b):
+    # Partial Mapped Crossover двух перестановок с сегментом [a, b)
+    n = len(p1)
+    # инициализируем потомков None
+    c1 = [None] * n
+    c2 = [None] * n
+
+
+    # копируем сегменты
+    c1[a:b] = p2[a:b]
+    c2[a:b] = p1[a:b]
+
+
+    # строим словари соответствий в сегменте
+    mapping1 = { p1[i]: p2[i] for i in range(a, b) }  # для c2
+    mapping2 = { p2[i]: p1[i] for i in range(a, b) }  # для c1
+
+
+    # заполняем позиции вне сегмента
+    for i in list(range(0, a)) + list(range(b, n)):
+        # потомок c1: берём из p1 и «прогоняем» через mapping2
+        val = p1[i]
+        while val in mapping2:
+            val = mapping2[val]
+        c1[i] = val
+
+
+        # аналогично для c2
+        val = p2[i]
+        while val in mapping1:
+            val = mapping1[val]
+        c2[i] = val
+
+    return c1, c2
+
+
 class PMXCrossover(CrossoverStrategy):
     # Partial Mapped Crossover для перестановок
+    # (context['crossover_rate'], если задан, имеет приоритет над crossover_rate)
     def __init__(self, crossover_rate=0.8):
         self.rate = crossover_rate
 
@@ -21,45 +60,185 @@ class PMXCrossover(CrossoverStrategy):
     def crossover(self, p1, p2, context):
         n = len(p1)
         # если очень маленький размер или не кроссируем — возвращаем копии
-        if n < 2 or random.random() > self.rate:
+        if n < 2 or random.random() > context.get('crossover_rate', self.rate):
             return p1.copy(), p2.copy()
 
 
         # выбираем точки обрезки
         a, b = sorted(random.sample(range(n), 2))
+        return pmx(p1, p2, a, b)
 
 
-        # инициализируем потомков None
-        c1 = [None] * n
-        c2 = [None] * n
-
-
-        # копируем сегменты
-        c1[a:b] = p2[a:b]
-        c2[a:b] = p1[a:b]
-
+class CellPMXCrossover(CrossoverStrategy):
+    # PMX отдельно внутри каждой клетки раскраски (context['cells']):
+    # потомки остаются в тех же клетках, что и родители
+    def __init__(self, crossover_rate=0.8):
+        self.rate = crossover_rate
 
-        # строим словари соответствий в сегменте
-        mapping1 = { p1[i]: p2[i] for i in range(a, b) }  # для c2
-        mapping2 = { p2[i]: p1[i] for i in range(a, b) }  # для c1
 
+    def crossover(self, p1, p2, context):
+        n = len(p1)
+        if n < 2 or random.random() > context.get('crossover_rate', self.rate):
+            return p1.copy(), p2.copy()
+        cells = context.get('cells')
+        if cells is None:
+            cells = [list(range(n))]
+
+
+        c1, c2 = p1.copy(), p2.copy()
+        for cell in cells:
+            s1 = [p1[i] for i in cell]
+            s2 = [p2[i] for i in cell]
+            # PMX корректен, только если родители заполняют клетку одними значениями
+            if sorted(s1) != sorted(s2):
+                continue
+            a, b = sorted(random.sample(range(len(cell)), 2))
+            t1, t2 = pmx(s1, s2, a, b)
+            for i, v1, v2 in zip(cell, t1, t2):
+                c1[i] = v1
+                c2[i] = v2
+        return c1, c2
 
-        # заполняем позиции вне сегмента
-        for i in list(range(0, a)) + list(range(b, n)):
-            # потомок c1: берём из p1 и «прогоняем» через mapping2
-            val = p1[i]
-            while val in mapping2:
-                val = mapping2[val]
-            c1[i] = val
 
+class ArrayCrossoverStrategy(ABC):
+    @abstractmethod
+    def crossover(self, parents1, parents2, out1, out2, rng, context):
+        """
+        Пакетный кроссовер: parents1/parents2 — матрицы (h, n) перестановок,
+        потомки записываются в заранее выделенные out1/out2.
+        """
+        pass
 
-            # аналогично для c2
-            val = p2[i]
-            while val in mapping1:
-                val = mapping1[val]
-            c2[i] = val
 
-        return c1, c2
+class ArrayPMXCrossover(ArrayCrossoverStrategy):
+    # PMX для всех пар поколения сразу; цепочки замен разрешаются
+    # итеративно через обратные перестановки родителей
+    def __init__(self, crossover_rate=0.8):
+        self.rate     = crossover_rate
+        self._scratch = None
+
+
+    def _buffers(self, h, n):
+        # рабочие массивы переиспользуются между поколениями одной формы
+        if self._scratch is None or self._scratch[0] != (h, n):
+            self._scratch = (
+                (h, n),
+                np.arange(h, dtype=np.int64)[:, None] * n,   # смещения строк
+                np.empty(h * n, dtype=np.int64),              # обратные перестановки
+                np.empty((h, n), dtype=np.int64),             # плоские индексы
+                np.empty((h, n), dtype=np.int64),             # позиции значений в p_seg
+                np.empty((h, n), dtype=bool),
+                np.empty((h, n), dtype=bool),
+            )
+        return self._scratch[1:]
+
+
+    def _fill(self, p_out, p_seg, in_seg, out_seg, lo, hi, cols, out):
+        # потомок (в out): сегмент из p_seg, остальное из p_out через цепочки PMX;
+        # на каждой итерации обрабатываются только ещё не разрешённые позиции
+        h, n = p_out.shape
+        offs, pos, flat, idx, mask, tmp = self._buffers(h, n)
+        np.add(offs, p_seg, out=flat)
+        pos[flat] = cols
+        flat_out = p_out.ravel()
+
+        np.copyto(out, p_out)
+        np.copyto(out, p_seg, where=in_seg)
+        np.add(offs, p_out, out=flat)
+        np.take(pos, flat, out=idx)
+        np.greater_equal(idx, lo, out=mask)
+        np.less(idx, hi, out=tmp)
+        mask &= tmp
+        mask &= out_seg
+        r, c = np.nonzero(mask)
+        i = idx[r, c]
+        lo, hi = lo[:, 0], hi[:, 0]
+        while r.size:
+            val   = flat_out[r * n + i]
+            j     = pos[r * n + val]
+            still = (j >= lo[r]) & (j < hi[r])
+            done  = ~still
+            out[r[done], c[done]] = val[done]
+            r, c, i = r[still], c[still], j[still]
+        return out
+
+
+    def crossover(self, parents1, parents2, out1, out2, rng, context):
+        h, n = parents1.shape
+        if n < 2:
+            out1[...] = parents1
+            out2[...] = parents2
+            return out1, out2
+
+        # точки обрезки [lo, hi); для пар без кроссовера сегмент пустой
+        a = rng.integers(0, n, size=h)
+        b = rng.integers(0, n - 1, size=h)
+        b += b >= a
+        lo = np.minimum(a, b)[:, None]
+        hi = np.maximum(a, b)[:, None]
+        skip = rng.random(h) > context.get('crossover_rate', self.rate)
+        lo[skip] = 0
+        hi[skip] = 0
+
+        cols    = np.arange(n)[None, :]
+        in_seg  = (cols >= lo) & (cols < hi)
+        out_seg = ~in_seg
+        self._fill(parents1, parents2, in_seg, out_seg, lo, hi, cols, out1)
+        self._fill(parents2, parents1, in_seg, out_seg, lo, hi, cols, out2)
+        return out1, out2
+
+
+class ArrayCellPMXCrossover(ArrayPMXCrossover):
+    # Пакетный PMX внутри клеток раскраски (context['cells']): столбцы
+    # переставляются так, чтобы клетки шли подряд, и сегмент каждой пары
+    # выбирается внутри одной случайной клетки. Цепочки замен PMX тогда не
+    # выходят за клетку, и потомки остаются в клетках родителей.
+    # Без клеток (None) — обычный ArrayPMXCrossover.
+    def __init__(self, crossover_rate=0.8):
+        super().__init__(crossover_rate)
+        self._cells  = None
+        self._layout = None
+        self._perm   = None
+
+
+    def crossover(self, parents1, parents2, out1, out2, rng, context):
+        cells = context.get('cells')
+        if cells is None:
+            return super().crossover(parents1, parents2, out1, out2, rng, context)
+        if not cells:
+            # все клетки одноэлементные — потомки совпадают с родителями
+            out1[...] = parents1
+            out2[...] = parents2
+            return out1, out2
+        h, n = parents1.shape
+        if self._cells is not cells:
+            self._cells, self._layout = cells, cell_layout(cells, n)
+        order, starts, sizes, _ = self._layout
+        if self._perm is None or self._perm[0].shape != (h, n):
+            self._perm = tuple(np.empty((h, n), dtype=parents1.dtype) for _ in range(4))
+        q1, q2, c1, c2 = self._perm
+
+        # сегмент [lo, hi) внутри случайной клетки (в переставленных координатах)
+        c = rng.integers(0, len(cells), size=h)
+        a = rng.integers(0, sizes[c])
+        b = rng.integers(0, sizes[c] - 1)
+        b += b >= a
+        lo = (starts[c] + np.minimum(a, b))[:, None]
+        hi = (starts[c] + np.maximum(a, b))[:, None]
+        skip = rng.random(h) > context.get('crossover_rate', self.rate)
+        lo[skip] = 0
+        hi[skip] = 0
+
+        np.take(parents1, order, axis=1, out=q1)
+        np.take(parents2, order, axis=1, out=q2)
+        cols    = np.arange(n)[None, :]
+        in_seg  = (cols >= lo) & (cols < hi)
+        out_seg = ~in_seg
+        self._fill(q1, q2, in_seg, out_seg, lo, hi, cols, c1)
+        self._fill(q2, q1, in_seg, out_seg, lo, hi, cols, c2)
+        out1[:, order] = c1
+        out2[:, order] = c2
+        return out1, out2
 
 
 
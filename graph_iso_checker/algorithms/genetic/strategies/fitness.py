@@ -1,4 +1,5 @@
 # graph_iso_checker/algorithms/genetic/strategies/fitness.py
+import numpy as np
 from abc import ABC, abstractmethod
 
 
@@ -22,4 +23,71 @@ class EdgeMatchFitness(FitnessStrategy):
                 if u < v and g2.has_edge(individual[u], individual[v]):
                     count += 1
         #print(count)
-        return count
\ No newline at end of file
+        return count
+
+
+class ArrayFitnessStrategy(ABC):
+    @abstractmethod
+    def prepare(self, g1, g2, context):
+        """
+        Однократная подготовка структур для пары графов перед запуском GA.
+        """
+        pass
+
+
+    @abstractmethod
+    def evaluate(self, population, context):
+        """
+        Возвращает вектор оценок для матрицы популяции (P, n).
+        """
+        pass
+
+
+class ArrayEdgeMatchFitness(ArrayFitnessStrategy):
+    # Векторизованный EdgeMatchFitness: рёбра g1 — массивы концов,
+    # рёбра g2 — плотная булева матрица (или отсортированные ключи для больших n)
+    DENSE_LIMIT = 4096
+    CHUNK       = 1 << 22
+
+
+    def prepare(self, g1, g2, context):
+        n = g1.num_vertices
+        self.n = n
+        edges = [(u, v) for u in range(n) for v in g1.neighbors(u) if u < v]
+        self.eu = np.array([u for u, _ in edges], dtype=np.int64)
+        self.ev = np.array([v for _, v in edges], dtype=np.int64)
+        if n <= self.DENSE_LIMIT:
+            self.adj2 = np.zeros((n, n), dtype=bool)
+            for u in range(n):
+                for v in g2.neighbors(u):
+                    self.adj2[u, v] = True
+            self.keys2 = None
+        else:
+            self.adj2 = None
+            self.keys2 = np.array(sorted(
+                u * n + v for u in range(n) for v in g2.neighbors(u)
+            ), dtype=np.int64)
+
+
+    def _has_edges(self, a, b):
+        if self.adj2 is not None:
+            return self.adj2[a, b]
+        keys = a.astype(np.int64) * self.n + b
+        if len(self.keys2) == 0:
+            return np.zeros(keys.shape, dtype=bool)
+        pos = np.minimum(np.searchsorted(self.keys2, keys), len(self.keys2) - 1)
+        return self.keys2[pos] == keys
+
+
+    def evaluate(self, population, context):
+        p = population.shape[0]
+        m = len(self.eu)
+        out = np.zeros(p, dtype=np.int64)
+        if m == 0:
+            return out
+        # обрабатываем популяцию блоками, чтобы промежуточные (rows, m) были ограничены
+        step = max(1, self.CHUNK // m)
+        for s in range(0, p, step):
+            block = population[s:s + step]
+            out[s:s + step] = self._has_edges(block[:, self.eu], block[:, self.ev]).sum(axis=1)
+        return out
@@ -0,0 +1,174 @@
+# graph_iso_checker/algorithms/genetic/strategies/local_search.py
+import heapq
+import math
+import random
+from abc import ABC, abstractmethod
+
+
+class LocalSearchStrategy(ABC):
+    @abstractmethod
+    def improve(self, individual, g1, g2, context):
+        """
+        Возвращает (улучшенная особь, её фитнес).
+        """
+        pass
+
+
+def swap_delta(g1, g2, perm, a, b):
+    # изменение числа совпадающих рёбер при обмене perm[a] <-> perm[b], O(deg a + deg b)
+    pa, pb = perm[a], perm[b]
+    delta = 0
+    for w in g1.neighbors(a):
+        if w != b:
+            pw = perm[w]
+            delta += g2.has_edge(pb, pw) - g2.has_edge(pa, pw)
+    for w in g1.neighbors(b):
+        if w != a:
+            pw = perm[w]
+            delta += g2.has_edge(pa, pw) - g2.has_edge(pb, pw)
+    return delta
+
+
+def vertex_conflicts(g1, g2, perm):
+    # число несовпавших рёбер, инцидентных каждой вершине g1
+    return [
+        sum(1 for w in g1.neighbors(u) if not g2.has_edge(perm[u], perm[w]))
+        for u in range(g1.num_vertices)
+    ]
+
+
+def apply_swap(g1, g2, perm, conflicts, a, b):
+    # выполняет обмен и инкрементально обновляет conflicts
+    pa, pb = perm[a], perm[b]
+    for w in g1.neighbors(a):
+        if w != b:
+            pw = perm[w]
+            conflicts[w] += g2.has_edge(pa, pw) - g2.has_edge(pb, pw)
+    for w in g1.neighbors(b):
+        if w != a:
+            pw = perm[w]
+            conflicts[w] += g2.has_edge(pb, pw) - g2.has_edge(pa, pw)
+    perm[a], perm[b] = pb, pa
+    for u in (a, b):
+        conflicts[u] = sum(1 for w in g1.neighbors(u) if not g2.has_edge(perm[u], perm[w]))
+
+
+class ConflictTabuSearch(LocalSearchStrategy):
+    """
+    Жадный hill-climbing по конфликтующим рёбрам: на каждом шаге среди
+    `candidates` вершин с наибольшим числом конфликтов выбирается обмен
+    внутри клетки (context['cells']), сильнее всего уменьшающий число
+    несовпавших рёбер. Недавно переставленные вершины запрещены на
+    `tenure` шагов (кроме обменов, дающих новый рекорд); ничьи
+    разрешаются случайно.
+    Предполагает семантику EdgeMatchFitness.
+    """
+    def __init__(self, max_steps=50, tenure=7, candidates=5):
+        self.max_steps  = max_steps
+        self.tenure     = tenure
+        self.candidates = candidates
+
+
+    def improve(self, individual, g1, g2, context):
+        n = len(individual)
+        perm = list(individual)
+        cells = context.get('cells')
+        if cells is None:
+            cells = [list(range(n))]
+        cell_of = {u: cell for cell in cells for u in cell}
+
+        conflicts = vertex_conflicts(g1, g2, perm)
+        total = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+        mismatched = sum(conflicts) // 2
+        best_perm, best_mis = perm[:], mismatched
+        tabu = {}
+
+        for step in range(self.max_steps):
+            if mismatched == 0:
+                break
+            cand = heapq.nlargest(
+                self.candidates,
+                (u for u in cell_of if conflicts[u] > 0),
+                key=lambda u: (conflicts[u], random.random())
+            )
+            moves, move_delta = [], None
+            for a in cand:
+                for b in cell_of[a]:
+                    if b == a:
+                        continue
+                    d = swap_delta(g1, g2, perm, a, b)
+                    forbidden = tabu.get(a, -1) >= step or tabu.get(b, -1) >= step
+                    if forbidden and mismatched - d >= best_mis:
+                        continue
+                    if move_delta is None or d > move_delta:
+                        moves, move_delta = [(a, b)], d
+                    elif d == move_delta:
+                        moves.append((a, b))
+            if not moves:
+                break
+
+            # среди равноценных обменов выбираем случайный, чтобы не зацикливаться
+            a, b = random.choice(moves)
+            apply_swap(g1, g2, perm, conflicts, a, b)
+            mismatched -= move_delta
+            tabu[a] = tabu[b] = step + self.tenure
+            if mismatched < best_mis:
+                best_perm, best_mis = perm[:], mismatched
+
+        return best_perm, total - best_mis
+
+
+def temperature(schedule, t0, t_end, progress):
+    # температура при доле пройденного бюджета progress ∈ [0, 1]
+    if schedule == 'linear':
+        return t0 + (t_end - t0) * progress
+    # геометрическое охлаждение
+    return t0 * (t_end / t0) ** progress
+
+
+class SimulatedAnnealing(LocalSearchStrategy):
+    """
+    Имитация отжига: случайные обмены внутри клетки (context['cells']),
+    изменение фитнеса — swap_delta за O(deg), ухудшения принимаются с
+    вероятностью exp(delta / T). Возвращает лучшую встреченную особь.
+    Предполагает семантику EdgeMatchFitness.
+    """
+    def __init__(self, iterations=10000, t0=2.0, t_end=0.05, schedule='exponential', rng=None):
+        self.iterations = iterations
+        self.t0         = t0
+        self.t_end      = t_end
+        self.schedule   = schedule
+        # генератор с методами choice/random; по умолчанию — модуль random
+        self.rng        = rng or random
+
+
+    def improve(self, individual, g1, g2, context):
+        n = len(individual)
+        perm = list(individual)
+        cells = context.get('cells')
+        if cells is None:
+            cells = [list(range(n))]
+        cell_of = {u: cell for cell in cells if len(cell) > 1 for u in cell}
+        movable = list(cell_of)
+
+        target = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+        fit = target - sum(vertex_conflicts(g1, g2, perm)) // 2
+        best_perm, best_fit = perm[:], fit
+
+        rng = self.rng
+        for i in range(self.iterations if movable else 0):
+            if fit == target:
+                break
+            a = rng.choice(movable)
+            b = rng.choice(cell_of[a])
+            if a == b:
+                continue
+            d = swap_delta(g1, g2, perm, a, b)
+            t = temperature(self.schedule, self.t0, self.t_end, i / self.iterations)
+            if d >= 0 or rng.random() < math.exp(d / t):
+                perm[a], perm[b] = perm[b], perm[a]
+                fit += d
+                if fit > best_fit:
+                    best_perm, best_fit = perm[:], fit
+
+        return best_perm, best_fit
@@ -1,5 +1,7 @@
 import random
+import numpy as np
 from abc import ABC, abstractmethod
+from .cells import cell_layout
 
 
 class MutationStrategy(ABC):
@@ -13,18 +15,111 @@ class MutationStrategy(ABC):
 
 class SwapMutation(MutationStrategy):
     # Случайный попарный обмен генов с вероятностью rate
+    # (context['mutation_rate'], если задан, имеет приоритет)
     def __init__(self, rate=0.1):
         self.rate = rate
 
 
     def mutate(self, individual, context):
         n = len(individual)
+        rate = context.get('mutation_rate', self.rate)
         for i in range(n):
-            if random.random() < self.rate:
+            if random.random() < rate:
                 j = random.randrange(n)
                 individual[i], individual[j] = individual[j], individual[i]
         return individual
 
 
+class CellSwapMutation(MutationStrategy):
+    # Обмен генов только внутри клетки раскраски (context['cells']):
+    # особь не выходит за пределы допустимых по цветам отображений
+    def __init__(self, rate=0.1):
+        self.rate = rate
+
+
+    def mutate(self, individual, context):
+        cells = context.get('cells')
+        if cells is None:
+            cells = [list(range(len(individual)))]
+        rate = context.get('mutation_rate', self.rate)
+        for cell in cells:
+            k = len(cell)
+            if k < 2:
+                continue
+            for i in cell:
+                if random.random() < rate:
+                    j = cell[random.randrange(k)]
+                    individual[i], individual[j] = individual[j], individual[i]
+        return individual
+
+
+class ArrayMutationStrategy(ABC):
+    @abstractmethod
+    def mutate(self, population, rng, context):
+        """
+        Модифицирует матрицу популяции (P, n) in-place.
+        """
+        pass
+
+
+class ArraySwapMutation(ArrayMutationStrategy):
+    # Пакетный аналог SwapMutation: число обменов в каждой строке ~ Binomial(n, rate),
+    # обмены выполняются раундами сразу по всем строкам
+    def __init__(self, rate=0.1):
+        self.rate = rate
+
+
+    def mutate(self, population, rng, context):
+        p, n = population.shape
+        if n < 2:
+            return population
+        swaps = rng.binomial(n, context.get('mutation_rate', self.rate), size=p)
+        rows  = np.arange(p)
+        for r in range(int(swaps.max(initial=0))):
+            act = rows[swaps > r]
+            i = rng.integers(0, n, size=act.size)
+            j = rng.integers(0, n, size=act.size)
+            tmp = population[act, i]
+            population[act, i] = population[act, j]
+            population[act, j] = tmp
+        return population
+
+
+class ArrayCellSwapMutation(ArraySwapMutation):
+    # Пакетный аналог CellSwapMutation: второй ген обмена берётся из той же
+    # клетки раскраски (context['cells']); без клеток (None) — обычный ArraySwapMutation
+    def __init__(self, rate=0.1):
+        super().__init__(rate)
+        self._cells  = None
+        self._layout = None
+
+
+    def mutate(self, population, rng, context):
+        cells = context.get('cells')
+        if cells is None:
+            return super().mutate(population, rng, context)
+        if not cells:
+            # все клетки одноэлементные — переставлять нечего
+            return population
+        p, n = population.shape
+        # раскладка клеток пересчитывается только при смене context['cells']
+        if self._cells is not cells:
+            self._cells, self._layout = cells, cell_layout(cells, n)
+        order, starts, sizes, cell_of = self._layout
+        movable = order[:int(sizes.sum())]
+
+        swaps = rng.binomial(movable.size, context.get('mutation_rate', self.rate), size=p)
+        rows  = np.arange(p)
+        for r in range(int(swaps.max(initial=0))):
+            act = rows[swaps > r]
+            i = movable[rng.integers(0, movable.size, size=act.size)]
+            c = cell_of[i]
+            j = order[starts[c] + (rng.random(act.size) * sizes[c]).astype(np.int64)]
+            tmp = population[act, i]
+            population[act, i] = population[act, j]
+            population[act, j] = tmp
+        return population
+
+
 
 
@@ -1,4 +1,5 @@
 import random
+import numpy as np
 from abc import ABC, abstractmethod
 
 
@@ -29,5 +30,27 @@ class TournamentSelection(SelectionStrategy):
         return population[best1], population[best2]
 
 
+class ArraySelectionStrategy(ABC):
+    @abstractmethod
+    def select(self, fitnesses, count, rng, context):
+        """
+        Возвращает массив индексов родителей формы (count, 2).
+        """
+        pass
+
+
+class ArrayTournamentSelection(ArraySelectionStrategy):
+    # Пакетная турнирная селекция: все турниры поколения одной операцией.
+    # Участники турнира выбираются с возвращением (при k << P разница несущественна).
+    def __init__(self, k=3):
+        self.k = k
+
+
+    def select(self, fitnesses, count, rng, context):
+        contenders = rng.integers(0, len(fitnesses), size=(count, 2, self.k))
+        best = fitnesses[contenders].argmax(axis=2)
+        return np.take_along_axis(contenders, best[..., None], axis=2)[..., 0]
+
+
 
 
@@ -35,5 +35,20 @@ class StagnationTermination(TerminationStrategy):
         return (generation - last_imp) >= self.stall
 
 
+# прекращение, как только срабатывает любой из вложенных критериев
+class AnyTermination(TerminationStrategy):
+    # strategies — список TerminationStrategy
+    def __init__(self, strategies):
+        self.strategies = strategies
+
+
+    # возвращает True, если хотя бы один критерий требует остановки
+    def should_terminate(self, population, fitnesses, generation, context):
+        return any(
+            s.should_terminate(population, fitnesses, generation, context)
+            for s in self.strategies
+        )
+
+
 
 
@@ -0,0 +1,181 @@
+# graph_iso_checker/algorithms/genetic/vectorized.py
+import random
+import numpy as np
+from .generational              import vertex_groups
+from .strategies.selection      import ArraySelectionStrategy
+from .strategies.crossover      import ArrayCrossoverStrategy
+from .strategies.mutation       import ArrayMutationStrategy
+from .strategies.fitness        import ArrayFitnessStrategy
+from .strategies.termination    import TerminationStrategy
+from .strategies.adaptation     import RateAdaptationStrategy
+
+
+class ArrayGeneticAlgorithm:
+    """
+    Генетический алгоритм с популяцией в виде матрицы (P, n) int32.
+    Селекция, кроссовер, мутация и фитнес выполняются пакетно по всему
+    поколению; поколения чередуются в двух заранее выделенных буферах.
+    """
+    def __init__(self,
+                 population_size: int,
+                 generations: int,
+                 selection: ArraySelectionStrategy,
+                 crossover: ArrayCrossoverStrategy,
+                 mutation: ArrayMutationStrategy,
+                 fitness: ArrayFitnessStrategy,
+                 termination: TerminationStrategy,
+                 seed: int = None,
+                 elite: int = 2,
+                 restart_after: int = None,
+                 max_restarts: int = 3,
+                 adaptation: RateAdaptationStrategy = None):
+        self.population_size = population_size
+        self.max_gens        = generations
+        self.selection       = selection
+        self.crossover       = crossover
+        self.mutation        = mutation
+        self.fitness         = fitness
+        self.termination     = termination
+        self.seed            = seed
+        # частичные перезапуски и адаптация вероятностей — как в GeneticAlgorithm
+        self.elite           = elite
+        self.restart_after   = restart_after
+        self.max_restarts    = max_restarts
+        self.adaptation      = adaptation
+
+
+    def _initialize_population(self, g1, g2, context, out, rng):
+        # перестановки внутри групп (цвета refinement или степени)
+        n = g1.num_vertices
+        groups1, groups2 = vertex_groups(g1, g2, context)
+        # клетки (позиции g1 одного цвета) — для клеточных операторов
+        context['cells'] = [vs1 for vs1 in groups1.values() if len(vs1) > 1]
+        if any(len(vs1) != len(groups2.get(key, ())) for key, vs1 in groups1.items()):
+            # группы несовместимы — обычные случайные перестановки
+            out[...] = rng.permuted(np.tile(np.arange(n, dtype=out.dtype), (len(out), 1)), axis=1)
+            return out
+        for key, vs1 in groups1.items():
+            vs2 = np.array(groups2[key], dtype=out.dtype)
+            out[:, vs1] = rng.permuted(np.tile(vs2, (len(out), 1)), axis=1)
+        return out
+
+
+    def _should_restart(self, generation, context):
+        if self.restart_after is None or context['restarts'] >= self.max_restarts:
+            return False
+        since = max(context['last_improvement'], context['last_restart'])
+        return generation - since >= self.restart_after
+
+
+    def run(self, g1, g2, context, migration=None):
+        # context['cells'] нужен операторам только на время запуска:
+        # прежнее значение восстанавливается, в контекст конвейера клетки не попадают
+        saved = context.get('cells')
+        try:
+            return self._run(g1, g2, context, migration)
+        finally:
+            if saved is None:
+                context.pop('cells', None)
+            else:
+                context['cells'] = saved
+
+
+    def _run(self, g1, g2, context, migration=None):
+        # 1) Проверка числа вершин
+        if g1.num_vertices != g2.num_vertices:
+            return False, None
+        n = g1.num_vertices
+
+
+        # 2) Предварительная проверка распределения степеней
+        deg1 = sorted(len(g1.neighbors(u)) for u in range(n))
+        deg2 = sorted(len(g2.neighbors(u)) for u in range(n))
+        if deg1 != deg2:
+            return False, None
+
+
+        # 3) Целевое число совпадающих рёбер
+        target = context.get('edge_count')
+        if target is None:
+            target = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+
+
+        # 4) Буферы: два поколения и родители; при нечётном P последний потомок отбрасывается
+        seed = self.seed if self.seed is not None else random.getrandbits(64)
+        rng  = np.random.default_rng(seed)
+        half = (self.population_size + 1) // 2
+        buf_cur = np.empty((2 * half, n), dtype=np.int32)
+        buf_nxt = np.empty_like(buf_cur)
+        par1    = np.empty((half, n), dtype=np.int32)
+        par2    = np.empty_like(par1)
+
+        self._initialize_population(g1, g2, context, buf_cur, rng)
+        self.fitness.prepare(g1, g2, context)
+
+
+        best_map, best_fit = None, -1
+        generation = 0
+        context['last_improvement'] = 0
+        context['last_restart']     = 0
+        context['restarts']         = 0
+        context.pop('mutation_rate', None)
+        context.pop('crossover_rate', None)
+
+
+        while True:
+            population = buf_cur[:self.population_size]
+            fitnesses  = self.fitness.evaluate(population, context)
+
+
+            # обновление лучшей особи
+            idx      = int(fitnesses.argmax())
+            gen_best = int(fitnesses[idx])
+            if gen_best > best_fit:
+                best_fit = gen_best
+                best_map = population[idx].tolist()
+                context['last_improvement'] = generation
+                context['best_mapping']     = best_map
+
+            # если найдено полное совпадение
+            if best_fit == target:
+                return True, best_map
+
+
+            # обмен особями с другими островами (IslandModel); True — решение уже найдено другим островом
+            if migration is not None and migration.exchange(generation, population, fitnesses):
+                break
+
+
+            # проверка остановки
+            if self.termination.should_terminate(population, fitnesses, generation, context):
+                break
+
+
+            # застой: элита переносится в начало буфера, остальное пересевается
+            if self._should_restart(generation, context):
+                k = min(self.elite, self.population_size)
+                population[:k] = population[np.argsort(-fitnesses)[:k]]
+                self._initialize_population(g1, g2, context, buf_cur[k:], rng)
+                context['last_restart'] = generation
+                context['restarts']    += 1
+                generation += 1
+                continue
+
+
+            # вероятности операторов следуют за разнообразием популяции
+            if self.adaptation is not None:
+                self.adaptation.update(population, population[idx], context)
+
+
+            # формирование нового поколения в свободном буфере
+            parents = self.selection.select(fitnesses, half, rng, context)
+            np.take(population, parents[:, 0], axis=0, out=par1)
+            np.take(population, parents[:, 1], axis=0, out=par2)
+            self.crossover.crossover(par1, par2, buf_nxt[:half], buf_nxt[half:], rng, context)
+            self.mutation.mutate(buf_nxt, rng, context)
+            buf_cur, buf_nxt = buf_nxt, buf_cur
+            generation += 1
+
+
+        # изоморфизм не найден
+        return False, None
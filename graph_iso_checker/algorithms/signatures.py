@@ -0,0 +1,131 @@
+# graph_iso_checker/algorithms/signatures.py
+import numpy as np
+from abc import ABC, abstractmethod
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+
+# столбцов единичной матрицы за один проход (память O(n * BLOCK))
+BLOCK = 256
+
+
+def _adjacency(g, dtype):
+    # матрица смежности: CSR, если есть scipy, иначе плотная
+    n = g.num_vertices
+    rows = [u for u in range(n) for _ in g.neighbors(u)]
+    cols = [v for u in range(n) for v in g.neighbors(u)]
+    if sp is not None:
+        return sp.csr_matrix((np.ones(len(rows), dtype=dtype), (rows, cols)), shape=(n, n))
+    a = np.zeros((n, n), dtype=dtype)
+    a[rows, cols] = 1
+    return a
+
+
+def _blocks(n):
+    # блоки столбцов единичной матрицы: (вершины блока, сам блок n×b)
+    for start in range(0, n, BLOCK):
+        cols = np.arange(start, min(start + BLOCK, n))
+        eye = np.zeros((n, cols.size))
+        eye[cols, np.arange(cols.size)] = 1
+        yield cols, eye
+
+
+def vertex_triangles(g):
+    # число треугольников при каждой вершине; у BitsetGraph — popcount пересечений строк
+    rows = getattr(g, 'rows', None)
+    counts = []
+    for v in range(g.num_vertices):
+        if rows is not None:
+            row = rows[v]
+            cnt = sum((row & rows[u]).bit_count() for u in g.neighbors(v)) // 2
+        else:
+            nbrs = list(g.neighbors(v))
+            cnt = 0
+            L = len(nbrs)
+            for i in range(L):
+                u = nbrs[i]
+                for j in range(i+1, L):
+                    w = nbrs[j]
+                    if w in g.neighbors(u):
+                        cnt += 1
+        counts.append(cnt)
+    return counts
+
+
+class VertexSignature(ABC):
+    @abstractmethod
+    def compute(self, g):
+        """
+        Инвариантная подпись каждой вершины: список длины n
+        хешируемых значений (сохраняется любым изоморфизмом).
+        """
+        pass
+
+
+class WalkCountSignature(VertexSignature):
+    # Число замкнутых обходов длины 2..k (диагональ A^j): k умножений
+    # разреженной матрицы на блок столбцов единичной матрицы.
+    # Переполнение int64 при больших k одинаково для обоих графов.
+    def __init__(self, k=5):
+        self.k = k
+
+
+    def compute(self, g):
+        n = g.num_vertices
+        a = _adjacency(g, np.int64)
+        walks = np.zeros((n, max(self.k - 1, 0)), dtype=np.int64)
+        for cols, eye in _blocks(n):
+            x = eye.astype(np.int64)
+            for j in range(1, self.k + 1):
+                x = a @ x
+                if j >= 2:
+                    walks[cols, j - 2] = x[cols, np.arange(cols.size)]
+        return [tuple(row) for row in walks.tolist()]
+
+
+class TriangleSignature(VertexSignature):
+    # Число треугольников при вершине
+    def compute(self, g):
+        return vertex_triangles(g)
+
+
+class DistanceProfileSignature(VertexSignature):
+    # Гистограмма расстояний BFS, обрезанная на глубине depth: число вершин
+    # на расстоянии 1..depth. Фронты всех вершин блока двигаются одним
+    # умножением матрицы смежности на булеву матрицу фронтов.
+    def __init__(self, depth=3):
+        self.depth = depth
+
+
+    def compute(self, g):
+        n = g.num_vertices
+        a = _adjacency(g, np.float64)
+        hist = np.zeros((n, self.depth), dtype=np.int64)
+        for cols, eye in _blocks(n):
+            reached = eye > 0
+            frontier = eye
+            for d in range(self.depth):
+                nxt = (a @ frontier) > 0
+                nxt &= ~reached
+                hist[cols, d] = nxt.sum(axis=0)
+                reached |= nxt
+                frontier = nxt.astype(np.float64)
+        return [tuple(row) for row in hist.tolist()]
+
+
+DEFAULT_SIGNATURES = (WalkCountSignature(), TriangleSignature(), DistanceProfileSignature())
+
+
+def vertex_signatures(g, signatures=DEFAULT_SIGNATURES):
+    """
+    Подписи вершин g: кортеж значений всех signatures для каждой вершины.
+    """
+    columns = [sig.compute(g) for sig in signatures]
+    return list(zip(*columns)) if columns else [()] * g.num_vertices
+
+
+
+
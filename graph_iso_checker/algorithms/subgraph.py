@@ -0,0 +1,258 @@
+# graph_iso_checker/algorithms/subgraph.py
+import time
+import numpy as np
+from collections import Counter
+
+
+def _to_int(mask):
+    # булев массив вершин -> битсет Python int
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+class HostIndex:
+    """
+    Индексы графа-хозяина, общие для всех запросов к нему:
+      - рёбра в обе стороны как массивы (src, dst, метка), отсортированные по src;
+      - корзины вершин по метке и по степени;
+      - подписи окрестностей: число соседей с данной меткой и число соседей
+        со степенью не меньше d (векторы по всем вершинам, по запросу);
+      - строки смежности-битсеты для поиска (у BitsetGraph — готовые, иначе
+        строятся лениво для вершин, до которых дошёл поиск), по меткам рёбер.
+    Массивы строятся один раз за O(n + m), остальное кешируется по мере запросов.
+    """
+    def __init__(self, host):
+        self.host = host
+        n = self.n = host.num_vertices
+        src = np.array([u for u in range(n) for _ in host.neighbors(u)], dtype=np.int64)
+        dst = np.array([w for u in range(n) for w in host.neighbors(u)], dtype=np.int64)
+        self.src, self.dst = src, dst
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+        self.degree = np.diff(self.indptr)
+        self.vertex_labels = np.array([host.vertex_label(v) for v in range(n)], dtype=np.int64)
+        self.edge_labels = np.array(
+            [host.edge_label(u, w) for u, w in zip(src.tolist(), dst.tolist())], dtype=np.int64
+        ) if host.edge_labels else np.zeros(len(src), dtype=np.int64)
+
+        rows = getattr(host, 'rows', None)
+        self._rows        = dict(enumerate(rows)) if rows is not None else {}
+        self._label_rows  = {}
+        self._label_count = {}
+        self._degree_count = {}
+
+
+    def bucket(self, label, degree):
+        # вершины с меткой label и степенью не меньше degree (булев массив)
+        return (self.vertex_labels == label) & (self.degree >= degree)
+
+
+    def label_count(self, label):
+        # для каждой вершины — число соседей с меткой label
+        count = self._label_count.get(label)
+        if count is None:
+            hit = self.vertex_labels[self.dst] == label
+            count = self._label_count[label] = np.bincount(self.src[hit], minlength=self.n)
+        return count
+
+
+    def degree_count(self, d):
+        # для каждой вершины — число соседей степени не меньше d
+        count = self._degree_count.get(d)
+        if count is None:
+            hit = self.degree[self.dst] >= d
+            count = self._degree_count[d] = np.bincount(self.src[hit], minlength=self.n)
+        return count
+
+
+    def support(self, mask, label=None):
+        # вершины, смежные (по ребру с меткой label) хотя бы с одной вершиной mask
+        hit = mask[self.src]
+        if label is not None:
+            hit &= self.edge_labels == label
+        out = np.zeros(self.n, dtype=bool)
+        out[self.dst[hit]] = True
+        return out
+
+
+    def row(self, v, label=None):
+        # соседи v битсетом; label — только по рёбрам с этой меткой
+        if label is None:
+            row = self._rows.get(v)
+            if row is None:
+                row = self._rows[v] = sum(1 << int(w) for w in self.dst[self.indptr[v]:self.indptr[v + 1]])
+            return row
+        rows = self._label_rows.get(v)
+        if rows is None:
+            rows = {}
+            lo, hi = self.indptr[v], self.indptr[v + 1]
+            for w, key in zip(self.dst[lo:hi].tolist(), self.edge_labels[lo:hi].tolist()):
+                rows[key] = rows.get(key, 0) | (1 << w)
+            self._label_rows[v] = rows
+        return rows.get(label, 0)
+
+
+    def initial_candidates(self, pattern, p):
+        """
+        Кандидаты для вершины p образца (булев массив): та же метка, степень
+        не меньше, окрестность p вкладывается в окрестность кандидата — по
+        меткам соседей и по степеням соседей (для каждого порога d соседей
+        степени >= d у кандидата не меньше).
+        """
+        nbrs = pattern.neighbors(p)
+        cand = self.bucket(pattern.vertex_label(p), len(nbrs))
+        for label, c in Counter(pattern.vertex_label(q) for q in nbrs).items():
+            cand &= self.label_count(label) >= c
+        degrees = sorted((len(pattern.neighbors(q)) for q in nbrs), reverse=True)
+        for i, d in enumerate(degrees):
+            if i + 1 == len(degrees) or degrees[i + 1] != d:
+                cand &= self.degree_count(d) >= i + 1
+        return cand
+
+
+class SubgraphMatcher:
+    """
+    Поиск образца pattern в графе-хозяине (по HostIndex): induced=True —
+    индуцированный подграф (рёбра и не-рёбра сохраняются), False — вложение
+    (только рёбра). Метки вершин и рёбер должны совпадать.
+    Кандидаты фильтруются индексом и дуговой согласованностью, вершины
+    образца упорядочиваются "сначала связанные с уже выбранными, среди них —
+    с наименьшим множеством кандидатов", и поиск с возвратом перечисляет
+    вложения потоком (генератор) с явным стеком.
+    """
+    def __init__(self, pattern, index, induced=True):
+        self.pattern = pattern
+        self.index   = index
+        self.induced = induced
+        self.stats   = {}
+
+
+    def _edge_label(self, p, q):
+        # метка ребра образца для HostIndex.row/support; None — метки рёбер нигде не заданы
+        if self.pattern.edge_labels or self.index.host.edge_labels:
+            return self.pattern.edge_label(p, q)
+        return None
+
+
+    def candidates(self):
+        """
+        Кандидаты всех вершин образца (битсеты) после дуговой согласованности
+        (AC-3 по рёбрам образца): кандидат p остаётся, только если у него есть
+        сосед (с той же меткой ребра) среди кандидатов каждого соседа q; опора
+        дуги считается одним проходом по массиву рёбер хозяина. Не-рёбра при
+        induced почти ничего не отсекают на разреженном хозяине и проверяются
+        уже в поиске. None — вложений нет.
+        """
+        P, index = self.pattern, self.index
+        k = P.num_vertices
+        dom = [index.initial_candidates(P, p) for p in range(k)]
+        if any(not d.any() for d in dom):
+            return None
+        if np.logical_or.reduce(dom).sum() < k:
+            return None
+
+        # пересмотр дуги (p, q): p теряет кандидатов без опоры среди кандидатов q
+        arcs = [(p, q) for p in range(k) for q in P.neighbors(p)]
+        queue, queued = list(arcs), set(arcs)
+        while queue:
+            p, q = queue.pop()
+            queued.discard((p, q))
+            keep = dom[p] & index.support(dom[q], self._edge_label(p, q))
+            if keep.sum() == dom[p].sum():
+                continue
+            if not keep.any():
+                return None
+            dom[p] = keep
+            # сужение p может нарушить дуги, ведущие в p
+            for r in P.neighbors(p):
+                if (r, p) not in queued:
+                    queue.append((r, p))
+                    queued.add((r, p))
+        return [_to_int(d) for d in dom]
+
+
+    def _plan(self, dom):
+        # порядок вершин образца и ограничения от уже отображённых вершин
+        P = self.pattern
+        k = P.num_vertices
+        order, placed = [], set()
+        while len(order) < k:
+            rest = [p for p in range(k) if p not in placed]
+            p = min(rest, key=lambda r: (-len(P.neighbors(r) & placed), dom[r].bit_count()))
+            order.append(p)
+            placed.add(p)
+        pos = {p: i for i, p in enumerate(order)}
+        linked, unlinked = [], []
+        for i, p in enumerate(order):
+            before = order[:i]
+            linked.append([(pos[q], self._edge_label(p, q)) for q in before if q in P.neighbors(p)])
+            unlinked.append([pos[q] for q in before if q not in P.neighbors(p)] if self.induced else [])
+        return order, linked, unlinked
+
+
+    def matches(self, limit=None, time_budget=None):
+        """
+        Генератор вложений образца — словарей {вершина образца: вершина
+        хозяина}. limit — не больше limit вложений, time_budget — секунд на
+        весь перебор. В self.stats: nodes, found и timed_out (перебор
+        оборван по времени, вложений может быть больше).
+        """
+        self.stats = stats = {'nodes': 0, 'found': 0, 'timed_out': False}
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        dom = self.candidates()
+        if dom is None:
+            return
+        k = self.pattern.num_vertices
+        if k == 0:
+            stats['found'] = 1
+            yield {}
+            return
+        order, linked, unlinked = self._plan(dom)
+        index = self.index
+
+        def options(i, image, used):
+            # кандидаты i-й вершины порядка при уже выбранных образах
+            c = dom[order[i]] & ~used
+            for j, label in linked[i]:
+                c &= index.row(image[j], label)
+            for j in unlinked[i]:
+                c &= ~index.row(image[j])
+            return c
+
+        image, used = [0] * k, 0
+        stack = [options(0, image, used)]
+        while stack:
+            i = len(stack) - 1
+            c = stack[i]
+            if not c:
+                # кандидаты уровня исчерпаны — освобождаем образ родителя
+                stack.pop()
+                if i:
+                    used &= ~(1 << image[i - 1])
+                continue
+            low = c & -c
+            stack[i] = c ^ low
+            image[i] = low.bit_length() - 1
+            stats['nodes'] += 1
+            if deadline is not None and not stats['nodes'] & 255 and time.perf_counter() > deadline:
+                stats['timed_out'] = True
+                return
+            if i + 1 == k:
+                stats['found'] += 1
+                yield {order[j]: image[j] for j in range(k)}
+                if limit is not None and stats['found'] >= limit:
+                    return
+                continue
+            used |= low
+            stack.append(options(i + 1, image, used))
+
+
+def find_subgraphs(pattern, host, limit=None, time_budget=None, induced=True, index=None):
+    """
+    Список вложений pattern в host (см. SubgraphMatcher.matches). Для
+    серии запросов к одному хозяину передавайте общий index = HostIndex(host).
+    """
+    matcher = SubgraphMatcher(pattern, index or HostIndex(host), induced)
+    return list(matcher.matches(limit, time_budget))
+
+
+
+
@@ -0,0 +1,115 @@
+# graph_iso_checker/algorithms/trees.py
+
+
+def tree_centers(adj, vertices=None):
+    """
+    Центр(ы) дерева: листья обрываются слоями, пока не останется одна
+    или две вершины. adj — списки (множества) смежности; vertices —
+    вершины дерева, если оно лишь компонента графа. O(n), без рекурсии.
+    """
+    vertices = list(range(len(adj)) if vertices is None else vertices)
+    if len(vertices) <= 2:
+        return vertices
+    degree = {v: len(adj[v]) for v in vertices}
+    leaves = [v for v in vertices if degree[v] <= 1]
+    remaining = len(vertices)
+    while remaining > 2:
+        remaining -= len(leaves)
+        layer = []
+        for leaf in leaves:
+            for w in adj[leaf]:
+                degree[w] -= 1
+                if degree[w] == 1:
+                    layer.append(w)
+        leaves = layer
+    return leaves
+
+
+def ahu_codes(adj, root, codes):
+    """
+    Коды поддеревьев дерева, подвешенного за root (AHU): код вершины —
+    номер отсортированного кортежа кодов детей в общем словаре codes,
+    поэтому коды сравнимы между деревьями с одним словарём. Обход в
+    ширину и свёртка в обратном порядке — без рекурсии.
+    Возвращает (коды, дети) — словари по вершинам.
+    """
+    parent   = {root: None}
+    children = {root: []}
+    order    = [root]
+    for v in order:
+        kids = children[v]
+        for w in adj[v]:
+            if w not in parent:
+                parent[w] = v
+                children[w] = []
+                kids.append(w)
+                order.append(w)
+    code = {}
+    leaf = codes.setdefault((), len(codes))
+    for v in reversed(order):
+        kids = children[v]
+        if not kids:
+            code[v] = leaf
+            continue
+        key = tuple(sorted([code[w] for w in kids]))
+        code[v] = codes.setdefault(key, len(codes))
+    return code, children
+
+
+def match_rooted(root1, root2, code1, children1, code2, children2, mapping):
+    # изоморфизм подвешенных деревьев с равными кодами корней: сверху вниз,
+    # дети сопоставляются по равенству кодов; результат дописывается в mapping
+    pairs = [(root1, root2)]
+    while pairs:
+        a, b = pairs.pop()
+        mapping[a] = b
+        by_code = {}
+        for w in children2[b]:
+            by_code.setdefault(code2[w], []).append(w)
+        for w in children1[a]:
+            pairs.append((w, by_code[code1[w]].pop()))
+    return mapping
+
+
+def _rooted(adj, verts, codes):
+    # дерево подвешивается за первый центр; при двух центрах ключ — пара
+    # кодов половин по обе стороны центрального ребра, поэтому у изоморфных
+    # деревьев он общий, а обход нужен один
+    centers = tree_centers(adj, verts)
+    root = centers[0]
+    code, children = ahu_codes(adj, root, codes)
+    if len(centers) == 1:
+        key = (code[root],)
+    else:
+        other = centers[1]
+        rest = tuple(sorted(code[w] for w in children[root] if w != other))
+        key = tuple(sorted((codes.setdefault(rest, len(codes)), code[other])))
+    return key, (root, code, children, centers)
+
+
+def forest_mapping(adj1, trees1, adj2, trees2, codes, mapping=None):
+    """
+    Изоморфизм лесов: trees — списки вершин деревьев. Деревья сопоставляются
+    по ключу (коды относительно центров), отображение дописывается в mapping.
+    Возвращает mapping или None, если леса не изоморфны.
+    """
+    mapping = {} if mapping is None else mapping
+    by_key = {}
+    for verts in trees2:
+        key, rooted = _rooted(adj2, verts, codes)
+        by_key.setdefault(key, []).append(rooted)
+    for verts in trees1:
+        key, (root1, code1, children1, _) = _rooted(adj1, verts, codes)
+        if not by_key.get(key):
+            return None
+        root2, code2, children2, centers2 = by_key[key].pop()
+        if code2[root2] != code1[root1]:
+            # два центра, и второе дерево подвешено «с другой стороны» центрального ребра
+            root2 = centers2[1]
+            code2, children2 = ahu_codes(adj2, root2, codes)
+        match_rooted(root1, root2, code1, children1, code2, children2, mapping)
+    return mapping
+
+
+
+
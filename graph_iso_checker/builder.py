@@ -1,10 +1,23 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 from .stage import Stage, StageResult
 from .graph import Graph
 from .stages.invariant_stage import InvariantStage
 from .stages.refinement_stage import RefinementStage
+from .algorithms.signatures import VertexSignature
 from .stages.genetic_stage import GeneticStage
 from .stages.exact_search_stage import ExactSearchStage
+from .stages.spectral_stage import SpectralStage
+from .stages.two_wl_stage import TwoWLStage
+from .stages.annealing_stage import AnnealingStage
+from .stages.parallel_exact_stage import ParallelExactSearchStage
+from .stages.component_stage import ComponentStage
+from .stages.block_stage import BlockStage
+from .stages.tree_stage import TreeStage
+from .stages.peeling_stage import PeelingStage
+from .stages.twin_stage import TwinStage
+from .stages.complement_stage import ComplementStage
+from .stages.dense_stage import DenseBackendStage
+from .profiling import StageProfiler
 
 
 class GraphIsoChecker:
@@ -16,14 +29,16 @@ class GraphIsoChecker:
 
 
     def check_isomorphism(
-        self, g1: Graph, g2: Graph
+        self, g1: Graph, g2: Graph, context: Optional[dict] = None
     ) -> Tuple[bool, Optional[dict]]:
         """
         Возвращает (is_iso, mapping).
         Если is_iso == True, mapping — отображение вершин g1→g2.
         Если is_iso == False, mapping == None.
+        context — общий словарь этапов (по умолчанию новый).
         """
-        context = {}
+        if context is None:
+            context = {}
         for stage in self.stages:
             result = stage.run(g1, g2, context)
             if result == StageResult.ISO:
@@ -40,33 +55,102 @@ class GraphIsoCheckerBuilder:
     """
     def __init__(self):
         self._stages: List[Stage] = []
+        self._profiler: Optional[StageProfiler] = None
+        self._components = False
+        self._peeling    = False
+        self._twins      = False
+        self._complement: Optional[float] = None
+        self._dense: Optional[float] = None
+        self._component_workers: Optional[int] = None
 
 
-    def add_invariant_stage(self) -> "GraphIsoCheckerBuilder":
-        self._stages.append(InvariantStage())
+    def add_tree_stage(self) -> "GraphIsoCheckerBuilder":
+        self._stages.append(TreeStage())
         return self
 
 
-    def add_refinement_stage(self) -> "GraphIsoCheckerBuilder":
-        self._stages.append(RefinementStage())
+    def add_invariant_stage(
+        self, *, signatures: Optional[Sequence[VertexSignature]] = None
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(InvariantStage(signatures=signatures))
+        return self
+
+
+    def add_refinement_stage(
+        self, *, signatures: Optional[Sequence[VertexSignature]] = None
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(RefinementStage(signatures=signatures))
+        return self
+
+
+    def add_two_wl_stage(self, *, max_n: int = 400) -> "GraphIsoCheckerBuilder":
+        self._stages.append(TwoWLStage(max_n=max_n))
+        return self
+
+
+    def add_spectral_stage(
+        self, *, k: int = 8, matrix: str = 'adjacency'
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(SpectralStage(k=k, matrix=matrix))
+        return self
+
+
+    def add_block_stage(self, *, budget: int = 100000) -> "GraphIsoCheckerBuilder":
+        self._stages.append(BlockStage(budget=budget))
         return self
 
 
     def add_genetic_stage(
-        self, *, population_size: int = 50, generations: int = 200, stall: int = 20
+        self, *, population_size: int = 50, generations: int = 200, stall: int = 20,
+        array_population: bool = False, memetic: bool = False, islands: int = 0,
+        multilevel: bool = False
     ) -> "GraphIsoCheckerBuilder":
         self._stages.append(
             GeneticStage(
                 population_size=population_size,
                 generations=generations,
-                stall=stall
+                stall=stall,
+                array_population=array_population,
+                memetic=memetic,
+                islands=islands,
+                multilevel=multilevel
+            )
+        )
+        return self
+
+
+    def add_annealing_stage(
+        self, *, iterations: int = 50000, restarts: Optional[int] = None,
+        t0: float = 2.0, t_end: float = 0.05, schedule: str = 'exponential',
+        workers: Optional[int] = None, tabu_steps: int = 0
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(
+            AnnealingStage(
+                iterations=iterations,
+                restarts=restarts,
+                t0=t0,
+                t_end=t_end,
+                schedule=schedule,
+                workers=workers,
+                tabu_steps=tabu_steps
             )
         )
         return self
 
 
-    def add_exact_search_stage(self) -> "GraphIsoCheckerBuilder":
-        self._stages.append(ExactSearchStage())
+    def add_exact_search_stage(
+        self, *, forward_checking: bool = False, automorphisms: bool = False
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(
+            ExactSearchStage(forward_checking=forward_checking, automorphisms=automorphisms)
+        )
+        return self
+
+
+    def add_parallel_exact_search_stage(
+        self, *, workers: Optional[int] = None, budget: int = 20000
+    ) -> "GraphIsoCheckerBuilder":
+        self._stages.append(ParallelExactSearchStage(workers=workers, budget=budget))
         return self
 
 
@@ -75,8 +159,64 @@ class GraphIsoCheckerBuilder:
         return self
 
 
+    def with_profiler(self, profiler: StageProfiler) -> "GraphIsoCheckerBuilder":
+        # каждый этап будет выполняться под профилировщиком
+        self._profiler = profiler
+        return self
+
+
+    def with_component_decomposition(
+        self, workers: Optional[int] = None
+    ) -> "GraphIsoCheckerBuilder":
+        # весь конвейер выполняется отдельно для каждой пары связных компонент
+        self._components = True
+        self._component_workers = workers
+        return self
+
+
+    def with_peeling(self) -> "GraphIsoCheckerBuilder":
+        # конвейер решает задачу для 2-ядер, бахрома из листьев — метки вершин ядра
+        self._peeling = True
+        return self
+
+
+    def with_twin_reduction(self) -> "GraphIsoCheckerBuilder":
+        # конвейер решает задачу для фактор-графов по классам близнецов
+        self._twins = True
+        return self
+
+
+    def with_complement_switching(self, threshold: float = 0.5) -> "GraphIsoCheckerBuilder":
+        # при плотности выше threshold конвейер работает на дополнениях графов
+        self._complement = threshold
+        return self
+
+
+    def with_dense_backend(self, threshold: float = 0.3) -> "GraphIsoCheckerBuilder":
+        # при плотности от threshold графы переводятся в BitsetGraph
+        self._dense = threshold
+        return self
+
+
     def build(self) -> GraphIsoChecker:
-        return GraphIsoChecker(self._stages)
+        stages = self._stages
+        if self._profiler is not None:
+            stages = [self._profiler.wrap(stage) for stage in stages]
+        # обёртки изнутри наружу: близнецы, 2-ядро, компоненты,
+        # плотное представление, дополнение
+        if self._twins:
+            stages = [TwinStage(GraphIsoChecker(stages))]
+        if self._peeling:
+            stages = [PeelingStage(GraphIsoChecker(stages))]
+        if self._components:
+            # под профилировщиком компоненты решаются в одном процессе
+            workers = 1 if self._profiler is not None else self._component_workers
+            stages = [ComponentStage(GraphIsoChecker(stages), workers=workers)]
+        if self._dense is not None:
+            stages = [DenseBackendStage(GraphIsoChecker(stages), threshold=self._dense)]
+        if self._complement is not None:
+            stages = [ComplementStage(GraphIsoChecker(stages), threshold=self._complement)]
+        return GraphIsoChecker(stages)
 
 
 
@@ -1,20 +1,77 @@
 import random
 import json
+from array import array
+from collections.abc import Mapping
 
 
-class Graph:
-    def __init__(self, num_vertices):
+class _Labels:
+    """
+    Метки вершин и рёбер (например, типы атомов и связей), общие для Graph
+    и BitsetGraph: vertex_labels — array('l') длины n или None, edge_labels —
+    словарь {(u, v), u < v: метка}. Отсутствующая метка считается нулём,
+    граф без меток — графом с нулевыми метками.
+    """
+    def vertex_label(self, u):
+        return 0 if self.vertex_labels is None else self.vertex_labels[u]
+
+
+    def edge_label(self, u, v):
+        return self.edge_labels.get((u, v) if u < v else (v, u), 0)
+
+
+    def set_vertex_label(self, u, label):
+        if self.vertex_labels is None:
+            self.vertex_labels = array('l', [0]) * self.num_vertices
+        self.vertex_labels[u] = label
+        self._fingerprint = None
+
+
+    @property
+    def labeled(self):
+        return self.vertex_labels is not None or bool(self.edge_labels)
+
+
+    def _relabeled(self, g, index):
+        # переносит метки в g; index — старая вершина -> новая (вершины вне index отбрасываются)
+        if self.vertex_labels is not None:
+            g.vertex_labels = array('l', [0]) * g.num_vertices
+            for u, i in index.items():
+                g.vertex_labels[i] = self.vertex_labels[u]
+        for (u, v), label in self.edge_labels.items():
+            i, j = index.get(u), index.get(v)
+            if i is not None and j is not None:
+                g.edge_labels[(i, j) if i < j else (j, i)] = label
+        return g
+
+
+    def _labels_json(self, data):
+        if self.vertex_labels is not None:
+            data['vertex_labels'] = self.vertex_labels.tolist()
+        if self.edge_labels:
+            data['edge_labels'] = [[u, v, label] for (u, v), label in sorted(self.edge_labels.items())]
+        return data
+
+
+class Graph(_Labels):
+    def __init__(self, num_vertices, vertex_labels=None):
         # инициализация пустого неориентированного графа
         self.num_vertices = num_vertices
         self.adj = {i: set() for i in range(num_vertices)}
+        self.vertex_labels = None if vertex_labels is None else array('l', vertex_labels)
+        self.edge_labels   = {}
+        # отпечаток WL (algorithms/fingerprint), сбрасывается при добавлении ребра
+        self._fingerprint = None
 
 
-    def add_edge(self, u, v):
-        # добавить ребро (без петель)
+    def add_edge(self, u, v, label=None):
+        # добавить ребро (без петель), label — метка ребра
         if u == v:
             return
         self.adj[u].add(v)
         self.adj[v].add(u)
+        if label is not None:
+            self.edge_labels[(u, v) if u < v else (v, u)] = label
+        self._fingerprint = None
 
 
     def has_edge(self, u, v):
@@ -36,29 +93,213 @@ class Graph:
             for v in self.adj[u]:
                 if u < v:
                     g2.add_edge(perm[u], perm[v])
-        return g2, perm
+        return self._relabeled(g2, dict(enumerate(perm))), perm
+
+
+    def induced_subgraph(self, vertices):
+        # подграф на vertices; вершина vertices[i] становится вершиной i
+        index = {u: i for i, u in enumerate(vertices)}
+        sub = Graph(len(vertices))
+        for i, u in enumerate(vertices):
+            for w in self.adj[u]:
+                j = index.get(w)
+                if j is not None and i < j:
+                    sub.add_edge(i, j)
+        return self._relabeled(sub, index)
+
+
+    def complement(self):
+        # дополнение графа: строки — разности множеств, O(n^2) на уровне C;
+        # метки вершин сохраняются, у рёбер дополнения меток нет
+        n = self.num_vertices
+        everyone = set(range(n))
+        comp = Graph(n, self.vertex_labels)
+        comp.adj = {u: everyone - self.adj[u] - {u} for u in range(n)}
+        return comp
 
 
     def to_json(self):
-        # сериализация в JSON
+        # сериализация в JSON (метки — только если заданы)
         data = {
             'num_vertices': self.num_vertices,
             'adjacency': [sorted(self.adj[u]) for u in range(self.num_vertices)]
         }
-        return json.dumps(data)
+        return json.dumps(self._labels_json(data))
 
 
     @classmethod
     def from_json(cls, s):
         # десериализация из JSON
         data = json.loads(s)
-        g = cls(data['num_vertices'])
+        g = cls(data['num_vertices'], data.get('vertex_labels'))
         for u, nbrs in enumerate(data['adjacency']):
             for v in nbrs:
                 g.add_edge(u, v)
+        for u, v, label in data.get('edge_labels', ()):
+            g.edge_labels[(u, v) if u < v else (v, u)] = label
         return g
 
 
+class _RowsView(Mapping):
+    # adj для BitsetGraph: вершина -> множество соседей (раскрывается из строки по запросу)
+    def __init__(self, graph):
+        self._graph = graph
+
+
+    def __getitem__(self, u):
+        if not 0 <= u < self._graph.num_vertices:
+            raise KeyError(u)
+        return self._graph.neighbors(u)
+
+
+    def __iter__(self):
+        return iter(range(self._graph.num_vertices))
+
+
+    def __len__(self):
+        return self._graph.num_vertices
+
+
+class BitsetGraph(_Labels):
+    """
+    Плотное представление с тем же интерфейсом, что у Graph: строка
+    смежности — Python int, бит v установлен, если v — сосед. has_edge и
+    степень — O(1) и popcount; ядра, знающие о rows (треугольники,
+    кластеризация, домены точного поиска), работают пословными AND.
+    Множества соседей для остального кода раскрываются из строк лениво
+    и кешируются.
+    """
+    def __init__(self, num_vertices):
+        self.num_vertices = num_vertices
+        self.rows  = [0] * num_vertices
+        self._sets = {}
+        self.vertex_labels = None
+        self.edge_labels   = {}
+        self._fingerprint = None
+
+
+    @classmethod
+    def from_graph(cls, g):
+        bg = cls(g.num_vertices)
+        bg.rows = [sum(1 << v for v in g.neighbors(u)) for u in range(g.num_vertices)]
+        return g._relabeled(bg, {u: u for u in range(g.num_vertices)})
+
+
+    @property
+    def adj(self):
+        return _RowsView(self)
+
+
+    def add_edge(self, u, v, label=None):
+        if u == v:
+            return
+        self.rows[u] |= 1 << v
+        self.rows[v] |= 1 << u
+        if label is not None:
+            self.edge_labels[(u, v) if u < v else (v, u)] = label
+        self._sets.pop(u, None)
+        self._sets.pop(v, None)
+        self._fingerprint = None
+
+
+    def has_edge(self, u, v):
+        return 0 <= u < self.num_vertices and self.rows[u] >> v & 1 == 1
+
+
+    def degree(self, u):
+        return self.rows[u].bit_count()
+
+
+    def neighbors(self, u):
+        nbrs = self._sets.get(u)
+        if nbrs is None:
+            nbrs, row = set(), self.rows[u]
+            while row:
+                low = row & -row
+                nbrs.add(low.bit_length() - 1)
+                row ^= low
+            self._sets[u] = nbrs
+        return nbrs
+
+
+    def random_permutation(self):
+        perm = list(range(self.num_vertices))
+        random.shuffle(perm)
+        g2 = BitsetGraph(self.num_vertices)
+        for u in range(self.num_vertices):
+            g2.rows[perm[u]] = sum(1 << perm[v] for v in self.neighbors(u))
+        return self._relabeled(g2, dict(enumerate(perm))), perm
+
+
+    def induced_subgraph(self, vertices):
+        index = {u: i for i, u in enumerate(vertices)}
+        sub = BitsetGraph(len(vertices))
+        for i, u in enumerate(vertices):
+            sub.rows[i] = sum(1 << index[w] for w in self.neighbors(u) if w in index)
+        return self._relabeled(sub, index)
+
+
+    def complement(self):
+        full = (1 << self.num_vertices) - 1
+        comp = BitsetGraph(self.num_vertices)
+        comp.rows = [full & ~row & ~(1 << u) for u, row in enumerate(self.rows)]
+        if self.vertex_labels is not None:
+            comp.vertex_labels = array('l', self.vertex_labels)
+        return comp
+
+
+    def to_json(self):
+        return json.dumps(self._labels_json({
+            'num_vertices': self.num_vertices,
+            'adjacency': [sorted(self.neighbors(u)) for u in range(self.num_vertices)]
+        }))
+
+
+    @classmethod
+    def from_json(cls, s):
+        return cls.from_graph(Graph.from_json(s))
+
+
+def connected_components(g):
+    # списки вершин связных компонент (обход в ширину)
+    seen = [False] * g.num_vertices
+    components = []
+    for s in range(g.num_vertices):
+        if seen[s]:
+            continue
+        seen[s] = True
+        comp = [s]
+        for v in comp:
+            for w in g.adj[v]:
+                if not seen[w]:
+                    seen[w] = True
+                    comp.append(w)
+        components.append(comp)
+    return components
+
+
+def verify_mapping(g1, g2, mapping):
+    # проверка за O(n + m), что mapping (dict или список u -> v) — изоморфизм g1 -> g2,
+    # сохраняющий метки вершин и рёбер
+    n = g1.num_vertices
+    if g2.num_vertices != n or len(mapping) != n:
+        return False
+    image = [mapping[u] for u in range(n)]
+    if sorted(image) != list(range(n)):
+        return False
+    m1 = sum(len(g1.adj[u]) for u in range(n))
+    m2 = sum(len(g2.adj[v]) for v in range(n))
+    if m1 != m2:
+        return False
+    # биекция с равным числом рёбер: достаточно, чтобы каждое ребро g1 перешло в ребро g2
+    if not all(image[v] in g2.adj[image[u]] for u in range(n) for v in g1.adj[u]):
+        return False
+    if not (g1.labeled or g2.labeled):
+        return True
+    return all(g1.vertex_label(u) == g2.vertex_label(image[u]) for u in range(n)) and \
+        all(g1.edge_label(u, v) == g2.edge_label(image[u], image[v]) for u in range(n) for v in g1.adj[u])
+
+
 def generate_random_graph(n, p):
     # генерация случайного графа G(n, p)
     g = Graph(n)
@@ -3,6 +3,9 @@ import sys
 import argparse
 from graph_iso_checker.graph import Graph
 from graph_iso_checker.builder import GraphIsoCheckerBuilder
+from graph_iso_checker.profiling import StageProfiler
+from graph_iso_checker.algorithms.signatures import DEFAULT_SIGNATURES
+from graph_iso_checker.algorithms.subgraph import find_subgraphs
 
 
 def load_graph(path: str) -> Graph:
@@ -22,17 +25,110 @@ def main():
         action="store_true",
         help="Пропустить этап генетического поиска"
     )
+    parser.add_argument(
+        "--no-spectral",
+        action="store_true",
+        help="Пропустить спектральную эвристику перед GA"
+    )
+    parser.add_argument(
+        "--blocks",
+        action="store_true",
+        help="Декомпозиция на блоки двусвязности: точный поиск только внутри блоков"
+    )
+    parser.add_argument(
+        "--signatures",
+        action="store_true",
+        help="Сравнивать мультимножества подписей вершин (замкнутые обходы, треугольники, расстояния)"
+    )
+    parser.add_argument(
+        "--wl2",
+        action="store_true",
+        help="2-WL уточнение цветов пар вершин (для графов до 400 вершин)"
+    )
+    parser.add_argument(
+        "--annealing", type=int, default=0, metavar="ITERS",
+        help="Перед GA запустить имитацию отжига с ITERS итерациями на запуск (0 — не запускать)"
+    )
     parser.add_argument(
         "--pop", type=int, default=100,
         help="Размер популяции для GA (по умолчанию 100)"
     )
     parser.add_argument(
         "--gens", type=int, default=2000,
-        help="Число поколений для GA (по умолчанию 200)"
+        help="Максимальное число поколений для GA (по умолчанию 2000)"
     )
     parser.add_argument(
-        "--stall", type=int, default=250,
-        help="Поколений без улучшений до остановки GA (по умолчанию 20)"
+        "--stall", type=int, default=60,
+        help="Поколений без улучшений до остановки GA (по умолчанию 60)"
+    )
+    parser.add_argument(
+        "--ga-array",
+        action="store_true",
+        help="Хранить популяцию GA в матрице NumPy и применять операторы пакетно"
+    )
+    parser.add_argument(
+        "--memetic",
+        action="store_true",
+        help="Локальный поиск по конфликтующим рёбрам для лучших особей каждого поколения GA"
+    )
+    parser.add_argument(
+        "--islands", type=int, default=0,
+        help="Число островов (процессов) островной модели GA; 0 — одна популяция"
+    )
+    parser.add_argument(
+        "--multilevel",
+        action="store_true",
+        help="Многоуровневый GA: решать огрублённые графы и проецировать отображение с локальным поиском"
+    )
+    parser.add_argument(
+        "--exact-workers", type=int, default=0, metavar="N",
+        help="Завершить конвейер параллельным точным поиском на N процессах (0 — без точного поиска)"
+    )
+    parser.add_argument(
+        "--peel",
+        action="store_true",
+        help="Обрезать древесную бахрому и решать задачу для 2-ядер с метками"
+    )
+    parser.add_argument(
+        "--twins",
+        action="store_true",
+        help="Сжимать классы близнецов и решать задачу для фактор-графов"
+    )
+    parser.add_argument(
+        "--components",
+        action="store_true",
+        help="Решать каждую пару связных компонент отдельным запуском конвейера"
+    )
+    parser.add_argument(
+        "--no-complement",
+        action="store_true",
+        help="Не переходить к дополнениям графов при плотности выше 0.5"
+    )
+    parser.add_argument(
+        "--no-dense-backend",
+        action="store_true",
+        help="Не переводить графы плотностью от 0.3 в битсетовое представление"
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR",
+        help="Профилировать каждый этап и сохранить .pstats, collapsed-стеки и сводку в DIR"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=20,
+        help="Число горячих функций в сводке профилирования (по умолчанию 20)"
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Дополнительно отслеживать аллокации через tracemalloc"
+    )
+    parser.add_argument(
+        "--subgraph", type=int, metavar="K",
+        help="Искать graph1 как индуцированный подграф graph2 и вывести до K вложений (0 — все)"
+    )
+    parser.add_argument(
+        "--subgraph-time", type=float, metavar="SEC",
+        help="Ограничение времени поиска подграфов в секундах"
     )
     args = parser.parse_args()
 
@@ -41,6 +137,14 @@ def main():
     g2 = load_graph(args.graph2)
 
 
+    if args.subgraph is not None:
+        found = find_subgraphs(g1, g2, limit=args.subgraph or None, time_budget=args.subgraph_time)
+        print(f"Found {len(found)} embedding(s) of graph1 in graph2.")
+        for mapping in found:
+            print("  " + ", ".join(f"{u}->{mapping[u]}" for u in sorted(mapping)))
+        sys.exit(0 if found else 1)
+
+
     # builder = (
     #     GraphIsoCheckerBuilder()
     #     .add_invariant_stage()
@@ -55,16 +159,51 @@ def main():
     # builder = builder.add_exact_search_stage()
     # checker = builder.build()
 
-    builder = GraphIsoCheckerBuilder().add_invariant_stage().add_genetic_stage(
+    # леса решаются сразу, до дорогих инвариантов
+    signatures = DEFAULT_SIGNATURES if args.signatures else None
+    builder = GraphIsoCheckerBuilder().add_tree_stage().add_invariant_stage(signatures=signatures)
+    if args.blocks:
+        builder = builder.add_block_stage()
+    if args.wl2:
+        builder = builder.add_two_wl_stage()
+    if not args.no_spectral:
+        builder = builder.add_spectral_stage()
+    if args.annealing:
+        builder = builder.add_annealing_stage(iterations=args.annealing)
+    builder = builder.add_genetic_stage(
              population_size=args.pop,
              generations=args.gens,
-             stall=args.stall
+             stall=args.stall,
+             array_population=args.ga_array,
+             memetic=args.memetic,
+             islands=args.islands,
+             multilevel=args.multilevel
          )
+    if args.exact_workers:
+        builder = builder.add_parallel_exact_search_stage(workers=args.exact_workers)
+    if args.twins:
+        builder = builder.with_twin_reduction()
+    if args.peel:
+        builder = builder.with_peeling()
+    if args.components:
+        builder = builder.with_component_decomposition()
+    if not args.no_dense_backend:
+        builder = builder.with_dense_backend()
+    if not args.no_complement:
+        builder = builder.with_complement_switching()
+    profiler = None
+    if args.profile:
+        profiler = StageProfiler(
+            args.profile, top=args.profile_top, memory=args.profile_memory
+        )
+        builder = builder.with_profiler(profiler)
     checker = builder.build()
 
 
 
     is_iso, mapping = checker.check_isomorphism(g1, g2)
+    if profiler is not None:
+        print(profiler.write_summary())
     if is_iso:
         print("Graphs are isomorphic.")
         print("Mapping (g1 -> g2):")
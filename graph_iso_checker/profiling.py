@@ -0,0 +1,220 @@
+# graph_iso_checker/profiling.py
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from .stage import Stage, StageResult
+
+
+# модули стратегий GA, время которых выделяется в отдельную сводку
+STRATEGY_KINDS = ('selection', 'crossover', 'mutation', 'fitness', 'termination', 'local_search', 'adaptation')
+
+
+def _snake_case(name):
+    # GeneticStage -> genetic_stage
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+
+def _frame_label(code):
+    # подпись кадра для collapsed-стека (без ';', который служит разделителем)
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(';', ',')
+
+
+class StackSampler:
+    """
+    Сэмплирующий профилировщик: фоновый поток с заданным интервалом
+    снимает стек профилируемого потока и считает одинаковые стеки.
+    Результат пишется в collapsed-формате (вход для flamegraph.pl / speedscope).
+    """
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples  = Counter()
+        self._stop    = threading.Event()
+        self._thread  = None
+        self._target  = None
+
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.samples[';'.join(reversed(stack))] += 1
+
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StageReport:
+    # Результаты профилирования одного этапа
+    def __init__(self, name, result, stats, samples, peak_memory=None, top_allocations=None):
+        self.name            = name
+        self.result          = result
+        self.stats           = stats
+        self.samples         = samples
+        self.peak_memory     = peak_memory
+        self.top_allocations = top_allocations or []
+
+
+    @property
+    def total_time(self):
+        return self.stats.total_tt
+
+
+    def hot_functions(self, top):
+        # top-N функций по собственному времени (tottime)
+        rows = []
+        for (filename, lineno, func), (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            rows.append((tt, ct, nc, f"{func} ({os.path.basename(filename)}:{lineno})"))
+        rows.sort(reverse=True)
+        return rows[:top]
+
+
+    def strategy_breakdown(self):
+        # собственное время, проведённое в модулях стратегий GA
+        totals = {}
+        for (filename, lineno, func), (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            for kind in STRATEGY_KINDS:
+                if filename.endswith(os.path.join('strategies', kind + '.py')):
+                    totals[kind] = totals.get(kind, 0.0) + tt
+        return totals
+
+
+class StageProfiler:
+    """
+    Профилирует каждый этап конвейера отдельно (cProfile + сэмплирование стека,
+    опционально tracemalloc) и сохраняет в output_dir:
+      - <NN>_<stage>.pstats     — для pstats / snakeviz
+      - <NN>_<stage>.collapsed  — collapsed-стеки для flamegraph
+      - <NN>_<stage>.memory.txt — топ аллокаций (если memory=True)
+      - summary.txt             — сводка горячих функций по этапам
+    Обёрнутые этапы с параметром workers на время профилирования
+    выполняются в одном процессе.
+    """
+    def __init__(self, output_dir, top=20, memory=False, interval=0.005):
+        self.output_dir = output_dir
+        self.top        = top
+        self.memory     = memory
+        self.interval   = interval
+        self.reports    = []
+
+
+    def wrap(self, stage: Stage) -> "ProfiledStage":
+        return ProfiledStage(stage, self)
+
+
+    def profile(self, name, func, *args, **kwargs):
+        # выполняет func под профилировщиком и сохраняет отчёт под именем name
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = f"{len(self.reports) + 1:02d}_{name}"
+
+        profiler = cProfile.Profile()
+        sampler  = StackSampler(self.interval)
+        snapshot, peak = None, None
+        if self.memory:
+            tracemalloc.start()
+        sampler.start()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            sampler.stop()
+            # tracemalloc выключается и при исключении в этапе
+            if self.memory:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        top_allocs = snapshot.statistics('lineno')[:self.top] if snapshot is not None else []
+
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        base  = os.path.join(self.output_dir, name)
+        stats.dump_stats(base + '.pstats')
+        sampler.write_collapsed(base + '.collapsed')
+        if self.memory:
+            with open(base + '.memory.txt', 'w', encoding='utf-8') as f:
+                f.write(f"peak: {peak} B\n")
+                for stat in top_allocs:
+                    f.write(f"{stat}\n")
+
+        self.reports.append(
+            StageReport(name, result, stats, sum(sampler.samples.values()), peak, top_allocs)
+        )
+        return result
+
+
+    def summary(self):
+        out = io.StringIO()
+        for rep in self.reports:
+            result = rep.result.name if isinstance(rep.result, StageResult) else rep.result
+            out.write(f"=== {rep.name}: {result}, {rep.total_time:.4f}s, {rep.samples} samples\n")
+            if rep.peak_memory is not None:
+                out.write(f"peak memory: {rep.peak_memory / 1024:.1f} KiB\n")
+            out.write(f"{'tottime':>10s} {'cumtime':>10s} {'ncalls':>10s}  function\n")
+            for tt, ct, nc, func in rep.hot_functions(self.top):
+                out.write(f"{tt:10.4f} {ct:10.4f} {nc:10d}  {func}\n")
+            breakdown = rep.strategy_breakdown()
+            if breakdown:
+                out.write("GA strategies (tottime):\n")
+                for kind in STRATEGY_KINDS:
+                    if kind in breakdown:
+                        out.write(f"  {kind:12s} {breakdown[kind]:.4f}s\n")
+            out.write("\n")
+        return out.getvalue()
+
+
+    def write_summary(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        text = self.summary()
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(text)
+        return text
+
+
+class ProfiledStage(Stage):
+    # Обёртка над этапом, выполняющая его под StageProfiler
+    def __init__(self, stage: Stage, profiler: StageProfiler):
+        self.stage    = stage
+        self.profiler = profiler
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        name = _snake_case(type(self.stage).__name__)
+        if not hasattr(self.stage, 'workers'):
+            return self.profiler.profile(name, self.stage.run, g1, g2, context)
+        # дочерние процессы не видны cProfile и сэмплеру: на время вызова этап
+        # работает в одном процессе, иначе из сводки выпадет самая горячая
+        # стратегия (фитнес); сам этап конвейера не меняется
+        workers = self.stage.workers
+        self.stage.workers = 1
+        try:
+            return self.profiler.profile(name, self.stage.run, g1, g2, context)
+        finally:
+            self.stage.workers = workers
@@ -0,0 +1,104 @@
+# graph_iso_checker/stages/annealing_stage.py
+import os
+import random
+import concurrent.futures
+from ..stage import Stage, StageResult
+from ..graph import verify_mapping
+from ..algorithms.genetic.generational import vertex_groups
+from ..algorithms.genetic.strategies.local_search import ConflictTabuSearch, SimulatedAnnealing
+
+
+def anneal(g1, g2, groups, iterations, t0, t_end, schedule, seed, tabu_steps=0):
+    """
+    Один запуск отжига из случайной перестановки внутри групп (клеток).
+    Возвращает (лучшая перестановка, её фитнес).
+    """
+    rng = random.Random(seed)
+    n = g1.num_vertices
+    perm = [None] * n
+    for vs1, vs2 in groups:
+        vs2 = vs2[:]
+        rng.shuffle(vs2)
+        for u, v in zip(vs1, vs2):
+            perm[u] = v
+    context = {'cells': [vs1 for vs1, _ in groups if len(vs1) > 1]}
+
+    best_perm, best_fit = SimulatedAnnealing(iterations, t0, t_end, schedule, rng).improve(
+        perm, g1, g2, context
+    )
+    # доводка лучшего решения табу-поиском по конфликтующим рёбрам
+    target = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+    if tabu_steps and best_fit < target:
+        best_perm, best_fit = ConflictTabuSearch(max_steps=tabu_steps).improve(
+            best_perm, g1, g2, context
+        )
+    return best_perm, best_fit
+
+
+class AnnealingStage(Stage):
+    """
+    Эвристический этап: имитация отжига с обменами внутри клеток раскраски
+    и инкрементальным пересчётом фитнеса. Несколько независимых запусков
+    (restarts) распределяются по процессам.
+    """
+    def __init__(self, iterations=50000, restarts=None, t0=2.0, t_end=0.05,
+                 schedule='exponential', workers=None, tabu_steps=0, seed=None):
+        self.iterations = iterations
+        # по умолчанию — по запуску на ядро
+        self.restarts   = restarts or os.cpu_count()
+        self.t0         = t0
+        self.t_end      = t_end
+        # 'exponential' или 'linear'
+        self.schedule   = schedule
+        self.workers    = workers or os.cpu_count()
+        self.tabu_steps = tabu_steps
+        self.seed       = seed
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n:
+            return StageResult.CONTINUE
+
+        groups1, groups2 = vertex_groups(g1, g2, context)
+        if any(len(vs1) != len(groups2.get(key, ())) for key, vs1 in groups1.items()):
+            print(f"Отжиг: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+        groups = [(vs1, groups2[key]) for key, vs1 in groups1.items()]
+        target = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+
+
+        base = self.seed if self.seed is not None else random.getrandbits(32)
+        args = (g1, g2, groups, self.iterations, self.t0, self.t_end, self.schedule)
+        found = None
+        if self.workers > 1 and self.restarts > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as exe:
+                futures = [exe.submit(anneal, *args, base + i, self.tabu_steps)
+                           for i in range(self.restarts)]
+                for fut in concurrent.futures.as_completed(futures):
+                    perm, fit = fut.result()
+                    if fit == target:
+                        found = perm
+                        # оставшиеся запуски больше не нужны
+                        for f in futures:
+                            f.cancel()
+                        break
+        else:
+            for i in range(self.restarts):
+                perm, fit = anneal(*args, base + i, self.tabu_steps)
+                if fit == target:
+                    found = perm
+                    break
+
+
+        # у помеченных графов сохранённые рёбра ещё не значат сохранённые метки рёбер
+        if found is not None and (g1.labeled or g2.labeled) and \
+           not verify_mapping(g1, g2, dict(enumerate(found))):
+            found = None
+        if found is not None:
+            context['mapping'] = dict(enumerate(found))
+            context['result']  = True
+            print(f"Отжиг: {StageResult.ISO}")
+            return StageResult.ISO
+        print(f"Отжиг: {StageResult.CONTINUE}")
+        return StageResult.CONTINUE
@@ -0,0 +1,175 @@
+# graph_iso_checker/stages/block_stage.py
+from ..stage import Stage, StageResult
+from ..graph import connected_components
+from ..algorithms.blocks import biconnected_components, block_cut_tree
+from ..algorithms.trees import tree_centers
+from .exact_search_stage import SearchInterrupted, forward_search, initial_domains, neighbor_bitsets
+
+
+# цвета вершин блока при его кодировании
+PARENT, PLAIN = ('parent',), ('plain',)
+
+
+def colored_isomorphism(s1, colors1, s2, colors2, budget=None):
+    # изоморфизм s1 -> s2, сохраняющий цвета (точный поиск с прямой проверкой), или None
+    domains = initial_domains(s1, s2, {'colors1': colors1, 'colors2': colors2})
+    if any(d == 0 for d in domains.values()):
+        return None
+    mapping = {}
+    stats = {'nodes': 0} if budget is None else {'nodes': 0, 'limit': budget}
+    full = (1 << s1.num_vertices) - 1
+    if forward_search(domains, s1.adj, neighbor_bitsets(s2), full, mapping, stats):
+        return mapping
+    return None
+
+
+class BlockClasses:
+    # Классы изоморфизма раскрашенных блоков, общие для обоих графов
+    def __init__(self, budget=None):
+        self.budget  = budget
+        self.buckets = {}
+        self.count   = 0
+
+
+    def classify(self, sub, colors):
+        degrees = sorted(len(sub.neighbors(u)) for u in range(sub.num_vertices))
+        key = (sub.num_vertices, tuple(degrees), tuple(sorted(colors)))
+        bucket = self.buckets.setdefault(key, [])
+        for rep, rep_colors, cls in bucket:
+            if colored_isomorphism(sub, colors, rep, rep_colors, self.budget) is not None:
+                return cls
+        self.count += 1
+        bucket.append((sub, colors, self.count))
+        return self.count
+
+
+class BlockTree:
+    """
+    Дерево блоков графа, подвешенное за центр, с кодами узлов снизу вверх:
+    код точки сочленения — мультимножество кодов дочерних блоков, код
+    блока — класс изоморфизма блока, в котором вершина-родитель помечена
+    PARENT, а дочерние точки сочленения — своими кодами.
+    """
+    def __init__(self, g):
+        self.g = g
+        self.blocks, cuts = biconnected_components(g)
+        self.tree    = block_cut_tree(self.blocks, cuts)
+        nb           = len(self.blocks)
+        self.vertex  = {nb + i: c for i, c in enumerate(cuts)}
+        self.node_of = {c: node for node, c in self.vertex.items()}
+        self.root    = tree_centers(self.tree)[0]
+        # порядок обхода в ширину от корня и родители
+        self.parent  = {self.root: None}
+        self.order   = [self.root]
+        for node in self.order:
+            for w in self.tree[node]:
+                if w not in self.parent:
+                    self.parent[w] = node
+                    self.order.append(w)
+        self.code, self.sub, self.colors = {}, {}, {}
+
+
+    def is_block(self, node):
+        return node < len(self.blocks)
+
+
+    def children(self, node):
+        return [w for w in self.tree[node] if self.parent.get(w) == node]
+
+
+    def encode(self, classes, codes):
+        # коды узлов в обратном порядке обхода; codes — общая нумерация кодов точек сочленения
+        for node in reversed(self.order):
+            if not self.is_block(node):
+                key = tuple(sorted(self.code[b] for b in self.children(node)))
+                self.code[node] = codes.setdefault(key, -len(codes) - 1)
+                continue
+            verts = self.blocks[node]
+            parent = self.parent[node]
+            pv = self.vertex[parent] if parent is not None else None
+            colors = []
+            for v in verts:
+                if v == pv:
+                    colors.append(PARENT)
+                elif v in self.node_of:
+                    colors.append(('cut', self.code[self.node_of[v]]))
+                else:
+                    colors.append(PLAIN)
+            self.sub[node] = self.g.induced_subgraph(verts)
+            self.colors[node] = colors
+            self.code[node] = classes.classify(self.sub[node], colors)
+        return self.code[self.root]
+
+
+class BlockStage(Stage):
+    """
+    Декомпозиция на блоки (компоненты двусвязности): деревья блоков обоих
+    графов кодируются снизу вверх (точный поиск — только внутри блоков,
+    при сравнении раскрашенных блоков), совпадение кодов корней равносильно
+    изоморфизму. Отображение собирается сверху вниз по совпадающим кодам.
+    Для несвязных и двусвязных графов — CONTINUE.
+    """
+    def __init__(self, budget=100000):
+        # бюджет узлов поиска на одно сравнение блоков; при исчерпании — CONTINUE
+        self.budget = budget
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        if g1.num_vertices != g2.num_vertices:
+            return StageResult.NON_ISO
+        if g1.labeled or g2.labeled:
+            # классы блоков не учитывают меток
+            return StageResult.CONTINUE
+        if g1.num_vertices < 3 or len(connected_components(g1)) != 1 \
+           or len(connected_components(g2)) != 1:
+            return StageResult.CONTINUE
+        t1, t2 = BlockTree(g1), BlockTree(g2)
+        if len(t1.blocks) == 1 and len(t2.blocks) == 1:
+            return StageResult.CONTINUE
+        context['block_sizes'] = sorted(len(b) for b in t1.blocks)
+
+
+        classes, codes = BlockClasses(self.budget), {}
+        try:
+            same = t1.encode(classes, codes) == t2.encode(classes, codes)
+            mapping = self._mapping(t1, t2) if same else None
+        except SearchInterrupted:
+            print(f"Блоки: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+        if mapping is None:
+            context['result'] = False
+            print(f"Блоки: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+        context['mapping'] = mapping
+        context['result']  = True
+        print(f"Блоки: {StageResult.ISO}")
+        return StageResult.ISO
+
+
+    def _mapping(self, t1, t2):
+        # сверху вниз: пары узлов с равными кодами
+        mapping = {}
+        pairs = [(t1.root, t2.root)]
+        if not t1.is_block(t1.root):
+            mapping[t1.vertex[t1.root]] = t2.vertex[t2.root]
+        while pairs:
+            a, b = pairs.pop()
+            if t1.is_block(a):
+                local = colored_isomorphism(t1.sub[a], t1.colors[a], t2.sub[b], t2.colors[b], self.budget)
+                verts1, verts2 = t1.blocks[a], t2.blocks[b]
+                for i, j in local.items():
+                    mapping[verts1[i]] = verts2[j]
+                # дочерние точки сочленения переходят в точки с тем же кодом
+                for c in t1.children(a):
+                    pairs.append((c, t2.node_of[mapping[t1.vertex[c]]]))
+            else:
+                by_code = {}
+                for blk in t2.children(b):
+                    by_code.setdefault(t2.code[blk], []).append(blk)
+                for blk in t1.children(a):
+                    pairs.append((blk, by_code[t1.code[blk]].pop()))
+        return mapping
+
+
+
+
@@ -0,0 +1,48 @@
+# graph_iso_checker/stages/complement_stage.py
+from ..stage import Stage, StageResult
+
+
+def edge_density(g):
+    # доля присутствующих рёбер среди n(n-1)/2 возможных
+    n = g.num_vertices
+    if n < 2:
+        return 0.0
+    m = sum(len(g.neighbors(u)) for u in range(n)) // 2
+    return 2 * m / (n * (n - 1))
+
+
+class ComplementStage(Stage):
+    """
+    Переключение на дополнения для плотных графов: изоморфизм сохраняется
+    при переходе к дополнению, а отображение не меняется. При плотности
+    выше threshold вложенный конвейер checker работает на дополнениях,
+    где рёбер меньше; иначе — на исходных графах.
+    """
+    def __init__(self, checker, threshold=0.5):
+        # checker — GraphIsoChecker с остальными этапами конвейера
+        self.checker   = checker
+        self.threshold = threshold
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        if g1.num_vertices != g2.num_vertices:
+            return StageResult.NON_ISO
+        d1, d2 = edge_density(g1), edge_density(g2)
+        if d1 != d2:
+            context['result'] = False
+            return StageResult.NON_ISO
+        # у рёбер дополнения нет меток — помеченные рёбра не дополняются
+        context['complemented'] = d1 > self.threshold and not (g1.edge_labels or g2.edge_labels)
+        if context['complemented']:
+            g1, g2 = g1.complement(), g2.complement()
+        is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+        if is_iso:
+            context['mapping'] = mapping
+            context['result']  = True
+            return StageResult.ISO
+        context['result'] = False
+        return StageResult.NON_ISO
+
+
+
+
@@ -0,0 +1,125 @@
+# graph_iso_checker/stages/component_stage.py
+import os
+import concurrent.futures
+from ..stage import Stage, StageResult
+from ..graph import connected_components
+
+
+def component_key(g, vertices):
+    # отпечаток компоненты: размер, число рёбер, последовательность степеней
+    degrees = sorted(len(g.neighbors(u)) for u in vertices)
+    return len(vertices), sum(degrees) // 2, tuple(degrees)
+
+
+def match_group(checker, parts1, parts2):
+    """
+    Сопоставление компонент одной группы (одинаковый отпечаток): каждой
+    компоненте g1 ищется изоморфная среди ещё свободных компонент g2.
+    Изоморфизм транзитивен, поэтому жадный выбор пары не теряет решений.
+    parts — списки (подграф, вершины). Возвращает список
+    (вершины g1, вершины g2, отображение) или None.
+    """
+    free, pairs = list(parts2), []
+    for sub1, verts1 in parts1:
+        for k, (sub2, verts2) in enumerate(free):
+            if sub1.num_vertices <= 2 and not (sub1.labeled or sub2.labeled):
+                # K1 и K2 при равном отпечатке совпадают
+                mapping = dict(enumerate(range(sub1.num_vertices)))
+            else:
+                is_iso, mapping = checker.check_isomorphism(sub1, sub2)
+                if not is_iso:
+                    continue
+                if isinstance(mapping, list):
+                    # GA возвращает отображение списком
+                    mapping = dict(enumerate(mapping))
+            pairs.append((verts1, verts2, mapping))
+            del free[k]
+            break
+        else:
+            return None
+    return pairs
+
+
+class ComponentStage(Stage):
+    """
+    Декомпозиция по связным компонентам: компоненты g1 и g2 группируются
+    по отпечатку, и каждая пара решается вложенным конвейером checker
+    независимо (группы — в отдельных процессах). Частичные отображения
+    сшиваются в общее. Стоимость поиска — сумма по компонентам, а не
+    произведение.
+    """
+    def __init__(self, checker, workers=None):
+        # checker — GraphIsoChecker с остальными этапами конвейера
+        self.checker = checker
+        self.workers = workers or os.cpu_count()
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        if g1.num_vertices != g2.num_vertices:
+            return StageResult.NON_ISO
+        comps1 = connected_components(g1)
+        comps2 = connected_components(g2)
+        context['component_count'] = len(comps1)
+        if len(comps1) != len(comps2):
+            print(f"Компоненты: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+        if len(comps1) == 1:
+            # разбивать нечего — весь конвейер на исходных графах
+            is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+            return self._finish(is_iso, mapping, context)
+
+
+        groups1, groups2 = {}, {}
+        for g, comps, groups in ((g1, comps1, groups1), (g2, comps2, groups2)):
+            for verts in comps:
+                groups.setdefault(component_key(g, verts), []).append(
+                    (g.induced_subgraph(verts), verts)
+                )
+        if {k: len(v) for k, v in groups1.items()} != {k: len(v) for k, v in groups2.items()}:
+            print(f"Компоненты: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+
+
+        tasks = [(groups1[key], groups2[key]) for key in groups1]
+        results = []
+        if self.workers > 1 and len(tasks) > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as exe:
+                futures = [exe.submit(match_group, self.checker, p1, p2) for p1, p2 in tasks]
+                for fut in concurrent.futures.as_completed(futures):
+                    pairs = fut.result()
+                    if pairs is None:
+                        # остальные группы уже ничего не изменят
+                        for f in futures:
+                            f.cancel()
+                        return self._finish(False, None, context)
+                    results.extend(pairs)
+        else:
+            for p1, p2 in tasks:
+                pairs = match_group(self.checker, p1, p2)
+                if pairs is None:
+                    return self._finish(False, None, context)
+                results.extend(pairs)
+
+
+        # сшиваем отображения компонент в общее
+        mapping = {}
+        for verts1, verts2, sub_mapping in results:
+            for i, j in sub_mapping.items():
+                mapping[verts1[i]] = verts2[j]
+        return self._finish(True, mapping, context)
+
+
+    def _finish(self, is_iso, mapping, context):
+        if is_iso:
+            context['mapping'] = mapping
+            context['result']  = True
+            res = StageResult.ISO
+        else:
+            context['result'] = False
+            res = StageResult.NON_ISO
+        print(f"Компоненты: {res}")
+        return res
+
+
+
+
@@ -0,0 +1,35 @@
+# graph_iso_checker/stages/dense_stage.py
+from ..stage import Stage, StageResult
+from ..graph import BitsetGraph
+from .complement_stage import edge_density
+
+
+class DenseBackendStage(Stage):
+    """
+    Выбор представления по плотности: при плотности не ниже threshold
+    графы переводятся в BitsetGraph (строки-битсеты вместо множеств), и
+    вложенный конвейер checker работает на них; иначе — на исходных графах.
+    """
+    def __init__(self, checker, threshold=0.3):
+        # checker — GraphIsoChecker с остальными этапами конвейера
+        self.checker   = checker
+        self.threshold = threshold
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        if g1.num_vertices != g2.num_vertices:
+            return StageResult.NON_ISO
+        context['dense_backend'] = edge_density(g1) >= self.threshold
+        if context['dense_backend'] and not hasattr(g1, 'rows'):
+            g1, g2 = BitsetGraph.from_graph(g1), BitsetGraph.from_graph(g2)
+        is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+        if is_iso:
+            context['mapping'] = mapping
+            context['result']  = True
+            return StageResult.ISO
+        context['result'] = False
+        return StageResult.NON_ISO
+
+
+
+
@@ -1,8 +1,249 @@
 from ..stage import Stage, StageResult
 
 
+class SearchInterrupted(Exception):
+    # поиск остановлен: исчерпан бюджет узлов или выставлен флаг остановки
+    pass
+
+
+def neighbor_bitsets(g):
+    # строки смежности как Python int: бит v установлен, если v — сосед
+    # (у BitsetGraph они уже есть)
+    rows = getattr(g, 'rows', None)
+    if rows is not None:
+        return list(rows)
+    return [sum(1 << v for v in g.neighbors(u)) for u in range(g.num_vertices)]
+
+
+def search_adjacency(g1, g2):
+    """
+    adj1 и строки nbr2 для assign. Без меток рёбер — g1.adj и битсеты
+    соседей g2; с метками — adj1[u] = {w: метка ребра}, nbr2[v] = {метка:
+    битсет соседей v по рёбрам с этой меткой}, и образ соседа обязан
+    лежать за ребром с той же меткой.
+    """
+    if not (g1.edge_labels or g2.edge_labels):
+        return g1.adj, neighbor_bitsets(g2)
+    adj1 = [{w: g1.edge_label(u, w) for w in g1.neighbors(u)} for u in range(g1.num_vertices)]
+    nbr2 = []
+    for v in range(g2.num_vertices):
+        rows = {}
+        for w in g2.neighbors(v):
+            label = g2.edge_label(v, w)
+            rows[label] = rows.get(label, 0) | (1 << w)
+        nbr2.append(rows)
+    return adj1, nbr2
+
+
+def initial_domains(g1, g2, context):
+    # допустимые образы: та же степень, та же метка и, если есть раскраска, тот же цвет
+    n = g1.num_vertices
+    key1 = [len(g1.neighbors(u)) for u in range(n)]
+    key2 = [len(g2.neighbors(v)) for v in range(n)]
+    if g1.vertex_labels is not None or g2.vertex_labels is not None:
+        key1 = [(k, g1.vertex_label(u)) for u, k in enumerate(key1)]
+        key2 = [(k, g2.vertex_label(v)) for v, k in enumerate(key2)]
+    if 'colors1' in context and 'colors2' in context:
+        key1 = list(zip(key1, context['colors1']))
+        key2 = list(zip(key2, context['colors2']))
+    by_key = {}
+    for v, k in enumerate(key2):
+        by_key[k] = by_key.get(k, 0) | (1 << v)
+    return {u: by_key.get(key1[u], 0) for u in range(n)}
+
+
+def assign(domains, u, v, adj1, nbr2, full):
+    """
+    Прямая проверка после u -> v: соседи u сужаются до N(v), не-соседи —
+    до дополнения N(v), образ v исключается из всех доменов.
+    Возвращает новые домены или None, если какой-то домен опустел.
+    """
+    if type(nbr2[v]) is dict:
+        return _assign_labeled(domains, u, v, adj1, nbr2, full)
+    bit  = 1 << v
+    near = nbr2[v] & ~bit
+    far  = full & ~nbr2[v] & ~bit
+    nbrs = adj1[u]
+    new  = {}
+    for w, dw in domains.items():
+        if w == u:
+            continue
+        dw &= near if w in nbrs else far
+        if not dw:
+            return None
+        new[w] = dw
+    return new
+
+
+def _assign_labeled(domains, u, v, adj1, nbr2, full):
+    # assign для рёбер с метками (см. search_adjacency): сосед w вершины u
+    # сужается до соседей v по рёбрам с меткой ребра u–w
+    bit   = 1 << v
+    rows  = nbr2[v]
+    far   = full & ~sum(rows.values()) & ~bit
+    nbrs  = adj1[u]
+    new   = {}
+    for w, dw in domains.items():
+        if w == u:
+            continue
+        label = nbrs.get(w)
+        dw &= far if label is None else rows.get(label, 0) & ~bit
+        if not dw:
+            return None
+        new[w] = dw
+    return new
+
+
+def _orbit_mask(v, gens):
+    # орбита v под действием порождающих gens (перестановки-списки) как битсет
+    mask, stack = 1 << v, [v]
+    while stack:
+        x = stack.pop()
+        for g in gens:
+            y = g[x]
+            if not mask >> y & 1:
+                mask |= 1 << y
+                stack.append(y)
+    return mask
+
+
+def _open_node(domains, stats, gens):
+    # новый узел дерева поиска: учёт в stats, выбор вершины с наименьшим доменом (MRV)
+    stats['nodes'] += 1
+    if stats['nodes'] > stats.get('limit', stats['nodes']):
+        raise SearchInterrupted()
+    stop = stats.get('stop')
+    if stop is not None and not stats['nodes'] & 1023 and stop.is_set():
+        raise SearchInterrupted()
+    u = min(domains, key=lambda w: domains[w].bit_count())
+    return [domains, u, domains[u], gens]
+
+
+def forward_search(domains, adj1, nbr2, full, mapping, stats, gens=None):
+    """
+    Поиск с прямой проверкой и ветвлением по MRV. Обход — явным стеком
+    узлов [домены, вершина, ещё не испробованные образы, автоморфизмы], так
+    что глубина n не упирается в предел рекурсии. Необязательные
+    stats['limit'] (бюджет узлов) и stats['stop'] (Event) прерывают поиск
+    исключением SearchInterrupted.
+
+    gens — автоморфизмы второго графа (перестановки-списки). В узле
+    используются только те, что фиксируют все уже выбранные образы: если
+    образ v не дал решения, не дадут его и образы из орбиты v — они
+    отсекаются без спуска (счётчик stats['pruned']).
+    """
+    if not domains:
+        return True
+    stack = [_open_node(domains, stats, gens or [])]
+    while stack:
+        node = stack[-1]
+        doms, u, d, node_gens = node
+        if not d:
+            # все образы u испробованы — откат к родителю
+            stack.pop()
+            if stack:
+                del mapping[stack[-1][1]]
+            continue
+        low     = d & -d
+        node[2] = d ^ low
+        v       = low.bit_length() - 1
+        if node_gens:
+            orbit = _orbit_mask(v, node_gens)
+            if node[2] & orbit:
+                stats['pruned'] = stats.get('pruned', 0) + (node[2] & orbit).bit_count()
+                node[2] &= ~orbit
+        new = assign(doms, u, v, adj1, nbr2, full)
+        if new is None:
+            continue
+        mapping[u] = v
+        if not new:
+            return True
+        child_gens = [g for g in node_gens if g[v] == v] if node_gens else node_gens
+        stack.append(_open_node(new, stats, child_gens))
+    return False
+
+
+def automorphism_generators(g, domains, budget=10000):
+    """
+    Порождающие группы автоморфизмов g: цепочка стабилизаторов вдоль
+    тождественного пути поиска g -> g. Для каждого уровня (с последнего)
+    ищутся листья, переводящие базовую вершину в ещё не покрытые точки её
+    орбиты; каждый найденный лист — новый порождающий. Возвращает
+    (порождающие, порядок группы, полнота): если подпоиск исчерпал бюджет
+    узлов, группа может оказаться неполной, а порядок — нижней оценкой.
+    """
+    n = g.num_vertices
+    (adj, nbr), full = search_adjacency(g, g), (1 << n) - 1
+    # тождественный путь: базовые вершины и домены перед каждым назначением
+    base, levels, dom = [], [], domains
+    while dom:
+        u = min(dom, key=lambda w: dom[w].bit_count())
+        base.append(u)
+        levels.append(dom)
+        dom = assign(dom, u, u, adj, nbr, full)
+
+    gens, order, complete = [], 1, True
+    for i in range(len(base) - 1, -1, -1):
+        b, dom = base[i], levels[i]
+        # все порождающие, найденные ниже, фиксируют base[:i]
+        orbit = _orbit_mask(b, gens)
+        cand  = dom[b] & ~orbit
+        while cand:
+            low   = cand & -cand
+            cand ^= low
+            v     = low.bit_length() - 1
+            if orbit >> v & 1:
+                continue
+            new = assign(dom, b, v, adj, nbr, full)
+            if new is None:
+                continue
+            mapping = {x: x for x in base[:i]}
+            mapping[b] = v
+            try:
+                found = forward_search(new, adj, nbr, full, mapping, {'nodes': 0, 'limit': budget},
+                                       [h for h in gens if h[v] == v])
+            except SearchInterrupted:
+                complete = False
+                continue
+            if found:
+                gens.append([mapping[x] for x in range(n)])
+                orbit = _orbit_mask(b, gens)
+        order *= orbit.bit_count()
+    return gens, order, complete
+
+
+def orbit_partition(n, gens):
+    # разбиение вершин 0..n-1 на орбиты группы, порождённой gens
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for g in gens:
+        for x in range(n):
+            a, b = find(x), find(g[x])
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+    orbits = {}
+    for x in range(n):
+        orbits.setdefault(find(x), []).append(x)
+    return list(orbits.values())
+
+
 class ExactSearchStage(Stage):
     # Этап точного поиска изоморфизма (упрощённый VF2 / backtracking)
+    def __init__(self, forward_checking=False, automorphisms=False, automorphism_budget=10000):
+        # forward_checking — домены-битсеты для всех неотображённых вершин
+        self.forward_checking    = forward_checking
+        # automorphisms — прямая проверка с отсечением орбит группы Aut(g1)
+        self.automorphisms       = automorphisms
+        # бюджет узлов на каждый подпоиск автоморфизма
+        self.automorphism_budget = automorphism_budget
+
+
     def run(self, g1, g2, context) -> StageResult:
         # 1) проверка числа вершин
         if g1.num_vertices != g2.num_vertices:
@@ -17,29 +258,40 @@ class ExactSearchStage(Stage):
             return StageResult.NON_ISO
 
 
+        if self.automorphisms:
+            return self._run_with_automorphisms(g1, g2, context)
+        if self.forward_checking:
+            return self._run_forward_checking(g1, g2, context)
+
+
         # 3) выбираем порядок вершин (по убыванию степени) для ускорения поиска
         order = sorted(range(n), key=lambda u: -len(g1.neighbors(u)))
 
 
         mapping = {}
         used = set()
+        stats = {'nodes': 0}
 
 
         # рекурсивный бэктрекинг
         def backtrack(idx):
             if idx == n:
                 return True
+            stats['nodes'] += 1
             u = order[idx]
             for v in range(n):
                 if v in used:
                     continue
-                # проверка соответствия степени
+                # проверка соответствия степени и метки
                 if len(g2.neighbors(v)) != len(g1.neighbors(u)):
                     continue
-                # проверка согласованности с уже отображёнными соседями
+                if g1.vertex_label(u) != g2.vertex_label(v):
+                    continue
+                # проверка согласованности с уже отображёнными соседями (и метками рёбер)
                 ok = True
                 for u2 in g1.neighbors(u):
-                    if u2 in mapping and not g2.has_edge(v, mapping[u2]):
+                    if u2 in mapping and (not g2.has_edge(v, mapping[u2]) or
+                                          g1.edge_label(u, u2) != g2.edge_label(v, mapping[u2])):
                         ok = False
                         break
                 if not ok:
@@ -56,7 +308,9 @@ class ExactSearchStage(Stage):
 
 
         # запуск поиска
-        if backtrack(0):
+        found = backtrack(0)
+        context['search_nodes'] = stats['nodes']
+        if found:
             context['mapping'] = mapping
             context['result'] = True
             return StageResult.ISO
@@ -64,5 +318,55 @@ class ExactSearchStage(Stage):
             return StageResult.NON_ISO
 
 
+    def _run_forward_checking(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        domains = initial_domains(g1, g2, context)
+        if any(d == 0 for d in domains.values()):
+            return StageResult.NON_ISO
+
+        mapping = {}
+        stats = {'nodes': 0}
+        adj1, nbr2 = search_adjacency(g1, g2)
+        found = forward_search(domains, adj1, nbr2, (1 << n) - 1, mapping, stats)
+        context['search_nodes'] = stats['nodes']
+        if found:
+            context['mapping'] = mapping
+            context['result'] = True
+            return StageResult.ISO
+        return StageResult.NON_ISO
+
+
+    def _run_with_automorphisms(self, g1, g2, context) -> StageResult:
+        # поиск ведётся из g2 в g1: тогда образы лежат в g1 и отсекаются орбитами Aut(g1)
+        n = g1.num_vertices
+        colors = {}
+        if 'colors1' in context and 'colors2' in context:
+            colors = {'colors1': context['colors2'], 'colors2': context['colors1']}
+        domains = initial_domains(g2, g1, colors)
+        if any(d == 0 for d in domains.values()):
+            return StageResult.NON_ISO
+
+        own = {'colors1': context['colors1'], 'colors2': context['colors1']} if colors else {}
+        gens, order, complete = automorphism_generators(
+            g1, initial_domains(g1, g1, own), self.automorphism_budget
+        )
+        context['automorphism_group_size'] = order
+        context['automorphism_orbits']     = orbit_partition(n, gens)
+        # False — подпоиск упёрся в бюджет, порядок группы — нижняя оценка
+        context['automorphism_complete']   = complete
+
+        mapping = {}
+        stats = {'nodes': 0, 'pruned': 0}
+        adj2, nbr1 = search_adjacency(g2, g1)
+        found = forward_search(domains, adj2, nbr1, (1 << n) - 1, mapping, stats, gens)
+        context['search_nodes'] = stats['nodes']
+        context['orbit_pruned'] = stats['pruned']
+        if found:
+            context['mapping'] = {u: v for v, u in mapping.items()}
+            context['result'] = True
+            return StageResult.ISO
+        return StageResult.NON_ISO
+
+
 
 
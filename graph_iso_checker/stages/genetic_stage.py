@@ -1,17 +1,34 @@
 # graph_iso_checker/stages/genetic_stage.py
 from ..stage import Stage, StageResult
+from ..graph import verify_mapping
 from ..algorithms.genetic.builder import GeneticAlgorithmBuilder
-from ..algorithms.genetic.strategies.termination import StagnationTermination
+from ..algorithms.genetic.islands import IslandModel
+from ..algorithms.genetic.multilevel import MultilevelGA
+from ..algorithms.genetic.strategies.termination import (
+    AnyTermination, GenerationTermination, StagnationTermination
+)
+from ..algorithms.genetic.strategies.crossover import CellPMXCrossover, ArrayCellPMXCrossover
+from ..algorithms.genetic.strategies.mutation import CellSwapMutation, ArrayCellSwapMutation
+from ..algorithms.genetic.strategies.local_search import ConflictTabuSearch
 
 
 class GeneticStage(Stage):
     """
     Эвристический этап: GA с color‐refinement и остановкой по застою.
     """
-    def __init__(self, population_size=50, generations=200, stall=20):
-        self.population_size = population_size
-        self.generations     = generations
-        self.stall           = stall
+    def __init__(self, population_size=50, generations=200, stall=20, array_population=False,
+                 memetic=False, islands=0, multilevel=False, workers=None):
+        self.population_size  = population_size
+        self.generations      = generations
+        self.stall            = stall
+        self.array_population = array_population
+        self.memetic          = memetic
+        # > 1 — островная модель с таким числом процессов
+        self.islands          = islands
+        # многоуровневый режим: GA на огрублённых графах + проекция с локальным поиском
+        self.multilevel       = multilevel
+        # процессы для оценки фитнеса; None — все ядра
+        self.workers          = workers
 
 
     def run(self, g1, g2, context) -> StageResult:
@@ -21,18 +38,44 @@ class GeneticStage(Stage):
             return StageResult.CONTINUE
 
 
-        # настраиваем GA с остановкой по застою
+        # настраиваем GA с остановкой по застою (не позже generations поколений);
+        # до остановки — частичные перезапуски и адаптивные вероятности операторов
+        termination = AnyTermination([
+            GenerationTermination(self.generations),
+            StagnationTermination(self.stall),
+        ])
         builder = (
             GeneticAlgorithmBuilder()
             .with_population_size(self.population_size)
             .with_generations(self.generations)
-            .with_termination(StagnationTermination(self.stall))
+            .with_termination(termination)
+            .with_restarts(max(1, self.stall // 3))
+            .with_adaptive_rates()
+            .with_array_population(self.array_population)
+            .with_workers(self.workers)
         )
-        ga = builder.build()
+        # операторы не выводят особи за пределы клеток раскраски
+        if self.array_population:
+            builder = builder.with_crossover(ArrayCellPMXCrossover()).with_mutation(ArrayCellSwapMutation())
+        else:
+            builder = builder.with_crossover(CellPMXCrossover()).with_mutation(CellSwapMutation())
+            # повторные особи не оцениваются заново и вытесняются свежими
+            builder = builder.with_fitness_cache().with_duplicate_replacement()
+            if self.memetic:
+                builder = builder.with_local_search(ConflictTabuSearch())
+        if self.multilevel:
+            ga = MultilevelGA(builder)
+        elif self.islands > 1:
+            ga = IslandModel.from_builder(builder, self.islands)
+        else:
+            ga = builder.build()
 
 
         # запускаем GA
         found, mapping = ga.run(g1, g2, context)
+        # фитнес не видит меток рёбер: отображение помеченных графов проверяется целиком
+        if found and (g1.labeled or g2.labeled):
+            found = verify_mapping(g1, g2, mapping)
         if found:
             context['mapping'] = mapping
             context['result']  = True
@@ -1,7 +1,10 @@
 import numpy as np
 from ..stage import Stage, StageResult
+from ..graph import verify_mapping
 from abc import ABC, abstractmethod
-from collections import deque
+from collections import deque, Counter
+from ..algorithms.fingerprint import fingerprint
+from ..algorithms.signatures import vertex_triangles, vertex_signatures, DEFAULT_SIGNATURES
 
 
 # Интерфейс инвариантов
@@ -13,6 +16,26 @@ class Invariant(ABC):
 
 
 # Простые инварианты
+class LabelInvariant(Invariant):
+    # Проверка равенства мультимножеств меток вершин и рёбер
+    # (ребро — вместе с метками концов)
+    def _labels(self, g):
+        vertices = Counter(g.vertex_label(u) for u in range(g.num_vertices))
+        edges = Counter(
+            (tuple(sorted((g.vertex_label(u), g.vertex_label(v)))), g.edge_label(u, v))
+            for u in range(g.num_vertices) for v in g.neighbors(u) if u < v
+        )
+        return vertices, edges
+
+
+    def check(self, g1, g2, context):
+        if not (g1.labeled or g2.labeled):
+            return StageResult.CONTINUE
+        if self._labels(g1) != self._labels(g2):
+            return StageResult.NON_ISO
+        return StageResult.CONTINUE
+
+
 class EdgeCountInvariant(Invariant):
     # Проверка равенства числа рёбер
     def check(self, g1, g2, context):
@@ -35,6 +58,15 @@ class DegreeSequenceInvariant(Invariant):
         return StageResult.CONTINUE
 
 
+class FingerprintInvariant(Invariant):
+    # Сравнение WL-отпечатков (algorithms/fingerprint): отпечаток кешируется
+    # на графе, повторные сравнения того же графа — O(1)
+    def check(self, g1, g2, context):
+        if fingerprint(g1).digest != fingerprint(g2).digest:
+            return StageResult.NON_ISO
+        return StageResult.CONTINUE
+
+
 class UniqueDegreeInvariant(Invariant):
     # Если все степени уникальны — строим однозначное отображение по степени
     def check(self, g1, g2, context):
@@ -47,6 +79,9 @@ class UniqueDegreeInvariant(Invariant):
         map1 = {deg1[u]: u for u in range(g1.num_vertices)}
         map2 = {deg2[v]: v for v in range(g2.num_vertices)}
         mapping = {map1[d]: map2[d] for d in map1}
+        if (g1.labeled or g2.labeled) and not verify_mapping(g1, g2, mapping):
+            # отображение единственно возможное, но не сохраняет метки
+            return StageResult.NON_ISO
         context['mapping'] = mapping
         return StageResult.ISO
 
@@ -116,24 +151,8 @@ class GraphDiameterInvariant(Invariant):
 class TriangleCountInvariant(Invariant):
     # Проверка равенства числа треугольников, инцидентных каждой вершине
     def check(self, g1, g2, context):
-        def tri_counts(g):
-            counts = []
-            for v in range(g.num_vertices):
-                nbrs = list(g.neighbors(v))
-                cnt = 0
-                L = len(nbrs)
-                for i in range(L):
-                    u = nbrs[i]
-                    for j in range(i+1, L):
-                        w = nbrs[j]
-                        if w in g.neighbors(u):
-                            cnt += 1
-                counts.append(cnt)
-            return sorted(counts)
-
-
-        t1 = tri_counts(g1)
-        t2 = tri_counts(g2)
+        t1 = sorted(vertex_triangles(g1))
+        t2 = sorted(vertex_triangles(g2))
         if t1 != t2:
             return StageResult.NON_ISO
         context['triangle_counts'] = t1
@@ -145,18 +164,9 @@ class ClusteringCoefficientInvariant(Invariant):
     def check(self, g1, g2, context):
         def clustering(g):
             coeffs = []
-            for v in range(g.num_vertices):
-                nbrs = list(g.neighbors(v))
-                k = len(nbrs)
-                if k < 2:
-                    coeffs.append(0.0)
-                    continue
-                links = 0
-                for i in range(k):
-                    for j in range(i+1, k):
-                        if nbrs[j] in g.neighbors(nbrs[i]):
-                            links += 1
-                coeffs.append(2*links/(k*(k-1)))
+            for v, links in enumerate(vertex_triangles(g)):
+                k = len(g.neighbors(v))
+                coeffs.append(0.0 if k < 2 else 2*links/(k*(k-1)))
             return sorted(coeffs)
 
 
@@ -191,6 +201,23 @@ class LaplacianSpectrumInvariant(Invariant):
         return StageResult.CONTINUE
 
 
+class SignatureInvariant(Invariant):
+    # Проверка равенства мультимножеств подписей вершин (algorithms/signatures);
+    # подписи остаются в контексте и засевают RefinementStage
+    def __init__(self, signatures=DEFAULT_SIGNATURES):
+        self.signatures = signatures
+
+
+    def check(self, g1, g2, context):
+        s1 = vertex_signatures(g1, self.signatures)
+        s2 = vertex_signatures(g2, self.signatures)
+        if Counter(s1) != Counter(s2):
+            return StageResult.NON_ISO
+        context['signatures1'] = s1
+        context['signatures2'] = s2
+        return StageResult.CONTINUE
+
+
 # Композит
 class CompositeInvariant(Invariant):
     # Последовательно применяет все инварианты
@@ -208,11 +235,13 @@ class CompositeInvariant(Invariant):
 
 class InvariantStage(Stage):
     # Этап, применяющий CompositeInvariant
-    def __init__(self, invariants=None):
+    def __init__(self, invariants=None, signatures=None):
         if invariants is None:
             invariants = [
+                LabelInvariant(),
                 EdgeCountInvariant(),
                 DegreeSequenceInvariant(),
+                FingerprintInvariant(),
                 UniqueDegreeInvariant(),
                 ConnectedComponentsInvariant(),
                 GraphDiameterInvariant(),
@@ -220,6 +249,8 @@ class InvariantStage(Stage):
                 ClusteringCoefficientInvariant(),
                 LaplacianSpectrumInvariant()
             ]
+        if signatures is not None:
+            invariants = list(invariants) + [SignatureInvariant(signatures)]
         self.composite = CompositeInvariant(invariants)
 
 
@@ -0,0 +1,192 @@
+# graph_iso_checker/stages/parallel_exact_stage.py
+import os
+import queue
+import multiprocessing
+from ..stage import Stage, StageResult
+from .exact_search_stage import (
+    SearchInterrupted, assign, forward_search, initial_domains, search_adjacency
+)
+
+
+def _replay(prefix, domains, adj1, nbr2, full):
+    # домены после последовательности назначений prefix; None — префикс противоречив
+    for u, v in prefix:
+        domains = assign(domains, u, v, adj1, nbr2, full)
+        if domains is None:
+            return None
+    return domains
+
+
+def _branch(domains):
+    # вершина с наименьшим доменом и её кандидаты
+    u = min(domains, key=lambda w: domains[w].bit_count())
+    d, targets = domains[u], []
+    while d:
+        low = d & -d
+        d  ^= low
+        targets.append(low.bit_length() - 1)
+    return u, targets
+
+
+def solve_unit(prefix, domains, adj1, nbr2, full, budget, stop=None):
+    """
+    Единица работы — поддерево под префиксом назначений. Возвращает
+    ('found', mapping), ('done', []) или ('split', [префиксы]) — если бюджет
+    узлов исчерпан, непройденные ветви корня отдаются обратно в очередь.
+    """
+    domains = _replay(prefix, domains, adj1, nbr2, full)
+    if domains is None:
+        return 'done', []
+    mapping = dict(prefix)
+    if not domains:
+        return 'found', mapping
+
+    u, targets = _branch(domains)
+    stats = {'nodes': 0, 'limit': budget, 'stop': stop}
+    for i, v in enumerate(targets):
+        new = assign(domains, u, v, adj1, nbr2, full)
+        if new is None:
+            continue
+        mapping[u] = v
+        try:
+            if forward_search(new, adj1, nbr2, full, mapping, stats):
+                return 'found', mapping
+        except SearchInterrupted:
+            if stop is not None and stop.is_set():
+                return 'stopped', []
+            return 'split', [prefix + [(u, w)] for w in targets[i:]]
+        del mapping[u]
+    return 'done', []
+
+
+def _worker(tasks, results, stop, domains, adj1, nbr2, full, budget):
+    # процесс берёт единицы из общей очереди, пока не будет остановлен
+    while not stop.is_set():
+        prefix = tasks.get()
+        if prefix is None:
+            break
+        kind, payload = solve_unit(prefix, domains, adj1, nbr2, full, budget, stop)
+        if kind == 'found':
+            results.put(('found', payload))
+            break
+        if kind == 'stopped':
+            break
+        for child in payload:
+            tasks.put(child)
+        # одним сообщением: единица завершена, добавлено len(payload) новых
+        results.put(('done', len(payload)))
+    # непрочитанные единицы не должны блокировать завершение; results же
+    # должна быть доставлена целиком — её поток записи не отменяем
+    tasks.cancel_join_thread()
+
+
+class ParallelExactSearchStage(Stage):
+    """
+    Точный поиск с прямой проверкой, распределённый по процессам: верхние
+    уровни дерева режутся на единицы работы (префиксы назначений), процессы
+    разбирают их из общей очереди. Единица, превысившая бюджет узлов,
+    дробится заново. NON_ISO — только когда пройдено всё дерево.
+    """
+    def __init__(self, workers=None, budget=20000, units_per_worker=4):
+        self.workers          = workers or os.cpu_count()
+        # бюджет узлов на единицу до повторного дробления
+        self.budget           = budget
+        self.units_per_worker = units_per_worker
+
+
+    def _initial_units(self, domains, adj1, nbr2, full, max_depth=6):
+        # расщепляем верхние уровни дерева в ширину, пока единиц не станет достаточно
+        units = [[]]
+        for _ in range(max_depth):
+            if not units or len(units) >= self.workers * self.units_per_worker:
+                break
+            expanded = []
+            for prefix in units:
+                dom = _replay(prefix, domains, adj1, nbr2, full)
+                if dom is None:
+                    continue
+                if not dom:
+                    return prefix, []
+                u, targets = _branch(dom)
+                expanded.extend(prefix + [(u, v)] for v in targets)
+            units = expanded
+        return None, units
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        if g1.num_vertices != g2.num_vertices:
+            return StageResult.NON_ISO
+        n = g1.num_vertices
+        if sorted(len(g1.neighbors(u)) for u in range(n)) != \
+           sorted(len(g2.neighbors(v)) for v in range(n)):
+            return StageResult.NON_ISO
+
+        domains = initial_domains(g1, g2, context)
+        if any(d == 0 for d in domains.values()):
+            return StageResult.NON_ISO
+        (adj1, nbr2), full = search_adjacency(g1, g2), (1 << n) - 1
+
+
+        found, units = self._initial_units(domains, adj1, nbr2, full)
+        mapping = dict(found) if found is not None else None
+        if mapping is None and units:
+            mapping, complete = self._search(units, domains, adj1, nbr2, full, context)
+            if mapping is None and not complete:
+                # процесс-рабочий упал: дерево пройдено не полностью, NON_ISO утверждать нельзя
+                return StageResult.CONTINUE
+
+        if mapping is not None:
+            context['mapping'] = mapping
+            context['result']  = True
+            return StageResult.ISO
+        return StageResult.NON_ISO
+
+
+    def _search(self, units, domains, adj1, nbr2, full, context):
+        ctx     = multiprocessing.get_context()
+        tasks   = ctx.Queue()
+        results = ctx.Queue()
+        stop    = ctx.Event()
+        for prefix in units:
+            tasks.put(prefix)
+
+        procs = [
+            ctx.Process(target=_worker,
+                        args=(tasks, results, stop, domains, adj1, nbr2, full, self.budget),
+                        daemon=True)
+            for _ in range(self.workers)
+        ]
+        for p in procs:
+            p.start()
+
+        # счётчик незавершённых единиц: ноль — дерево пройдено целиком
+        pending, processed, mapping = len(units), 0, None
+        while pending > 0:
+            try:
+                kind, payload = results.get(timeout=0.1)
+            except queue.Empty:
+                # рабочий, завершившийся с ошибкой, уносит свою единицу — ждать нечего
+                if any(p.exitcode not in (None, 0) for p in procs) or \
+                   not any(p.is_alive() for p in procs):
+                    break
+                continue
+            if kind == 'found':
+                mapping = payload
+                break
+            pending   += payload - 1
+            processed += 1
+        context['search_units'] = processed
+        complete = mapping is not None or pending == 0
+
+        stop.set()
+        for _ in procs:
+            tasks.put(None)
+        # дочитываем сообщения, чтобы процессы могли завершиться
+        while any(p.is_alive() for p in procs):
+            try:
+                results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        for p in procs:
+            p.join()
+        return mapping, complete
@@ -0,0 +1,127 @@
+# graph_iso_checker/stages/peeling_stage.py
+from collections import Counter
+from ..stage import Stage, StageResult
+from ..algorithms.trees import ahu_codes, match_rooted, forest_mapping
+
+
+def two_core(g):
+    # флаги 2-ядра: листья (и изолированные вершины) обрываются, пока они есть
+    n = g.num_vertices
+    degree  = [len(g.neighbors(u)) for u in range(n)]
+    removed = [d <= 1 for d in degree]
+    queue   = [u for u in range(n) if removed[u]]
+    for u in queue:
+        for w in g.neighbors(u):
+            if not removed[w]:
+                degree[w] -= 1
+                if degree[w] <= 1:
+                    removed[w] = True
+                    queue.append(w)
+    return [not r for r in removed]
+
+
+class Fringe:
+    """
+    Разбиение графа на 2-ядро и «бахрому»: каждая вершина ядра несёт
+    подвешенное за неё дерево обрезанных вершин, его AHU-код — метка
+    вершины. Деревья, не касающиеся ядра, — отдельные компоненты-деревья.
+    """
+    def __init__(self, g, codes):
+        n = g.num_vertices
+        in_core = two_core(g)
+        self.core = [u for u in range(n) if in_core[u]]
+        # смежность без рёбер внутри ядра
+        adj = {u: [w for w in g.neighbors(u) if not (in_core[u] and in_core[w])] for u in range(n)}
+        self.rooted, self.labels, seen = {}, [], [False] * n
+        for u in self.core:
+            code, children = ahu_codes(adj, u, codes)
+            self.rooted[u] = (code, children)
+            self.labels.append(code[u])
+            for v in code:
+                seen[v] = True
+        # оставшиеся вершины образуют компоненты-деревья
+        self.trees = []
+        for s in range(n):
+            if seen[s]:
+                continue
+            seen[s] = True
+            tree = [s]
+            for v in tree:
+                for w in adj[v]:
+                    if not seen[w]:
+                        seen[w] = True
+                        tree.append(w)
+            self.trees.append(tree)
+
+
+class PeelingStage(Stage):
+    """
+    Сведение к 2-ядру: листья обрываются, пока они есть, код обрезанного
+    дерева становится меткой вершины ядра, к которой оно крепилось.
+    Вложенный конвейер checker решает задачу для ядер с этими метками как
+    метками вершин (и начальной раскраской initial_colors1/2, colors1/2),
+    затем отображение продолжается на бахрому сопоставлением подвешенных
+    деревьев.
+    """
+    def __init__(self, checker):
+        # checker — GraphIsoChecker с остальными этапами конвейера
+        self.checker = checker
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n:
+            return StageResult.NON_ISO
+        if g1.labeled or g2.labeled:
+            # коды бахромы не учитывают меток: весь конвейер на исходных графах
+            is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+            return self._finish(is_iso, mapping, context)
+        codes = {}
+        f1, f2 = Fringe(g1, codes), Fringe(g2, codes)
+        context['core_size'] = len(f1.core)
+        if len(f1.core) in (0, n) and len(f2.core) in (0, n):
+            # обрезать нечего (или граф — лес): весь конвейер на исходных графах
+            is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+            return self._finish(is_iso, mapping, context)
+        if len(f1.core) != len(f2.core) or Counter(f1.labels) != Counter(f2.labels):
+            return self._finish(False, None, context)
+        mapping = forest_mapping(g1.adj, f1.trees, g2.adj, f2.trees, codes)
+        if mapping is None:
+            return self._finish(False, None, context)
+
+
+        # коды бахромы — настоящие метки вершин ядер: их соблюдает любой вложенный этап
+        core1, core2 = g1.induced_subgraph(f1.core), g2.induced_subgraph(f2.core)
+        for core, labels in ((core1, f1.labels), (core2, f2.labels)):
+            for i, label in enumerate(labels):
+                core.set_vertex_label(i, label)
+        core_ctx = {
+            'initial_colors1': f1.labels, 'initial_colors2': f2.labels,
+            'colors1': f1.labels, 'colors2': f2.labels,
+        }
+        is_iso, core_map = self.checker.check_isomorphism(core1, core2, core_ctx)
+        if not is_iso:
+            return self._finish(False, None, context)
+        if isinstance(core_map, list):
+            # GA возвращает отображение списком
+            core_map = dict(enumerate(core_map))
+        for i, j in core_map.items():
+            u, v = f1.core[i], f2.core[j]
+            match_rooted(u, v, *f1.rooted[u], *f2.rooted[v], mapping)
+        return self._finish(True, mapping, context)
+
+
+    def _finish(self, is_iso, mapping, context):
+        if is_iso:
+            context['mapping'] = mapping
+            context['result']  = True
+            res = StageResult.ISO
+        else:
+            context['result'] = False
+            res = StageResult.NON_ISO
+        print(f"Листья: {res}")
+        return res
+
+
+
+
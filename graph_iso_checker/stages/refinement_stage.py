@@ -1,17 +1,37 @@
 from ..stage import Stage, StageResult
 from collections import Counter
+from ..algorithms.signatures import vertex_signatures
 
 
 class RefinementStage(Stage):
     # Этап цветового уточнения (Color Refinement / 1-WL)
+    def __init__(self, signatures=None):
+        # подписи вершин (algorithms/signatures) для начальной раскраски
+        self.signatures = signatures
+
+
     def run(self, g1, g2, context) -> StageResult:
         # смотрели на проверке инвариантов
         n = g1.num_vertices
 
 
-        # начальная раскраска по степеням
+        # начальная раскраска по степеням (и меткам initial_colors1/2, если заданы)
         degs1 = [len(g1.neighbors(u)) for u in range(n)]
         degs2 = [len(g2.neighbors(u)) for u in range(n)]
+        # метки вершин графа
+        if g1.vertex_labels is not None or g2.vertex_labels is not None:
+            degs1 = [(d, g1.vertex_label(u)) for u, d in enumerate(degs1)]
+            degs2 = [(d, g2.vertex_label(u)) for u, d in enumerate(degs2)]
+        # подписи вершин: уже посчитанные SignatureInvariant или свои
+        if self.signatures is not None and 'signatures1' not in context:
+            context['signatures1'] = vertex_signatures(g1, self.signatures)
+            context['signatures2'] = vertex_signatures(g2, self.signatures)
+        if 'signatures1' in context and 'signatures2' in context:
+            degs1 = list(zip(degs1, context['signatures1']))
+            degs2 = list(zip(degs2, context['signatures2']))
+        if 'initial_colors1' in context and 'initial_colors2' in context:
+            degs1 = list(zip(degs1, context['initial_colors1']))
+            degs2 = list(zip(degs2, context['initial_colors2']))
 
 
         # компрессия степеней в начальные цвета
@@ -22,10 +42,18 @@ class RefinementStage(Stage):
 
 
         # итерации
+        edge_labels = bool(g1.edge_labels or g2.edge_labels)
         while True:
             # собираем сигнатуры (старый цвет, отсортированный список соседних цветов)
-            sigs1 = [(colors1[u], tuple(sorted(colors1[v] for v in g1.neighbors(u)))) for u in range(n)]
-            sigs2 = [(colors2[u], tuple(sorted(colors2[v] for v in g2.neighbors(u)))) for u in range(n)]
+            if edge_labels:
+                # сосед учитывается вместе с меткой ребра до него
+                sigs1 = [(colors1[u], tuple(sorted((colors1[v], g1.edge_label(u, v)) for v in g1.neighbors(u))))
+                         for u in range(n)]
+                sigs2 = [(colors2[u], tuple(sorted((colors2[v], g2.edge_label(u, v)) for v in g2.neighbors(u))))
+                         for u in range(n)]
+            else:
+                sigs1 = [(colors1[u], tuple(sorted(colors1[v] for v in g1.neighbors(u)))) for u in range(n)]
+                sigs2 = [(colors2[u], tuple(sorted(colors2[v] for v in g2.neighbors(u)))) for u in range(n)]
 
 
             # создаём новую цветовую карту по уникальным сигнатурам
@@ -0,0 +1,146 @@
+# graph_iso_checker/stages/spectral_stage.py
+import numpy as np
+from ..stage import Stage, StageResult
+from ..graph import verify_mapping
+from ..algorithms.genetic.generational import vertex_groups
+
+try:
+    import scipy.sparse as sp
+    from scipy.sparse.linalg import eigsh
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    sp = eigsh = linear_sum_assignment = None
+
+
+def _matrix(g, kind, sparse):
+    # матрица смежности или лапласиан графа (плотная или CSR)
+    n = g.num_vertices
+    rows = [u for u in range(n) for _ in g.neighbors(u)]
+    cols = [v for u in range(n) for v in g.neighbors(u)]
+    if sparse:
+        a = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n, n))
+        if kind == 'laplacian':
+            a = sp.diags(np.asarray(a.sum(axis=1)).ravel()) - a
+        return a
+    a = np.zeros((n, n))
+    a[rows, cols] = 1.0
+    if kind == 'laplacian':
+        a = np.diag(a.sum(axis=1)) - a
+    return a
+
+
+def _assign(cost):
+    # линейное назначение: scipy, иначе жадно по возрастанию стоимости
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+    rows, cols, used_r, used_c = [], [], set(), set()
+    for flat in np.argsort(cost, axis=None):
+        r, c = divmod(int(flat), cost.shape[1])
+        if r not in used_r and c not in used_c:
+            used_r.add(r)
+            used_c.add(c)
+            rows.append(r)
+            cols.append(c)
+    return np.array(rows), np.array(cols)
+
+
+class SpectralStage(Stage):
+    """
+    Эвристика "сначала очевидный ответ": вершины вкладываются в пространство
+    ведущих собственных векторов, отображение строится линейным назначением
+    внутри клеток раскраски и проверяется за O(m). ISO или CONTINUE.
+    """
+    def __init__(self, k=8, matrix='adjacency', dense_limit=1500, max_cell=3000, tol=1e-6):
+        self.k           = k
+        # 'adjacency' — наибольшие по модулю, 'laplacian' — наименьшие собственные значения
+        self.matrix      = matrix
+        # до dense_limit вершин — плотный eigh, дальше — разреженный eigsh (нужен scipy)
+        self.dense_limit = dense_limit
+        self.max_cell    = max_cell
+        self.tol         = tol
+
+
+    def _spectrum(self, g, k):
+        # собственные пары, упорядоченные по "важности"
+        n = g.num_vertices
+        if n <= self.dense_limit:
+            vals, vecs = np.linalg.eigh(_matrix(g, self.matrix, sparse=False))
+        else:
+            which = 'LM' if self.matrix == 'adjacency' else 'SA'
+            vals, vecs = eigsh(_matrix(g, self.matrix, sparse=True), k=min(k + 1, n - 1), which=which)
+        order = np.argsort(-np.abs(vals)) if self.matrix == 'adjacency' else np.argsort(vals)
+        return vals[order], vecs[:, order]
+
+
+    def _signed(self, x):
+        # знак фиксируется третьим моментом; симметричный вектор — по модулю
+        skew = float(np.sum(x ** 3))
+        return np.abs(x) if abs(skew) < self.tol else np.sign(skew) * x
+
+
+    def _embeddings(self, vals1, vecs1, vals2, vecs2):
+        # только простые собственные значения: вектор определён с точностью до знака;
+        # столбцы g2 подбираются по значению, а не по позиции (порядок при |λ| равных неустойчив)
+        cols1, cols2 = [], []
+        # при частичном спектре (eigsh) последняя пара может быть кратной с невычисленной
+        limit = len(vals1) if len(vals1) == vecs1.shape[0] else len(vals1) - 1
+        for i in range(limit):
+            if np.count_nonzero(np.abs(vals1 - vals1[i]) < self.tol) > 1:
+                continue
+            j = int(np.argmin(np.abs(vals2 - vals1[i])))
+            cols1.append(self._signed(vecs1[:, i]))
+            cols2.append(self._signed(vecs2[:, j]))
+            if len(cols1) == self.k:
+                break
+        if not cols1:
+            return None, None
+        return np.column_stack(cols1), np.column_stack(cols2)
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n or n < 2:
+            return StageResult.CONTINUE
+        if n > self.dense_limit and eigsh is None:
+            print(f"Спектральный: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+
+
+        # спектры изоморфных графов совпадают
+        vals1, vecs1 = self._spectrum(g1, self.k)
+        vals2, vecs2 = self._spectrum(g2, self.k)
+        if not np.allclose(np.sort(vals1), np.sort(vals2), atol=self.tol * max(1, n)):
+            if n <= self.dense_limit:
+                # полный спектр различается — графы не изоморфны
+                print(f"Спектральный: {StageResult.NON_ISO}")
+                return StageResult.NON_ISO
+            print(f"Спектральный: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+        emb1, emb2 = self._embeddings(vals1, vecs1, vals2, vecs2)
+        if emb1 is None:
+            print(f"Спектральный: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+
+
+        # назначение внутри клеток раскраски (или групп степеней)
+        groups1, groups2 = vertex_groups(g1, g2, context)
+        mapping = {}
+        for key, vs1 in groups1.items():
+            vs2 = groups2.get(key, [])
+            if len(vs1) != len(vs2) or len(vs1) > self.max_cell:
+                print(f"Спектральный: {StageResult.CONTINUE}")
+                return StageResult.CONTINUE
+            a, b = emb1[vs1], emb2[vs2]
+            cost = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2 * a @ b.T
+            rows, cols = _assign(cost)
+            for r, c in zip(rows, cols):
+                mapping[vs1[r]] = vs2[c]
+
+
+        if verify_mapping(g1, g2, mapping):
+            context['mapping'] = mapping
+            context['result']  = True
+            print(f"Спектральный: {StageResult.ISO}")
+            return StageResult.ISO
+        print(f"Спектральный: {StageResult.CONTINUE}")
+        return StageResult.CONTINUE
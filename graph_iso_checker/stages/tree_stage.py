@@ -0,0 +1,55 @@
+# graph_iso_checker/stages/tree_stage.py
+from ..stage import Stage, StageResult
+from ..graph import connected_components
+from ..algorithms.trees import forest_mapping
+
+
+class TreeStage(Stage):
+    """
+    Быстрый путь для лесов: граф — лес, если m = n - (число компонент).
+    Каждое дерево подвешивается за центр(ы) и кодируется AHU за O(n log n);
+    деревья сопоставляются по кодам, отображение строится сверху вниз.
+    Для лесов — сразу ISO с отображением или NON_ISO, иначе CONTINUE.
+    """
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n:
+            return StageResult.NON_ISO
+        if g1.labeled or g2.labeled:
+            # коды AHU не учитывают меток
+            return StageResult.CONTINUE
+        # число рёбер и компонент — из инвариантов, если они уже посчитаны
+        m1 = context.get('edge_count')
+        if m1 is None:
+            m1 = sum(len(g1.neighbors(u)) for u in range(n)) // 2
+            m2 = sum(len(g2.neighbors(u)) for u in range(n)) // 2
+            if m1 != m2:
+                print(f"Дерево: {StageResult.NON_ISO}")
+                return StageResult.NON_ISO
+        if 'components' in context and m1 != n - len(context['components']):
+            return StageResult.CONTINUE
+        comps1 = connected_components(g1)
+        comps2 = connected_components(g2)
+        forest1 = m1 == n - len(comps1)
+        forest2 = m1 == n - len(comps2)
+        if forest1 != forest2:
+            # при равном числе рёбер лес и не-лес различаются числом компонент
+            print(f"Дерево: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+        if not forest1:
+            return StageResult.CONTINUE
+
+
+        mapping = forest_mapping(g1.adj, comps1, g2.adj, comps2, {})
+        if mapping is None:
+            context['result'] = False
+            print(f"Дерево: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+        context['mapping'] = mapping
+        context['result']  = True
+        print(f"Дерево: {StageResult.ISO}")
+        return StageResult.ISO
+
+
+
+
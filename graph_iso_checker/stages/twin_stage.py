@@ -0,0 +1,141 @@
+# graph_iso_checker/stages/twin_stage.py
+from collections import Counter
+from ..stage import Stage, StageResult
+from ..graph import Graph
+
+
+class TwinReduction:
+    """
+    Итеративное сжатие близнецов: вершины с одинаковой открытой (ложные
+    близнецы) или замкнутой (истинные) окрестностью сливаются в
+    представителя с меткой (тип, мультимножество меток членов). Повторяется,
+    пока есть что сливать, — так полностью сворачиваются кографы (полные,
+    пустые, полные многодольные графы, звёзды).
+    История слияний — лес узлов: узлы >= n хранят списки дочерних узлов.
+    """
+    def __init__(self, g, codes):
+        n = g.num_vertices
+        self.n = n
+        adj   = {u: set(g.neighbors(u)) for u in range(n)}
+        base  = codes.setdefault(('vertex',), len(codes))
+        label = {u: base for u in range(n)}
+        node  = {u: u for u in range(n)}
+        self.children = {}
+        self.node_label = {u: base for u in range(n)}
+        while True:
+            groups = {}
+            for u, nbrs in adj.items():
+                key = frozenset(nbrs)
+                groups.setdefault(('false', key), []).append(u)
+                groups.setdefault(('true', key | {u}), []).append(u)
+            merged = False
+            # вершина не бывает одновременно истинным и ложным близнецом,
+            # а слияние одного класса не меняет остальные — сливаем все разом
+            for (kind, _), members in groups.items():
+                if len(members) < 2:
+                    continue
+                merged = True
+                rep = members[0]
+                new = n + len(self.children)
+                self.children[new] = [node[x] for x in members]
+                node[rep]  = new
+                label[rep] = codes.setdefault((kind, tuple(sorted(label[x] for x in members))), len(codes))
+                self.node_label[new] = label[rep]
+                for x in members[1:]:
+                    for w in adj.pop(x):
+                        adj[w].discard(x)
+            if not merged:
+                break
+
+        self.vertices = sorted(adj)
+        index = {v: i for i, v in enumerate(self.vertices)}
+        self.labels = [label[v] for v in self.vertices]
+        self.nodes  = [node[v] for v in self.vertices]
+        self.quotient = Graph(len(self.vertices))
+        for v, nbrs in adj.items():
+            for w in nbrs:
+                self.quotient.add_edge(index[v], index[w])
+
+
+    def expand(self, a, other, b, mapping):
+        # узлы a (здесь) и b (в other) с равными метками: дети сопоставляются
+        # по меткам, листья — вершины исходного графа
+        pairs = [(a, b)]
+        while pairs:
+            x, y = pairs.pop()
+            if x < self.n:
+                mapping[x] = y
+                continue
+            by_label = {}
+            for z in other.children[y]:
+                by_label.setdefault(other.node_label[z], []).append(z)
+            for z in self.children[x]:
+                pairs.append((z, by_label[self.node_label[z]].pop()))
+        return mapping
+
+
+class TwinStage(Stage):
+    """
+    Сведение по близнецам: вложенный конвейер checker решает задачу для
+    фактор-графов с метками классов как метками вершин (и начальной
+    раскраской initial_colors1/2, colors1/2), затем каждая вершина
+    фактор-графа разворачивается обратно в свой класс.
+    """
+    def __init__(self, checker):
+        # checker — GraphIsoChecker с остальными этапами конвейера
+        self.checker = checker
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n:
+            return StageResult.NON_ISO
+        if g1.labeled or g2.labeled:
+            # близнецы с разными метками не взаимозаменяемы: весь конвейер на исходных графах
+            is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+            return self._finish(is_iso, mapping, context)
+        codes = {}
+        t1, t2 = TwinReduction(g1, codes), TwinReduction(g2, codes)
+        context['twin_reduced_size'] = len(t1.vertices)
+        if len(t1.vertices) == n and len(t2.vertices) == n:
+            # близнецов нет: весь конвейер на исходных графах
+            is_iso, mapping = self.checker.check_isomorphism(g1, g2, context)
+            return self._finish(is_iso, mapping, context)
+        if len(t1.vertices) != len(t2.vertices) or Counter(t1.labels) != Counter(t2.labels):
+            return self._finish(False, None, context)
+
+
+        # метки классов — настоящие метки вершин фактор-графов: их соблюдает любой вложенный этап
+        for t in (t1, t2):
+            for i, label in enumerate(t.labels):
+                t.quotient.set_vertex_label(i, label)
+        quotient_ctx = {
+            'initial_colors1': t1.labels, 'initial_colors2': t2.labels,
+            'colors1': t1.labels, 'colors2': t2.labels,
+        }
+        is_iso, q_map = self.checker.check_isomorphism(t1.quotient, t2.quotient, quotient_ctx)
+        if not is_iso:
+            return self._finish(False, None, context)
+        if isinstance(q_map, list):
+            # GA возвращает отображение списком
+            q_map = dict(enumerate(q_map))
+        mapping = {}
+        for i, j in q_map.items():
+            t1.expand(t1.nodes[i], t2, t2.nodes[j], mapping)
+        return self._finish(True, mapping, context)
+
+
+    def _finish(self, is_iso, mapping, context):
+        if is_iso:
+            context['mapping'] = mapping
+            context['result']  = True
+            res = StageResult.ISO
+        else:
+            context['result'] = False
+            res = StageResult.NON_ISO
+        print(f"Близнецы: {res}")
+        return res
+
+
+
+
@@ -0,0 +1,141 @@
+# graph_iso_checker/stages/two_wl_stage.py
+import numpy as np
+from ..stage import Stage, StageResult
+from ..graph import verify_mapping
+
+
+# модуль скетчей: при n <= 8192 сумма n произведений вычетов точно представима в float64
+PRIME = 1048573
+
+
+def _relabel(K1, K2):
+    # общая перенумерация цветов обоих графов (сортировкой через np.unique)
+    _, inv = np.unique(np.concatenate([K1.ravel(), K2.ravel()]), return_inverse=True)
+    inv = inv.reshape(-1)
+    return inv[:K1.size].reshape(K1.shape), inv[K1.size:].reshape(K2.shape)
+
+
+def _vertex_codes(colors1, colors2):
+    # цвета вершин из контекста -> общие номера 0..k-1
+    index = {c: i for i, c in enumerate(dict.fromkeys(list(colors1) + list(colors2)))}
+    return [index[c] for c in colors1], [index[c] for c in colors2]
+
+
+class TwoWLStage(Stage):
+    """
+    Двумерный Вейсфейлер–Леман (цвета пар вершин) для графов, которые
+    1-WL не расщепляет (регулярные и т.п.). Новый цвет пары (u, v) — старый
+    цвет и мультимножество пар (C(u,w), C(w,v)) по всем w. Мультимножество
+    сжимается скетчами sum_w x[C(u,w)] * y[C(w,v)] mod PRIME — это одно
+    произведение n×n матриц на скетч. Случайные x, y общие для обоих
+    графов, поэтому раскраска инвариантна, а коллизия лишь огрубляет её.
+    Цвета диагонали — цвета вершин, они пишутся в context['colors1'/'colors2']
+    (если их больше одного).
+    """
+    def __init__(self, max_n=400, max_rounds=None, sketches=2, seed=0):
+        # выше max_n — CONTINUE без вычислений: O(n^2) памяти и O(n^3) на раунд
+        self.max_n      = max_n
+        self.max_rounds = max_rounds
+        self.sketches   = sketches
+        self.seed       = seed
+
+
+    def _initial(self, g, colors, edge_codes):
+        # 0 — не ребро, 1 + номер метки — ребро, на диагонали 1 + len(edge_codes) + цвет вершины
+        n = g.num_vertices
+        C = np.zeros((n, n), dtype=np.int64)
+        for u in range(n):
+            nbrs = list(g.neighbors(u))
+            C[u, nbrs] = [1 + edge_codes[g.edge_label(u, v)] for v in nbrs]
+        C[np.arange(n), np.arange(n)] = 1 + len(edge_codes) + np.asarray(colors, dtype=np.int64)
+        return C
+
+
+    def _round(self, C1, C2, rng):
+        # ключ пары: старый цвет + скетчи; перенумерация после каждого скетча держит ключ < n^2
+        k = int(max(C1.max(), C2.max())) + 1
+        K1, K2 = C1, C2
+        for _ in range(self.sketches):
+            x = rng.integers(1, PRIME, size=k).astype(np.float64)
+            y = rng.integers(1, PRIME, size=k).astype(np.float64)
+            S1 = np.mod(x[C1] @ y[C1], PRIME).astype(np.int64)
+            S2 = np.mod(x[C2] @ y[C2], PRIME).astype(np.int64)
+            K1, K2 = _relabel(K1 * PRIME + S1, K2 * PRIME + S2)
+        return K1, K2
+
+
+    def refine(self, g1, g2, colors1=None, colors2=None):
+        """
+        Стабильная раскраска пар обоих графов (общие номера цветов).
+        """
+        n = g1.num_vertices
+        if colors1 is None or colors2 is None:
+            colors1 = colors2 = [0] * n
+        # метки вершин и рёбер входят в начальную раскраску
+        colors1, colors2 = _vertex_codes(
+            [(g1.vertex_label(u), c) for u, c in enumerate(colors1)],
+            [(g2.vertex_label(u), c) for u, c in enumerate(colors2)]
+        )
+        edge_codes = {label: i for i, label in enumerate(sorted(
+            {0} | set(g1.edge_labels.values()) | set(g2.edge_labels.values())
+        ))}
+        C1, C2 = _relabel(self._initial(g1, colors1, edge_codes), self._initial(g2, colors2, edge_codes))
+        count = int(max(C1.max(), C2.max())) + 1
+        rng = np.random.default_rng(self.seed)
+        rounds = 0
+        while self.max_rounds is None or rounds < self.max_rounds:
+            N1, N2 = self._round(C1, C2, rng)
+            rounds += 1
+            new = int(max(N1.max(), N2.max())) + 1
+            if new == count:
+                break
+            C1, C2, count = N1, N2, new
+            # разные гистограммы уже не сойдутся — дальше уточнять незачем
+            if not np.array_equal(np.bincount(C1.ravel(), minlength=count),
+                                  np.bincount(C2.ravel(), minlength=count)):
+                break
+        return C1, C2
+
+
+    def run(self, g1, g2, context) -> StageResult:
+        n = g1.num_vertices
+        if g2.num_vertices != n or n < 2 or n > self.max_n:
+            print(f"2-WL: {StageResult.CONTINUE}")
+            return StageResult.CONTINUE
+
+
+        C1, C2 = self.refine(g1, g2, context.get('colors1'), context.get('colors2'))
+        count = int(max(C1.max(), C2.max())) + 1
+        if not np.array_equal(np.bincount(C1.ravel(), minlength=count),
+                              np.bincount(C2.ravel(), minlength=count)):
+            print(f"2-WL: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+
+
+        # индуцированные цвета вершин — диагональ, сжатая в 0..k-1; одноцветная
+        # раскраска (вершинно-транзитивные графы) ничего не даёт и не публикуется,
+        # иначе GA сочтёт её признаком безнадёжности и пропустит себя
+        d1, d2 = _relabel(np.diagonal(C1).copy(), np.diagonal(C2).copy())
+        colors1, colors2 = d1.tolist(), d2.tolist()
+        if len(set(colors1)) > 1:
+            context['colors1'] = colors1
+            context['colors2'] = colors2
+
+
+        # все цвета вершин различны — отображение единственно возможное
+        if len(set(colors1)) == n:
+            where = {c: v for v, c in enumerate(colors2)}
+            mapping = {u: where[colors1[u]] for u in range(n)}
+            if verify_mapping(g1, g2, mapping):
+                context['mapping'] = mapping
+                context['result']  = True
+                print(f"2-WL: {StageResult.ISO}")
+                return StageResult.ISO
+            print(f"2-WL: {StageResult.NON_ISO}")
+            return StageResult.NON_ISO
+        print(f"2-WL: {StageResult.CONTINUE}")
+        return StageResult.CONTINUE
+
+
+
+
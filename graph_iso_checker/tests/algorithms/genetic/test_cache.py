@@ -0,0 +1,78 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, generate_random_graph
+from graph_iso_checker.algorithms.genetic.builder import GeneticAlgorithmBuilder
+from graph_iso_checker.algorithms.genetic.cache import ZobristHasher, FitnessCache
+from graph_iso_checker.algorithms.genetic.strategies.termination import GenerationTermination
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def test_zobrist_hash_depends_on_positions():
+    hasher = ZobristHasher(10)
+    perm = list(range(10))
+    random.shuffle(perm)
+    h = hasher.hash(perm)
+    assert h == hasher.hash(perm[:])
+    perm[2], perm[7] = perm[7], perm[2]
+    assert hasher.hash(perm) != h
+
+
+def test_fitness_cache_lru_and_counters():
+    cache = FitnessCache(maxsize=2)
+    cache.put(1, 10)
+    cache.put(2, 0)
+    assert cache.get(1) == 10
+    # нулевой фитнес — тоже значение
+    assert cache.get(2) == 0
+    cache.get(1)
+    cache.put(3, 30)        # вытесняется 2 — давно не использовался
+    assert cache.get(2) is None
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'size': 2}
+
+
+def test_ga_with_cache_and_dedup_finds_isomorphism():
+    g1 = generate_random_graph(8, 0.4)
+    g2, _ = g1.random_permutation()
+    context = {}
+    ga = (GeneticAlgorithmBuilder()
+          .with_population_size(20)
+          .with_workers(1)
+          .with_termination(GenerationTermination(300))
+          .with_fitness_cache(1000)
+          .with_duplicate_replacement()
+          .build())
+    found, mapping = ga.run(g1, g2, context)
+    assert found is True
+    for u in range(8):
+        for v in g1.neighbors(u):
+            assert g2.has_edge(mapping[u], mapping[v])
+    stats = context['fitness_cache']
+    assert stats['misses'] > 0 and stats['size'] <= 1000
+
+
+def test_duplicates_are_replaced():
+    # у пути все перестановки внутри групп степеней быстро повторяются
+    g = Graph(3)
+    g.add_edge(0, 1)
+    g.add_edge(1, 2)
+    context = {}
+    ga = (GeneticAlgorithmBuilder()
+          .with_population_size(10)
+          .with_workers(1)
+          .with_generations(1)
+          .with_duplicate_replacement()
+          .build())
+    ga._initialize_population(g, g, context)
+    population = [[0, 1, 2]] * 5 + [[2, 1, 0]] * 5
+    context['duplicates_replaced'] = 0
+    population, keys = ga._replace_duplicates(population, ZobristHasher(3), g, g, context)
+    assert context['duplicates_replaced'] == 8
+    assert len(keys) == len(population) == 10
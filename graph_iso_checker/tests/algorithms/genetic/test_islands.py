@@ -0,0 +1,85 @@
+import queue
+import threading
+import pytest
+import random
+
+
+from graph_iso_checker.graph import generate_random_graph
+from graph_iso_checker.algorithms.genetic.builder import GeneticAlgorithmBuilder
+from graph_iso_checker.algorithms.genetic.islands import IslandModel, MigrationChannel
+from graph_iso_checker.algorithms.genetic.strategies.fitness import EdgeMatchFitness
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def test_migration_replaces_worst_with_better_migrants():
+    inboxes = [queue.Queue(), queue.Queue()]
+    stop = threading.Event()
+    ch0 = MigrationChannel(0, inboxes, stop, interval=5, migrants=1)
+    ch1 = MigrationChannel(1, inboxes, stop, interval=5, migrants=1)
+
+    pop0, fit0 = [[0, 1, 2], [1, 0, 2]], [3, 1]
+    pop1, fit1 = [[2, 1, 0], [2, 0, 1]], [0, 0]
+    # вне интервала миграции обмена нет
+    assert ch0.exchange(3, pop0, fit0) is False
+    assert inboxes[1].empty()
+
+    assert ch0.exchange(5, pop0, fit0) is False
+    assert ch1.exchange(5, pop1, fit1) is False
+    # лучшая особь острова 0 заместила худшую на острове 1 (кольцо 0 -> 1)
+    assert [0, 1, 2] in pop1 and 3 in fit1
+
+
+def test_migration_reports_global_stop():
+    stop = threading.Event()
+    ch = MigrationChannel(0, [queue.Queue()], stop)
+    assert ch.exchange(1, [[0]], [0]) is False
+    stop.set()
+    assert ch.exchange(1, [[0]], [0]) is True
+
+
+def test_island_model_finds_isomorphism():
+    g1 = generate_random_graph(8, 0.4)
+    g2, _ = g1.random_permutation()
+    builder = (GeneticAlgorithmBuilder()
+               .with_population_size(20)
+               .with_generations(200))
+    model = IslandModel.from_builder(builder, islands=2, migration_interval=5, seed=1)
+    found, mapping = model.run(g1, g2, {})
+    assert found is True
+    for u in range(8):
+        for v in g1.neighbors(u):
+            assert g2.has_edge(mapping[u], mapping[v])
+
+
+def test_island_model_non_iso_mixed_engines(c6_and_two_triangles):
+    g1, g2 = c6_and_two_triangles
+    builders = [
+        GeneticAlgorithmBuilder().with_population_size(10).with_generations(20),
+        GeneticAlgorithmBuilder().with_population_size(10).with_generations(20).with_array_population(),
+    ]
+    found, mapping = IslandModel(builders, migration_interval=3, topology='random').run(g1, g2, {})
+    assert found is False
+    assert mapping is None
+
+
+class _BrokenFitness(EdgeMatchFitness):
+    # фитнес, падающий на первом вызове
+    def evaluate(self, individual, g1, g2, context):
+        raise RuntimeError("сбой фитнеса")
+
+
+def test_island_failure_does_not_hang(c6_and_two_triangles):
+    g1, g2 = c6_and_two_triangles
+    builder = (GeneticAlgorithmBuilder()
+               .with_population_size(10)
+               .with_generations(20)
+               .with_fitness(_BrokenFitness()))
+    found, mapping = IslandModel.from_builder(builder, islands=2).run(g1, g2, {})
+    assert found is False
+    assert mapping is None
@@ -0,0 +1,59 @@
+import pytest
+import random
+from collections import Counter
+
+
+from graph_iso_checker.graph import generate_random_graph, verify_mapping
+from graph_iso_checker.algorithms.genetic.builder import GeneticAlgorithmBuilder
+from graph_iso_checker.algorithms.genetic.multilevel import MultilevelGA, coarsen, project
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _degrees(g):
+    return [len(g.neighbors(u)) for u in range(g.num_vertices)]
+
+
+def test_coarsen_is_consistent():
+    g1 = generate_random_graph(120, 0.05)
+    g2, _ = g1.random_permutation()
+    k1, k2, m1, m2, c1, c2 = coarsen(g1, g2, _degrees(g1), _degrees(g2))
+    assert k1.num_vertices == k2.num_vertices < g1.num_vertices
+    assert Counter(c1) == Counter(c2)
+    # каждая вершина входит ровно в одну группу
+    assert sorted(u for grp in m1 for u in grp) == list(range(120))
+
+
+def test_project_keeps_colors():
+    g1 = generate_random_graph(60, 0.1)
+    g2, _ = g1.random_permutation()
+    cols1, cols2 = _degrees(g1), _degrees(g2)
+    k1, k2, m1, m2, c1, c2 = coarsen(g1, g2, cols1, cols2)
+    # произвольное отображение грубого уровня, сохраняющее цвета
+    by_color = {}
+    for v, col in enumerate(c2):
+        by_color.setdefault(col, []).append(v)
+    coarse = [by_color[col].pop() for col in c1]
+    perm = project(coarse, m1, m2, cols1, cols2)
+    assert sorted(perm) == list(range(60))
+    assert all(cols2[perm[u]] == cols1[u] for u in range(60))
+
+
+def test_multilevel_ga_finds_isomorphism():
+    g1 = generate_random_graph(150, 0.04)
+    g2, _ = g1.random_permutation()
+    builder = (GeneticAlgorithmBuilder()
+               .with_population_size(20)
+               .with_generations(30)
+               .with_workers(1))
+    context = {}
+    found, mapping = MultilevelGA(builder, coarsest=40, sweeps=300).run(g1, g2, context)
+    assert found is True
+    assert verify_mapping(g1, g2, mapping)
+    sizes = context['multilevel_sizes']
+    assert sizes[0] == 150 and len(sizes) > 1
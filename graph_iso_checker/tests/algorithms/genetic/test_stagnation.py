@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+import random
+
+
+from graph_iso_checker.algorithms.genetic.builder import GeneticAlgorithmBuilder
+from graph_iso_checker.algorithms.genetic.strategies.adaptation import (
+    DiversityAdaptiveRates, diversity
+)
+from graph_iso_checker.algorithms.genetic.strategies.termination import (
+    AnyTermination, GenerationTermination, StagnationTermination
+)
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+@pytest.mark.parametrize("array", [False, True])
+def test_stagnation_termination_uses_last_improvement(array, c6_and_two_triangles):
+    # GA записывает last_improvement, и остановка по застою срабатывает от него;
+    # графы не изоморфны — GA никогда не достигнет target
+    g1, g2 = c6_and_two_triangles
+    context = {}
+    ga = (GeneticAlgorithmBuilder()
+          .with_population_size(10)
+          .with_workers(1)
+          .with_termination(StagnationTermination(5))
+          .with_array_population(array)
+          .build())
+    found, _ = ga.run(g1, g2, context)
+    assert found is False
+    assert 'last_improvement' in context
+
+
+@pytest.mark.parametrize("array", [False, True])
+def test_partial_restarts_are_bounded(array, c6_and_two_triangles):
+    g1, g2 = c6_and_two_triangles
+    context = {}
+    ga = (GeneticAlgorithmBuilder()
+          .with_population_size(10)
+          .with_workers(1)
+          .with_termination(AnyTermination([GenerationTermination(100), StagnationTermination(30)]))
+          .with_restarts(3, max_restarts=2)
+          .with_adaptive_rates()
+          .with_array_population(array)
+          .build())
+    found, _ = ga.run(g1, g2, context)
+    assert found is False
+    assert context['restarts'] == 2
+    assert 0.0 <= context['mutation_rate'] <= 1.0
+
+
+def test_any_termination():
+    term = AnyTermination([GenerationTermination(10), StagnationTermination(3)])
+    assert term.should_terminate([], [], 2, {'last_improvement': 0}) is False
+    assert term.should_terminate([], [], 3, {'last_improvement': 0}) is True
+    assert term.should_terminate([], [], 10, {'last_improvement': 9}) is True
+
+
+def test_diversity_adaptive_rates():
+    best = [0, 1, 2, 3]
+    assert diversity([best[:], best[:]], best) == 0.0
+    assert diversity(np.array([[1, 0, 2, 3], [0, 1, 2, 3]]), best) == pytest.approx(0.25)
+
+    adapt = DiversityAdaptiveRates(min_mutation=0.05, max_mutation=0.3,
+                                   min_crossover=0.6, max_crossover=0.9, target=0.5)
+    context = {}
+    # выродившаяся популяция: максимум мутации, минимум кроссовера
+    adapt.update([best[:], best[:]], best, context)
+    assert context['mutation_rate'] == pytest.approx(0.3)
+    assert context['crossover_rate'] == pytest.approx(0.6)
+    # разнообразная популяция: наоборот
+    adapt.update([[3, 2, 1, 0], [1, 0, 3, 2]], best, context)
+    assert context['mutation_rate'] == pytest.approx(0.05)
+    assert context['crossover_rate'] == pytest.approx(0.9)
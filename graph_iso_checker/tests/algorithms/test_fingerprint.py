@@ -0,0 +1,65 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, BitsetGraph, generate_random_graph
+from graph_iso_checker.algorithms.fingerprint import fingerprint, bucket_by_fingerprint
+from graph_iso_checker.stages.invariant_stage import FingerprintInvariant
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _spider(legs):
+    # центр 0 и ноги заданных длин
+    g = Graph(1 + sum(legs))
+    nxt = 1
+    for length in legs:
+        prev = 0
+        for _ in range(length):
+            g.add_edge(prev, nxt)
+            prev, nxt = nxt, nxt + 1
+    return g
+
+
+def test_fingerprint_is_labeling_independent():
+    g1 = generate_random_graph(50, 0.1)
+    g2, perm = g1.random_permutation()
+    fp1, fp2 = fingerprint(g1), fingerprint(g2)
+    assert fp1.digest == fp2.digest and len(fp1.digest) == 32
+    assert all(fp1.vertex_hashes[u] == fp2.vertex_hashes[perm[u]] for u in range(50))
+    assert fingerprint(BitsetGraph.from_graph(g1)).digest == fp1.digest
+
+
+def test_fingerprint_is_cached_until_edge_added():
+    g = generate_random_graph(20, 0.2)
+    fp = fingerprint(g)
+    assert fingerprint(g) is fp
+    u, v = next((u, v) for u in range(20) for v in range(20) if u != v and not g.has_edge(u, v))
+    g.add_edge(u, v)
+    assert fingerprint(g).digest != fp.digest
+
+
+def test_fingerprint_invariant_rejects(c6_and_two_triangles):
+    # одинаковые степени, но разные деревья
+    context = {}
+    assert FingerprintInvariant().check(_spider([1, 1, 3]), _spider([1, 2, 2]), context) == StageResult.NON_ISO
+    # регулярные пары 1-WL (и отпечаток) не различает
+    g1, g2 = c6_and_two_triangles
+    assert FingerprintInvariant().check(g1, g2, context) == StageResult.CONTINUE
+
+
+def test_bucket_catalogue():
+    base = [generate_random_graph(15, 0.3) for _ in range(4)]
+    catalogue = base + [g.random_permutation()[0] for g in base]
+    buckets = bucket_by_fingerprint(catalogue)
+    assert sorted(sorted(b) for b in buckets.values()) == [[i, i + 4] for i in range(4)]
+
+
+
+
@@ -0,0 +1,114 @@
+import pytest
+import random
+from itertools import permutations
+
+
+from graph_iso_checker.graph import Graph, BitsetGraph, generate_random_graph
+from graph_iso_checker.algorithms.subgraph import HostIndex, SubgraphMatcher, find_subgraphs
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _brute(pattern, host, induced=True):
+    # все вложения перебором инъекций
+    k = pattern.num_vertices
+    found = []
+    for image in permutations(range(host.num_vertices), k):
+        if any(pattern.vertex_label(p) != host.vertex_label(image[p]) for p in range(k)):
+            continue
+        ok = True
+        for p in range(k):
+            for q in range(p + 1, k):
+                edge = q in pattern.neighbors(p)
+                host_edge = image[q] in host.neighbors(image[p])
+                if edge and (not host_edge or pattern.edge_label(p, q) != host.edge_label(image[p], image[q])):
+                    ok = False
+                elif induced and not edge and host_edge:
+                    ok = False
+        if ok:
+            found.append(dict(enumerate(image)))
+    return found
+
+
+def _key(mappings):
+    return sorted(tuple(sorted(m.items())) for m in mappings)
+
+
+def _path(k):
+    g = Graph(k)
+    for u in range(k - 1):
+        g.add_edge(u, u + 1)
+    return g
+
+
+@pytest.mark.parametrize("induced", [True, False])
+def test_matches_brute_force(induced):
+    for _ in range(30):
+        host = generate_random_graph(random.randint(5, 8), 0.4)
+        pattern = generate_random_graph(random.randint(2, 4), 0.5)
+        got = find_subgraphs(pattern, host, induced=induced)
+        assert _key(got) == _key(_brute(pattern, host, induced))
+
+
+def test_labels_restrict_matches():
+    for _ in range(20):
+        host = generate_random_graph(7, 0.5)
+        for v in range(7):
+            host.set_vertex_label(v, random.randint(0, 1))
+        for u in range(7):
+            for v in host.neighbors(u):
+                if u < v:
+                    host.add_edge(u, v, label=random.randint(0, 2))
+        pattern = Graph(3, vertex_labels=[random.randint(0, 1) for _ in range(3)])
+        pattern.add_edge(0, 1, label=random.randint(0, 2))
+        pattern.add_edge(1, 2, label=random.randint(0, 2))
+        for induced in (True, False):
+            assert _key(find_subgraphs(pattern, host, induced=induced)) == _key(_brute(pattern, host, induced))
+
+
+def test_induced_excludes_chords(c6_and_two_triangles):
+    c6, triangles = c6_and_two_triangles
+    # путь из трёх вершин: в C6 — 6 вложений с точностью до разворота, в треугольниках индуцированных нет
+    assert len(find_subgraphs(_path(3), c6)) == 12
+    assert find_subgraphs(_path(3), triangles) == []
+    assert len(find_subgraphs(_path(3), triangles, induced=False)) == 12
+
+
+def test_limit_and_streaming():
+    host = generate_random_graph(30, 0.3)
+    index = HostIndex(host)
+    everything = find_subgraphs(_path(3), host, index=index)
+    first = find_subgraphs(_path(3), host, limit=5, index=index)
+    assert len(first) == 5 and all(m in everything for m in first)
+    matcher = SubgraphMatcher(_path(3), index)
+    stream = matcher.matches()
+    assert next(stream) == everything[0]
+    assert matcher.stats['found'] == 1
+
+
+def test_time_budget_stops_search():
+    host = generate_random_graph(60, 0.5)
+    matcher = SubgraphMatcher(Graph(6), HostIndex(host), induced=False)
+    found = list(matcher.matches(time_budget=0.0))
+    assert matcher.stats['timed_out'] and len(found) < 60 ** 3
+
+
+def test_bitset_host_and_impossible_pattern():
+    host = generate_random_graph(12, 0.3)
+    pattern = _path(4)
+    assert _key(find_subgraphs(pattern, BitsetGraph.from_graph(host))) == _key(find_subgraphs(pattern, host))
+    # вершина степени 20 в хозяине из 12 вершин — отсекается индексом без поиска
+    star = Graph(21)
+    for v in range(1, 21):
+        star.add_edge(0, v)
+    matcher = SubgraphMatcher(star, HostIndex(host))
+    assert list(matcher.matches()) == [] and matcher.stats['nodes'] == 0
+
+
+
+
@@ -0,0 +1,16 @@
+import pytest
+
+
+from graph_iso_checker.graph import Graph
+
+
+@pytest.fixture
+def c6_and_two_triangles():
+    # C6 и два треугольника: одинаковые степени, но не изоморфны
+    g1 = Graph(6)
+    for u in range(6):
+        g1.add_edge(u, (u + 1) % 6)
+    g2 = Graph(6)
+    for a, b in [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)]:
+        g2.add_edge(a, b)
+    return g1, g2
@@ -0,0 +1,56 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import generate_random_graph, verify_mapping
+from graph_iso_checker.stages.annealing_stage import AnnealingStage, anneal
+from graph_iso_checker.algorithms.genetic.strategies.local_search import temperature
+from graph_iso_checker.stages.refinement_stage import RefinementStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def test_temperature_schedules():
+    assert temperature('exponential', 2.0, 0.02, 0.0) == pytest.approx(2.0)
+    assert temperature('exponential', 2.0, 0.02, 1.0) == pytest.approx(0.02)
+    assert temperature('exponential', 2.0, 0.02, 0.5) == pytest.approx(0.2)
+    assert temperature('linear', 2.0, 0.0, 0.25) == pytest.approx(1.5)
+
+
+@pytest.mark.parametrize("schedule", ["exponential", "linear"])
+def test_annealing_finds_isomorphism(schedule):
+    g1 = generate_random_graph(30, 0.2)
+    g2, _ = g1.random_permutation()
+    context = {}
+    stage = AnnealingStage(iterations=20000, restarts=2, workers=1, schedule=schedule, seed=1)
+    assert stage.run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_annealing_respects_color_cells():
+    g1 = generate_random_graph(25, 0.2)
+    g2, _ = g1.random_permutation()
+    context = {}
+    RefinementStage().run(g1, g2, context)
+    groups = {}
+    for u, col in enumerate(context['colors1']):
+        groups.setdefault(col, []).append(u)
+    by_color2 = {}
+    for v, col in enumerate(context['colors2']):
+        by_color2.setdefault(col, []).append(v)
+    pairs = [(vs1, by_color2[col]) for col, vs1 in groups.items()]
+    perm, _ = anneal(g1, g2, pairs, 200, 1.0, 0.1, 'exponential', seed=3)
+    assert all(context['colors2'][perm[u]] == context['colors1'][u] for u in range(25))
+
+
+def test_annealing_non_iso_continues_in_parallel(c6_and_two_triangles):
+    # решения нет, этап только передаёт дальше
+    g1, g2 = c6_and_two_triangles
+    stage = AnnealingStage(iterations=500, restarts=2, workers=2, tabu_steps=10, seed=0)
+    assert stage.run(g1, g2, {}) == StageResult.CONTINUE
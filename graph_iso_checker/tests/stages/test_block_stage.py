@@ -0,0 +1,73 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, verify_mapping
+from graph_iso_checker.algorithms.blocks import biconnected_components, block_cut_tree
+from graph_iso_checker.stages.block_stage import BlockStage
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _graph(n, edges):
+    g = Graph(n)
+    for u, v in edges:
+        g.add_edge(u, v)
+    return g
+
+
+def _block_chain(sizes, rnd):
+    # циклы заданных размеров, каждый привязан мостом к случайной вершине предыдущих
+    edges, n, firsts = [], 0, []
+    for s in sizes:
+        edges.extend((n + u, n + (u + 1) % s) for u in range(s))
+        firsts.append(n)
+        n += s
+    for i in range(1, len(sizes)):
+        edges.append((firsts[i] + rnd.randrange(sizes[i]), rnd.randrange(firsts[i])))
+    return _graph(n, edges)
+
+
+def test_biconnected_components_bowtie():
+    # два треугольника с общей вершиной 2 и висячее ребро 4-5
+    g = _graph(6, [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 2), (4, 5)])
+    blocks, cuts = biconnected_components(g)
+    assert sorted(blocks) == [[0, 1, 2], [2, 3, 4], [4, 5]]
+    assert cuts == [2, 4]
+    tree = block_cut_tree(blocks, cuts)
+    assert sum(len(nbrs) for nbrs in tree) // 2 == len(blocks) + len(cuts) - 1
+
+
+def test_block_stage_iso_mapping():
+    g1 = _block_chain([5, 4, 6, 4, 5, 3, 3], random.Random(1))
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert BlockStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_block_stage_distinguishes_attachment_points():
+    # одинаковые блоки, мосты — от разных вершин: исход как у точного поиска
+    sizes = [3, 4, 3, 4, 3]
+    outcomes = set()
+    for a in range(4):
+        for b in range(4):
+            g1 = _block_chain(sizes, random.Random(a))
+            g2, _ = _block_chain(sizes, random.Random(b)).random_permutation()
+            expected = ExactSearchStage(forward_checking=True).run(g1, g2, {})
+            assert BlockStage().run(g1, g2, {}) == expected
+            outcomes.add(expected)
+    assert outcomes == {StageResult.ISO, StageResult.NON_ISO}
+
+
+def test_block_stage_continues_on_biconnected():
+    g1 = _graph(5, [(u, (u + 1) % 5) for u in range(5)])
+    g2, _ = g1.random_permutation()
+    assert BlockStage().run(g1, g2, {}) == StageResult.CONTINUE
@@ -0,0 +1,58 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoChecker, GraphIsoCheckerBuilder
+from graph_iso_checker.stages.complement_stage import ComplementStage, edge_density
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _inner():
+    return GraphIsoChecker([ExactSearchStage(forward_checking=True)])
+
+
+def test_complement():
+    g = generate_random_graph(12, 0.7)
+    comp = g.complement()
+    for u in range(12):
+        assert u not in comp.neighbors(u)
+        for v in range(12):
+            if u != v:
+                assert comp.has_edge(u, v) != g.has_edge(u, v)
+    assert edge_density(g) + edge_density(comp) == pytest.approx(1.0)
+
+
+def test_dense_pair_is_solved_on_complements():
+    g1 = generate_random_graph(40, 0.85)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert ComplementStage(_inner()).run(g1, g2, context) == StageResult.ISO
+    assert context['complemented'] is True
+    # отображение дополнений — отображение исходных графов
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_sparse_pair_is_left_alone(c6_and_two_triangles):
+    g1, g2 = c6_and_two_triangles
+    context = {}
+    assert ComplementStage(_inner()).run(g1, g2, context) == StageResult.NON_ISO
+    assert context['complemented'] is False
+
+
+def test_dense_non_iso_via_builder(c6_and_two_triangles):
+    # дополнения C6 и двух треугольников плотные (9 из 15 рёбер) и не изоморфны
+    g1, g2 = (g.complement() for g in c6_and_two_triangles)
+    checker = (GraphIsoCheckerBuilder()
+               .add_exact_search_stage(forward_checking=True)
+               .with_complement_switching()
+               .build())
+    assert checker.check_isomorphism(g1, g2) == (False, None)
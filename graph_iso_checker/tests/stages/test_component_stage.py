@@ -0,0 +1,94 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, connected_components, verify_mapping
+from graph_iso_checker.builder import GraphIsoChecker, GraphIsoCheckerBuilder
+from graph_iso_checker.stages.invariant_stage import InvariantStage
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stages.component_stage import ComponentStage
+from graph_iso_checker.stages.genetic_stage import GeneticStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _disjoint(*parts):
+    # объединение графов, заданных (число вершин, рёбра)
+    g = Graph(sum(n for n, _ in parts))
+    offset = 0
+    for n, edges in parts:
+        for u, v in edges:
+            g.add_edge(offset + u, offset + v)
+        offset += n
+    return g
+
+
+CYCLE5  = (5, [(i, (i + 1) % 5) for i in range(5)])
+PATH3   = (3, [(0, 1), (1, 2)])
+PRISM   = (6, [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)])
+K33     = (6, [(a, b) for a in range(3) for b in range(3, 6)])
+EDGE    = (2, [(0, 1)])
+VERTEX  = (1, [])
+
+
+def _inner():
+    return GraphIsoChecker([InvariantStage(), ExactSearchStage(forward_checking=True)])
+
+
+def test_induced_subgraph_and_components():
+    g = _disjoint(PATH3, EDGE, VERTEX)
+    comps = sorted(connected_components(g))
+    assert comps == [[0, 1, 2], [3, 4], [5]]
+    sub = g.induced_subgraph([2, 1, 0])
+    assert sub.has_edge(0, 1) and sub.has_edge(1, 2) and not sub.has_edge(0, 2)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_components_iso_mapping(workers):
+    g1 = _disjoint(CYCLE5, PATH3, PRISM, EDGE, VERTEX, VERTEX, PATH3)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert ComponentStage(_inner(), workers=workers).run(g1, g2, context) == StageResult.ISO
+    assert context['component_count'] == 7
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_components_with_genetic_mapping():
+    # GA возвращает отображение компоненты списком
+    chorded = (5, CYCLE5[1] + [(0, 2)])
+    g1 = _disjoint(chorded, chorded)
+    g2, _ = g1.random_permutation()
+    inner = GraphIsoChecker([GeneticStage(population_size=30, generations=100, stall=20)])
+    context = {}
+    assert ComponentStage(inner, workers=1).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_components_same_fingerprint_non_iso():
+    # призма и K3,3: 6 вершин, 9 рёбер, 3-регулярны — различает только вложенный конвейер
+    g1 = _disjoint(PRISM, K33)
+    g2 = _disjoint(PRISM, PRISM)
+    assert ComponentStage(_inner(), workers=1).run(g1, g2, {}) == StageResult.NON_ISO
+
+
+def test_components_count_mismatch(c6_and_two_triangles):
+    g1, g2 = c6_and_two_triangles
+    assert ComponentStage(_inner(), workers=1).run(g1, g2, {}) == StageResult.NON_ISO
+
+
+def test_builder_component_decomposition():
+    g1 = _disjoint(PRISM, K33, CYCLE5)
+    g2, _ = g1.random_permutation()
+    checker = (GraphIsoCheckerBuilder()
+               .add_invariant_stage()
+               .add_exact_search_stage(forward_checking=True)
+               .with_component_decomposition(workers=1)
+               .build())
+    is_iso, mapping = checker.check_isomorphism(g1, g2)
+    assert is_iso and verify_mapping(g1, g2, mapping)
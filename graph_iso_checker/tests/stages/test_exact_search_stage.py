@@ -1,10 +1,13 @@
 # tests/stages/test_exact_search_stage.py
 import pytest
 import random
+import sys
 
 
 from graph_iso_checker.graph import Graph
-from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stages.exact_search_stage import (
+    ExactSearchStage, automorphism_generators, initial_domains
+)
 from graph_iso_checker.stage import StageResult
 
 
@@ -114,5 +117,129 @@ def test_exact_iso_complete_graph_100():
                 assert g2.has_edge(mapping[u], mapping[v])
 
 
+def _random_regular(n, k):
+    # случайный k-регулярный граф (модель конфигураций с повторением попыток)
+    while True:
+        points = [u for u in range(n) for _ in range(k)]
+        random.shuffle(points)
+        g = Graph(n)
+        ok = True
+        for a, b in zip(points[::2], points[1::2]):
+            if a == b or g.has_edge(a, b):
+                ok = False
+                break
+            g.add_edge(a, b)
+        if ok:
+            return g
+
+
+@pytest.mark.parametrize("n, p", [(10, 0.5), (40, 0.3), (60, 0.7)])
+def test_forward_checking_iso(n, p):
+    g1 = Graph(n)
+    for u in range(n):
+        for v in range(u+1, n):
+            if random.random() < p:
+                g1.add_edge(u, v)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, context) == StageResult.ISO
+    mapping = context['mapping']
+    assert set(mapping.values()) == set(range(n))
+    for u in range(n):
+        for v in g1.neighbors(u):
+            assert g2.has_edge(mapping[u], mapping[v])
+
+
+def test_forward_checking_prunes_regular_non_iso():
+    # регулярные графы: степени не помогают, прямая проверка режет дерево
+    g1 = _random_regular(16, 3)
+    g2 = _random_regular(16, 3)
+    plain, fc = {}, {}
+    r_plain = ExactSearchStage().run(g1, g2, plain)
+    r_fc = ExactSearchStage(forward_checking=True).run(g1, g2, fc)
+    assert r_plain == r_fc
+    assert fc['search_nodes'] <= plain['search_nodes']
+
+
+def test_forward_checking_respects_colors():
+    # путь 0-1-2: при несовместимых цветах концов отображения нет
+    g1 = Graph(3)
+    g1.add_edge(0, 1)
+    g1.add_edge(1, 2)
+    g2, _ = g1.random_permutation()
+    context = {'colors1': [0, 1, 0], 'colors2': [1, 1, 1]}
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, context) == StageResult.NON_ISO
+
+
+def test_forward_checking_deeper_than_recursion_limit():
+    # поиск идёт явным стеком: путь длиннее предела рекурсии, предел не меняется
+    n = sys.getrecursionlimit() + 200
+    g1 = Graph(n)
+    for u in range(n - 1):
+        g1.add_edge(u, u + 1)
+    g2, _ = g1.random_permutation()
+    limit = sys.getrecursionlimit()
+    context = {}
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, context) == StageResult.ISO
+    assert sys.getrecursionlimit() == limit
+    assert all(g2.has_edge(context['mapping'][u], context['mapping'][u + 1]) for u in range(n - 1))
+
+
+def _cycle(n):
+    g = Graph(n)
+    for u in range(n):
+        g.add_edge(u, (u + 1) % n)
+    return g
+
+
+def _petersen():
+    g = Graph(10)
+    for u in range(5):
+        g.add_edge(u, (u + 1) % 5)
+        g.add_edge(u, u + 5)
+        g.add_edge(u + 5, (u + 2) % 5 + 5)
+    return g
+
+
+@pytest.mark.parametrize("g, order", [
+    (_cycle(9), 18), (_petersen(), 120), (Graph(6), 720),
+])
+def test_automorphism_group_order(g, order):
+    gens, size, complete = automorphism_generators(g, initial_domains(g, g, {}))
+    assert complete and size == order
+    for perm in gens:
+        assert all(g.has_edge(perm[u], perm[v]) for u in range(g.num_vertices) for v in g.neighbors(u))
+
+
+def test_automorphisms_orbits_in_context():
+    # путь 0-1-2-3: орбиты {0, 3} и {1, 2}
+    g1 = Graph(4)
+    for u in range(3):
+        g1.add_edge(u, u + 1)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert ExactSearchStage(automorphisms=True).run(g1, g2, context) == StageResult.ISO
+    assert context['automorphism_group_size'] == 2
+    assert sorted(context['automorphism_orbits']) == [[0, 3], [1, 2]]
+    for u in range(4):
+        for v in g1.neighbors(u):
+            assert g2.has_edge(context['mapping'][u], context['mapping'][v])
+
+
+def test_automorphism_pruning_on_symmetric_non_iso():
+    # C_40 против двух C_20: одинаковые степени и регулярность, отсечение орбит сокращает дерево
+    g1 = Graph(40)
+    for u in range(20):
+        g1.add_edge(u, (u + 1) % 20)
+        g1.add_edge(20 + u, 20 + (u + 1) % 20)
+    g2 = _cycle(40)
+    plain, pruned = {}, {}
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, plain) == StageResult.NON_ISO
+    assert ExactSearchStage(automorphisms=True).run(g1, g2, pruned) == StageResult.NON_ISO
+    assert pruned['automorphism_group_size'] == 2 * 40 * 40
+    assert pruned['orbit_pruned'] > 0
+    assert pruned['search_nodes'] * 10 < plain['search_nodes']
+
+
 
 
@@ -0,0 +1,79 @@
+import multiprocessing
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.stages import parallel_exact_stage
+from graph_iso_checker.stages.parallel_exact_stage import ParallelExactSearchStage, solve_unit
+from graph_iso_checker.stages.exact_search_stage import (
+    ExactSearchStage, initial_domains, neighbor_bitsets
+)
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _random_regular(n, k):
+    # случайный k-регулярный граф (модель конфигураций с повторением попыток)
+    while True:
+        points = [u for u in range(n) for _ in range(k)]
+        random.shuffle(points)
+        g = Graph(n)
+        ok = True
+        for a, b in zip(points[::2], points[1::2]):
+            if a == b or g.has_edge(a, b):
+                ok = False
+                break
+            g.add_edge(a, b)
+        if ok:
+            return g
+
+
+@pytest.mark.parametrize("seed", range(2, 8))
+def test_parallel_iso(seed):
+    random.seed(seed)
+    g1 = generate_random_graph(12, 0.3)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert ParallelExactSearchStage(workers=2).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_parallel_non_iso_matches_serial_with_resplitting():
+    # маленький бюджет заставляет единицы дробиться повторно
+    g1 = _random_regular(30, 3)
+    g2 = _random_regular(30, 3)
+    serial = ExactSearchStage(forward_checking=True).run(g1, g2, {})
+    context = {}
+    assert ParallelExactSearchStage(workers=2, budget=20).run(g1, g2, context) == serial
+    assert context['search_units'] > 0
+
+
+def test_solve_unit_splits_on_budget():
+    g1 = _random_regular(20, 3)
+    g2 = _random_regular(20, 3)
+    domains = initial_domains(g1, g2, {})
+    kind, children = solve_unit([], domains, g1.adj, neighbor_bitsets(g2), (1 << 20) - 1, budget=1)
+    assert kind in ('split', 'done')
+    if kind == 'split':
+        assert all(len(prefix) == 1 for prefix in children)
+
+
+def _crash(*args, **kwargs):
+    raise RuntimeError("сбой рабочего процесса")
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="подмена функции видна рабочим только при fork")
+def test_worker_crash_does_not_hang(monkeypatch):
+    # упавший рабочий не должен ни подвешивать этап, ни давать ложный NON_ISO
+    monkeypatch.setattr(parallel_exact_stage, "solve_unit", _crash)
+    g1 = _random_regular(16, 3)
+    g2, _ = g1.random_permutation()
+    assert ParallelExactSearchStage(workers=2).run(g1, g2, {}) == StageResult.CONTINUE
@@ -0,0 +1,118 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoChecker, GraphIsoCheckerBuilder
+from graph_iso_checker.stages.peeling_stage import PeelingStage, two_core
+from graph_iso_checker.stages.refinement_stage import RefinementStage
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stages.genetic_stage import GeneticStage
+from graph_iso_checker.stages.invariant_stage import InvariantStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _fringed_cycle(k, attach, extra=()):
+    # цикл длины k; attach — (вершина цикла, длина висячего пути); extra — рёбра сверху
+    edges = [(u, (u + 1) % k) for u in range(k)] + list(extra)
+    n = k
+    for root, length in attach:
+        prev = root
+        for _ in range(length):
+            edges.append((prev, n))
+            prev, n = n, n + 1
+    g = Graph(n)
+    for u, v in edges:
+        g.add_edge(u, v)
+    return g
+
+
+def _inner():
+    return GraphIsoChecker([RefinementStage(), ExactSearchStage(forward_checking=True)])
+
+
+def test_peeling_with_genetic_core_mapping():
+    # GA возвращает отображение ядер списком
+    g1 = _fringed_cycle(6, [(0, 2), (1, 1), (3, 1)], extra=[(0, 3)])
+    g2, _ = g1.random_permutation()
+    inner = GraphIsoChecker([GeneticStage(population_size=30, generations=100, stall=20)])
+    context = {}
+    assert PeelingStage(inner).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_peeling_codes_bind_colour_blind_stages():
+    # простой перебор не смотрит на раскраску: коды бахромы доходят до него метками вершин ядер
+    inner = GraphIsoChecker([InvariantStage(), RefinementStage(), ExactSearchStage()])
+    for _ in range(20):
+        g1 = _fringed_cycle(6, [(random.randrange(6), random.randint(1, 3)) for _ in range(3)], extra=[(0, 3)])
+        g2, _ = g1.random_permutation()
+        context = {}
+        assert PeelingStage(inner).run(g1, g2, context) == StageResult.ISO
+        assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_two_core():
+    g = _fringed_cycle(4, [(0, 3), (2, 1)])
+    assert [u for u, c in enumerate(two_core(g)) if c] == [0, 1, 2, 3]
+
+
+def test_peeling_iso_mapping():
+    g1 = _fringed_cycle(6, [(0, 3), (0, 1), (2, 2), (3, 1)], extra=[(0, 3)])
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert PeelingStage(_inner()).run(g1, g2, context) == StageResult.ISO
+    assert context['core_size'] == 6
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_peeling_labels_separate_attachment_points():
+    # одинаковые ядро и бахрома, но путь длины 2 крепится к соседу или к противоположной вершине
+    g1 = _fringed_cycle(6, [(0, 2), (1, 1)])
+    g2 = _fringed_cycle(6, [(0, 2), (3, 1)])
+    assert PeelingStage(_inner()).run(g1, g2, {}) == StageResult.NON_ISO
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, {}) == StageResult.NON_ISO
+
+
+def test_peeling_with_tree_components():
+    # ядро с бахромой плюс отдельное дерево
+    g1 = _fringed_cycle(5, [(1, 2)])
+    g = Graph(g1.num_vertices + 4)
+    for u in range(g1.num_vertices):
+        for v in g1.neighbors(u):
+            g.add_edge(u, v)
+    base = g1.num_vertices
+    for u, v in [(0, 1), (1, 2), (1, 3)]:
+        g.add_edge(base + u, base + v)
+    h, _ = g.random_permutation()
+    context = {}
+    assert PeelingStage(_inner()).run(g, h, context) == StageResult.ISO
+    assert verify_mapping(g, h, context['mapping'])
+
+
+def test_refinement_uses_initial_colors():
+    # метки разбивают вершины цикла, которые степени не различают
+    g = _fringed_cycle(4, [])
+    context = {'initial_colors1': [0, 1, 0, 1], 'initial_colors2': [1, 0, 1, 0]}
+    RefinementStage().run(g, g, context)
+    assert context['colors1'][0] == context['colors2'][1]
+    assert context['colors1'][0] != context['colors1'][1]
+
+
+def test_builder_with_peeling():
+    g1 = _fringed_cycle(7, [(0, 4), (3, 2), (5, 1)], extra=[(1, 4)])
+    g2, _ = g1.random_permutation()
+    checker = (GraphIsoCheckerBuilder()
+               .add_refinement_stage()
+               .add_exact_search_stage(forward_checking=True)
+               .with_peeling()
+               .build())
+    is_iso, mapping = checker.check_isomorphism(g1, g2)
+    assert is_iso and verify_mapping(g1, g2, mapping)
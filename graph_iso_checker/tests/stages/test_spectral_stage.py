@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.stages import spectral_stage
+from graph_iso_checker.stages.spectral_stage import SpectralStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _cycle(n):
+    g = Graph(n)
+    for u in range(n):
+        g.add_edge(u, (u + 1) % n)
+    return g
+
+
+def test_verify_mapping():
+    g1 = _cycle(5)
+    g2, perm = g1.random_permutation()
+    assert verify_mapping(g1, g2, perm)
+    assert verify_mapping(g1, g2, dict(enumerate(perm)))
+    # не биекция
+    assert not verify_mapping(g1, g2, [0] * 5)
+    # биекция, но рёбра не сохраняются
+    bad = perm[:]
+    bad[0], bad[2] = bad[2], bad[0]
+    assert not verify_mapping(g1, g2, bad)
+
+
+@pytest.mark.parametrize("matrix", ["adjacency", "laplacian"])
+def test_spectral_iso_random_graph(matrix):
+    g1 = generate_random_graph(60, 0.15)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert SpectralStage(matrix=matrix).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_spectral_uses_color_cells():
+    g1 = generate_random_graph(40, 0.2)
+    g2, _ = g1.random_permutation()
+    # грубая раскраска по степеням вместо дискретной, которую дал бы refinement
+    context = {
+        'colors1': [len(g1.neighbors(u)) for u in range(40)],
+        'colors2': [len(g2.neighbors(u)) for u in range(40)],
+    }
+    assert SpectralStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_spectral_sparse_path():
+    # dense_limit ниже n — собственные векторы считаются через eigsh
+    pytest.importorskip("scipy")
+    g1 = generate_random_graph(80, 0.1)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert SpectralStage(dense_limit=10).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_spectral_greedy_fallback(monkeypatch):
+    # без scipy назначение строится жадно
+    monkeypatch.setattr(spectral_stage, "linear_sum_assignment", None)
+    # жадное назначение на матрице с единственным оптимумом совпадает с оптимальным
+    rows, cols = spectral_stage._assign(np.array([[5.0, 0.1, 9.0], [0.2, 7.0, 8.0], [6.0, 4.0, 0.3]]))
+    assert dict(zip(rows.tolist(), cols.tolist())) == {0: 1, 1: 0, 2: 2}
+
+    g1 = generate_random_graph(30, 0.2)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert SpectralStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_spectral_symmetric_graph_continues():
+    # у цикла все собственные значения, кроме крайних, кратные — решение не угадать
+    g1 = _cycle(8)
+    g2, _ = g1.random_permutation()
+    assert SpectralStage().run(g1, g2, {}) == StageResult.CONTINUE
+
+
+def test_spectral_different_spectra_non_iso(c6_and_two_triangles):
+    # одинаковые степени, разные спектры
+    g1, g2 = c6_and_two_triangles
+    assert SpectralStage().run(g1, g2, {}) == StageResult.NON_ISO
@@ -0,0 +1,108 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, verify_mapping
+from graph_iso_checker.algorithms.trees import tree_centers, ahu_codes
+from graph_iso_checker.stages.tree_stage import TreeStage
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _random_tree(n, rnd, offset=0, g=None):
+    # случайное дерево (каждая вершина цепляется к одной из предыдущих)
+    g = g or Graph(n)
+    for v in range(1, n):
+        g.add_edge(offset + v, offset + rnd.randrange(v))
+    return g
+
+
+def _path(n):
+    g = Graph(n)
+    for u in range(n - 1):
+        g.add_edge(u, u + 1)
+    return g
+
+
+def test_tree_centers():
+    g = _path(5)
+    assert tree_centers(g.adj) == [2]
+    assert sorted(tree_centers(_path(6).adj)) == [2, 3]
+    # центр компоненты {3, 4} графа из двух путей
+    two = Graph(5)
+    for u, v in [(0, 1), (1, 2), (3, 4)]:
+        two.add_edge(u, v)
+    assert sorted(tree_centers(two.adj, [3, 4])) == [3, 4]
+
+
+def test_ahu_codes_distinguish_rooted_trees():
+    codes = {}
+    star = Graph(4)
+    for v in range(1, 4):
+        star.add_edge(0, v)
+    code_star, _ = ahu_codes(star.adj, 0, codes)
+    code_path, _ = ahu_codes(_path(4).adj, 0, codes)
+    code_path2, _ = ahu_codes(_path(4).adj, 3, codes)
+    assert code_star[0] != code_path[0]
+    assert code_path[0] == code_path2[3]
+
+
+@pytest.mark.parametrize("n", [1, 2, 50, 3000])
+def test_tree_iso_mapping(n):
+    g1 = _random_tree(n, random.Random(n))
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert TreeStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_long_path_without_recursion():
+    g1 = _path(20000)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert TreeStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_forests_agree_with_exact_search():
+    rnd = random.Random(7)
+    outcomes = set()
+    for _ in range(60):
+        sizes = [rnd.randint(1, 7) for _ in range(3)]
+        g1, g2 = Graph(sum(sizes)), Graph(sum(sizes))
+        offset = 0
+        for s in sizes:
+            _random_tree(s, rnd, offset, g1)
+            _random_tree(s, rnd, offset, g2)
+            offset += s
+        if rnd.random() < 0.4:
+            g2, _ = g1.random_permutation()
+        context = {}
+        expected = ExactSearchStage(forward_checking=True).run(g1, g2, {})
+        assert TreeStage().run(g1, g2, context) == expected
+        if expected == StageResult.ISO:
+            assert verify_mapping(g1, g2, context['mapping'])
+        outcomes.add(expected)
+    assert outcomes == {StageResult.ISO, StageResult.NON_ISO}
+
+
+def test_forest_vs_non_forest_and_cycles():
+    # треугольник + изолированная вершина против звезды K1,3: рёбер поровну, лес только один
+    g1 = Graph(4)
+    for u, v in [(0, 1), (1, 2), (2, 0)]:
+        g1.add_edge(u, v)
+    g2 = Graph(4)
+    for v in range(1, 4):
+        g2.add_edge(0, v)
+    assert TreeStage().run(g1, g2, {}) == StageResult.NON_ISO
+    cycle = Graph(5)
+    for u in range(5):
+        cycle.add_edge(u, (u + 1) % 5)
+    assert TreeStage().run(cycle, cycle.random_permutation()[0], {}) == StageResult.CONTINUE
@@ -0,0 +1,125 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoChecker, GraphIsoCheckerBuilder
+from graph_iso_checker.stages.twin_stage import TwinStage, TwinReduction
+from graph_iso_checker.stages.refinement_stage import RefinementStage
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stages.genetic_stage import GeneticStage
+from graph_iso_checker.stages.invariant_stage import InvariantStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _complete_multipartite(*parts):
+    g = Graph(sum(parts))
+    owner = [i for i, p in enumerate(parts) for _ in range(p)]
+    for u in range(g.num_vertices):
+        for v in range(u + 1, g.num_vertices):
+            if owner[u] != owner[v]:
+                g.add_edge(u, v)
+    return g
+
+
+def _blown_cycle(sizes):
+    # цикл, каждая вершина которого заменена классом ложных близнецов заданного размера
+    starts = [sum(sizes[:i]) for i in range(len(sizes))]
+    g = Graph(sum(sizes))
+    for i in range(len(sizes)):
+        j = (i + 1) % len(sizes)
+        for a in range(sizes[i]):
+            for b in range(sizes[j]):
+                g.add_edge(starts[i] + a, starts[j] + b)
+    return g
+
+
+def _inner():
+    return GraphIsoChecker([RefinementStage(), ExactSearchStage(forward_checking=True)])
+
+
+@pytest.mark.parametrize("g", [
+    _complete_multipartite(1, 1, 1, 1, 1, 1),       # K6
+    _complete_multipartite(7),                      # пустой граф
+    _complete_multipartite(3, 3, 2),
+    _complete_multipartite(1, 9),                   # звезда
+])
+def test_cographs_collapse_to_one_vertex(g):
+    assert len(TwinReduction(g, {}).vertices) == 1
+    h, _ = g.random_permutation()
+    context = {}
+    assert TwinStage(_inner()).run(g, h, context) == StageResult.ISO
+    assert verify_mapping(g, h, context['mapping'])
+
+
+def test_twin_classes_on_blown_cycle():
+    g1 = _blown_cycle([2, 1, 3, 1, 2])
+    assert len(TwinReduction(g1, {}).vertices) == 5
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert TwinStage(_inner()).run(g1, g2, context) == StageResult.ISO
+    assert context['twin_reduced_size'] == 5
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_twin_labels_keep_class_order():
+    # те же размеры классов в другом порядке вдоль цикла — не изоморфны
+    g1 = _blown_cycle([2, 1, 3, 1, 1])
+    g2 = _blown_cycle([2, 3, 1, 1, 1])
+    assert TwinStage(_inner()).run(g1, g2, {}) == StageResult.NON_ISO
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, {}) == StageResult.NON_ISO
+
+
+def test_builder_with_twin_reduction():
+    g1 = _complete_multipartite(4, 4, 3, 1)
+    g2, _ = g1.random_permutation()
+    checker = (GraphIsoCheckerBuilder()
+               .add_refinement_stage()
+               .add_exact_search_stage(forward_checking=True)
+               .with_twin_reduction()
+               .build())
+    is_iso, mapping = checker.check_isomorphism(g1, g2)
+    assert is_iso and verify_mapping(g1, g2, mapping)
+
+
+def _k23_and_cycle():
+    # K2,3 и отдельный C5
+    g = Graph(10)
+    for a in range(2):
+        for b in range(2, 5):
+            g.add_edge(a, b)
+    for i in range(5):
+        g.add_edge(5 + i, 5 + (i + 1) % 5)
+    return g
+
+
+def test_twin_with_genetic_quotient_mapping():
+    # GA возвращает отображение фактор-графов списком
+    g1 = _k23_and_cycle()
+    g2, _ = g1.random_permutation()
+    inner = GraphIsoChecker([InvariantStage(), GeneticStage(population_size=30, generations=100, stall=20)])
+    context = {}
+    assert TwinStage(inner).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_twin_labels_bind_colour_blind_stages():
+    # простой перебор не смотрит на раскраску: метки классов доходят до него метками вершин
+    inner = GraphIsoChecker([ExactSearchStage()])
+    for sizes in ([1, 2, 1, 3, 1], [2, 1, 1, 2, 1, 1], [3, 1, 2, 1]):
+        g1 = _blown_cycle(sizes)
+        g2, _ = g1.random_permutation()
+        context = {}
+        assert TwinStage(inner).run(g1, g2, context) == StageResult.ISO
+        assert verify_mapping(g1, g2, context['mapping'])
+
+
+
+
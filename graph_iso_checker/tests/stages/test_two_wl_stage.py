@@ -0,0 +1,86 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoCheckerBuilder
+from graph_iso_checker.stages.two_wl_stage import TwoWLStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _graph(n, edges):
+    g = Graph(n)
+    for u, v in edges:
+        g.add_edge(u, v)
+    return g
+
+
+def _torus(steps):
+    # граф Кэли Z4 x Z4 с образующими steps (и обратными к ним)
+    g = Graph(16)
+    for a in range(4):
+        for b in range(4):
+            for da, db in steps:
+                u, v = 4 * a + b, 4 * ((a + da) % 4) + (b + db) % 4
+                if not g.has_edge(u, v):
+                    g.add_edge(u, v)
+    return g
+
+
+def test_regular_non_iso_pairs(c6_and_two_triangles):
+    # 1-WL не различает эти регулярные пары, 2-WL видит треугольники
+    g1, g2 = c6_and_two_triangles
+    assert TwoWLStage().run(g1, g2, {}) == StageResult.NON_ISO
+    prism = _graph(6, [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3), (0, 3), (1, 4), (2, 5)])
+    k33   = _graph(6, [(u, v) for u in range(3) for v in range(3, 6)])
+    assert TwoWLStage().run(prism, k33, {}) == StageResult.NON_ISO
+
+
+def test_strongly_regular_pair_is_beyond_2wl():
+    # Шрикханде и ладейный граф 4x4 — srg(16, 6, 2, 2): 2-WL их не различает
+    rook = _torus([(0, 1), (0, 2), (0, 3), (1, 0), (2, 0), (3, 0)])
+    shrikhande = _torus([(0, 1), (1, 0), (1, 1)])
+    context = {}
+    assert TwoWLStage().run(rook, shrikhande, context) == StageResult.CONTINUE
+    # одна орбита на вершинах: одноцветная раскраска в контекст не пишется
+    assert 'colors1' not in context and 'colors2' not in context
+
+
+def test_discrete_coloring_gives_mapping():
+    g1 = generate_random_graph(40, 0.3)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert TwoWLStage().run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_vertex_colors_feed_context():
+    # C6 с висячими вершинами у 0 и 3: цвета — ровно три орбиты, согласованные с перестановкой
+    g1 = _graph(8, [(i, (i + 1) % 6) for i in range(6)] + [(0, 6), (3, 7)])
+    g2, perm = g1.random_permutation()
+    context = {'colors1': [0] * 8, 'colors2': [0] * 8}
+    assert TwoWLStage().run(g1, g2, context) == StageResult.CONTINUE
+    for u in range(8):
+        assert context['colors1'][u] == context['colors2'][perm[u]]
+    assert len(set(context['colors1'])) == 3
+
+
+def test_size_cutoff_and_builder():
+    g1 = generate_random_graph(30, 0.2)
+    g2, _ = g1.random_permutation()
+    context = {}
+    assert TwoWLStage(max_n=20).run(g1, g2, context) == StageResult.CONTINUE
+    assert 'colors1' not in context
+    iso, mapping = GraphIsoCheckerBuilder().add_two_wl_stage().build().check_isomorphism(g1, g2)
+    assert iso is True and verify_mapping(g1, g2, mapping)
+
+
+
+
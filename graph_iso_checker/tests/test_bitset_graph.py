@@ -0,0 +1,69 @@
+import pytest
+import random
+
+
+from graph_iso_checker.graph import BitsetGraph, Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoCheckerBuilder
+from graph_iso_checker.stages.invariant_stage import InvariantStage, vertex_triangles
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def test_bitset_graph_matches_graph():
+    g = generate_random_graph(30, 0.4)
+    b = BitsetGraph.from_graph(g)
+    for u in range(30):
+        assert b.neighbors(u) == g.neighbors(u)
+        assert b.degree(u) == len(g.neighbors(u))
+        assert set(b.adj[u]) == g.adj[u]
+        for v in range(30):
+            assert b.has_edge(u, v) == g.has_edge(u, v)
+    assert not b.has_edge(30, 0)
+    assert Graph.from_json(b.to_json()).adj == g.adj
+    comp = b.complement()
+    assert all(comp.has_edge(u, v) != g.has_edge(u, v) for u in range(30) for v in range(30) if u != v)
+    sub = b.induced_subgraph([3, 7, 11])
+    assert sub.has_edge(0, 1) == g.has_edge(3, 7)
+
+
+def test_bitset_add_edge_invalidates_neighbors():
+    b = BitsetGraph(4)
+    b.add_edge(0, 1)
+    assert b.neighbors(0) == {1}
+    b.add_edge(0, 2)
+    assert b.neighbors(0) == {1, 2}
+
+
+def test_triangle_kernel_matches_sets():
+    g = generate_random_graph(60, 0.5)
+    assert vertex_triangles(BitsetGraph.from_graph(g)) == vertex_triangles(g)
+
+
+def test_stages_on_bitset_graphs():
+    g1 = BitsetGraph.from_graph(generate_random_graph(40, 0.45))
+    g2, perm = g1.random_permutation()
+    assert InvariantStage().run(g1, g2, {}) == StageResult.CONTINUE
+    context = {}
+    assert ExactSearchStage(forward_checking=True).run(g1, g2, context) == StageResult.ISO
+    assert verify_mapping(g1, g2, context['mapping'])
+
+
+def test_builder_dense_backend():
+    g1 = generate_random_graph(30, 0.4)
+    g2, _ = g1.random_permutation()
+    context = {}
+    checker = (GraphIsoCheckerBuilder()
+               .add_invariant_stage()
+               .add_exact_search_stage(forward_checking=True)
+               .with_dense_backend()
+               .build())
+    is_iso, mapping = checker.check_isomorphism(g1, g2, context)
+    assert is_iso and context['dense_backend'] is True
+    assert verify_mapping(g1, g2, mapping)
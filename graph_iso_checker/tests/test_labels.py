@@ -0,0 +1,116 @@
+import itertools
+import pytest
+import random
+
+
+from graph_iso_checker.graph import BitsetGraph, Graph, generate_random_graph, verify_mapping
+from graph_iso_checker.builder import GraphIsoCheckerBuilder
+from graph_iso_checker.algorithms.fingerprint import fingerprint
+from graph_iso_checker.stages.exact_search_stage import ExactSearchStage
+from graph_iso_checker.stages.refinement_stage import RefinementStage
+from graph_iso_checker.stages.invariant_stage import LabelInvariant
+from graph_iso_checker.stage import StageResult
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _labeled(n, p, vertex_kinds=2, edge_kinds=2):
+    g = generate_random_graph(n, p)
+    for u in range(n):
+        g.set_vertex_label(u, random.randrange(vertex_kinds))
+    for u in range(n):
+        for v in g.neighbors(u):
+            if u < v:
+                g.add_edge(u, v, random.randrange(edge_kinds))
+    return g
+
+
+def _cycle(edge_labels):
+    g = Graph(len(edge_labels))
+    for i, label in enumerate(edge_labels):
+        g.add_edge(i, (i + 1) % len(edge_labels), label)
+    return g
+
+
+def _brute_force(g1, g2):
+    return any(verify_mapping(g1, g2, list(p)) for p in itertools.permutations(range(g1.num_vertices)))
+
+
+def test_labels_survive_json_permutation_and_subgraphs():
+    g = _labeled(12, 0.4)
+    for h in (Graph.from_json(g.to_json()), BitsetGraph.from_json(g.to_json()), BitsetGraph.from_graph(g)):
+        assert h.vertex_labels == g.vertex_labels and h.edge_labels == g.edge_labels
+    h, perm = g.random_permutation()
+    assert verify_mapping(g, h, perm)
+    assert fingerprint(h).digest == fingerprint(g).digest
+    sub = g.induced_subgraph([3, 5, 7])
+    assert [sub.vertex_label(i) for i in range(3)] == [g.vertex_label(u) for u in (3, 5, 7)]
+    assert g.complement().vertex_labels == g.vertex_labels
+    # граф без меток сериализуется по-старому
+    assert 'labels' not in generate_random_graph(5, 0.5).to_json()
+
+
+def test_verify_mapping_checks_labels():
+    g1, g2 = _cycle([1, 2, 1, 2]), _cycle([2, 1, 2, 1])
+    assert not verify_mapping(g1, g2, [0, 1, 2, 3])
+    assert verify_mapping(g1, g2, [1, 2, 3, 0])
+    g2.set_vertex_label(0, 7)
+    assert not verify_mapping(g1, g2, [1, 2, 3, 0])
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'forward_checking': True}, {'automorphisms': True}])
+def test_exact_search_respects_edge_labels(kwargs):
+    # одинаковые мультимножества меток, но чередование меток рёбер у C4 разное
+    g1, g2 = _cycle([1, 2, 1, 2]), _cycle([1, 1, 2, 2])
+    assert LabelInvariant().check(g1, g2, {}) == StageResult.CONTINUE
+    assert ExactSearchStage(**kwargs).run(g1, g2, {}) == StageResult.NON_ISO
+    h, _ = g1.random_permutation()
+    context = {}
+    assert ExactSearchStage(**kwargs).run(g1, h, context) == StageResult.ISO
+    assert verify_mapping(g1, h, context['mapping'])
+
+
+def test_refinement_uses_labels():
+    g1, g2 = _cycle([1, 2, 1, 2]), _cycle([1, 1, 2, 2])
+    assert RefinementStage().run(g1, g2, {}) == StageResult.NON_ISO
+    # путь с разными метками концов — раскраска дискретна сразу
+    p1 = Graph(3, [5, 0, 6])
+    p1.add_edge(0, 1)
+    p1.add_edge(1, 2)
+    p2, perm = p1.random_permutation()
+    context = {}
+    assert RefinementStage().run(p1, p2, context) == StageResult.ISO
+    assert context['mapping'] == dict(enumerate(perm))
+
+
+def test_labeled_pipeline_matches_brute_force():
+    checker = (GraphIsoCheckerBuilder()
+               .add_tree_stage()
+               .add_invariant_stage()
+               .add_genetic_stage(population_size=20, generations=30, stall=10)
+               .add_exact_search_stage(forward_checking=True)
+               .with_twin_reduction()
+               .with_peeling()
+               .with_complement_switching()
+               .build())
+    for k in range(20):
+        g1 = _labeled(7, 0.5)
+        if k % 2:
+            g2, _ = g1.random_permutation()
+        else:
+            g2 = g1.induced_subgraph(list(range(7)))
+            g2.set_vertex_label(k % 7, 1 - g1.vertex_label(k % 7))
+            g2, _ = g2.random_permutation()
+        is_iso, mapping = checker.check_isomorphism(g1, g2)
+        assert is_iso == _brute_force(g1, g2)
+        if is_iso:
+            assert verify_mapping(g1, g2, mapping)
+
+
+
+
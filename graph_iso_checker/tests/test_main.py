@@ -0,0 +1,39 @@
+import os
+import sys
+import pytest
+import random
+
+
+from graph_iso_checker import main as cli
+
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'examples')
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, 'argv', ['graph_iso_checker', *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    return exit_info.value.code
+
+
+@pytest.mark.parametrize("name", ["cycle_5", "cycle_10"])
+def test_wl2_on_cycles(monkeypatch, capsys, name):
+    # вершинно-транзитивные графы: одноцветная раскраска 2-WL не должна отключать GA
+    code = _run(monkeypatch,
+                os.path.join(EXAMPLES, f"{name}.json"),
+                os.path.join(EXAMPLES, f"{name}_perm.json"),
+                "--wl2")
+    assert code == 0
+    assert "Graphs are isomorphic." in capsys.readouterr().out
+
+
+
+
@@ -0,0 +1,100 @@
+import os
+import pstats
+import pytest
+import random
+import tracemalloc
+
+
+from graph_iso_checker.graph import Graph
+from graph_iso_checker.builder import GraphIsoCheckerBuilder
+from graph_iso_checker.profiling import StageProfiler, ProfiledStage
+from graph_iso_checker.algorithms.genetic.builder import GeneticAlgorithmBuilder
+from graph_iso_checker.stage import Stage
+from graph_iso_checker.stages.genetic_stage import GeneticStage
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    # фиксируем seed для воспроизводимости
+    random.seed(0)
+    yield
+
+
+def test_profiler_writes_per_stage_files(tmp_path):
+    # путь из 6 вершин: каждый этап должен получить свои .pstats и .collapsed
+    g1 = Graph(6)
+    for u in range(5):
+        g1.add_edge(u, u + 1)
+    g2, _ = g1.random_permutation()
+
+    profiler = StageProfiler(str(tmp_path), top=5)
+    checker = (GraphIsoCheckerBuilder()
+               .add_invariant_stage()
+               .add_refinement_stage()
+               .add_exact_search_stage()
+               .with_profiler(profiler)
+               .build())
+    assert all(isinstance(s, ProfiledStage) for s in checker.stages)
+
+    is_iso, mapping = checker.check_isomorphism(g1, g2)
+    assert is_iso is True
+
+    names = [rep.name for rep in profiler.reports]
+    assert names[0] == "01_invariant_stage"
+    for name in names:
+        assert os.path.exists(tmp_path / f"{name}.pstats")
+        assert os.path.exists(tmp_path / f"{name}.collapsed")
+        # файл читается стандартным pstats
+        pstats.Stats(str(tmp_path / f"{name}.pstats"))
+
+    summary = profiler.write_summary()
+    assert "01_invariant_stage" in summary
+    assert os.path.exists(tmp_path / "summary.txt")
+
+
+def test_profiler_strategy_breakdown_and_memory(tmp_path):
+    # GA: в сводке должно выделяться время стратегий, а с memory=True — пик памяти
+    g1 = Graph(5)
+    for u in range(4):
+        g1.add_edge(u, u + 1)
+    g2, _ = g1.random_permutation()
+
+    profiler = StageProfiler(str(tmp_path), top=5, memory=True)
+    ga = (GeneticAlgorithmBuilder()
+          .with_population_size(10)
+          .with_generations(5)
+          .with_workers(1)
+          .build())
+    profiler.profile("genetic", ga.run, g1, g2, {})
+
+    report = profiler.reports[0]
+    assert report.peak_memory is not None and report.peak_memory > 0
+    assert os.path.exists(tmp_path / f"{report.name}.memory.txt")
+    assert 'fitness' in report.strategy_breakdown()
+
+
+def test_profiler_runs_stage_workers_in_process(tmp_path):
+    # фитнес в дочерних процессах не попал бы в сводку стратегий
+    g1 = Graph(6)
+    for u in range(5):
+        g1.add_edge(u, u + 1)
+    g2, _ = g1.random_permutation()
+
+    profiler = StageProfiler(str(tmp_path))
+    stage = GeneticStage(population_size=10, generations=5, workers=4)
+    profiler.wrap(stage).run(g1, g2, {})
+    # однопроцессный режим — только на время вызова
+    assert stage.workers == 4
+    assert 'fitness' in profiler.reports[0].strategy_breakdown()
+
+
+class _FailingStage(Stage):
+    def run(self, g1, g2, context):
+        raise RuntimeError("сбой этапа")
+
+
+def test_profiler_stops_tracemalloc_on_error(tmp_path):
+    profiler = StageProfiler(str(tmp_path), memory=True)
+    with pytest.raises(RuntimeError):
+        profiler.wrap(_FailingStage()).run(Graph(1), Graph(1), {})
+    assert not tracemalloc.is_tracing()